@@ -0,0 +1,84 @@
+"""
+Measure the peak memory of preparing and writing an export.
+
+Compares the two ways CaseNameResolver prepares data['cases'] for the
+exporters: resolve(), which copies every case into a new dictionary with the
+names added, and overlay(), which wraps the cached cases in NamedCase views
+sharing one names dict per ID combination. The cases start out as the
+LazyCase list the app caches, so only what the export adds is counted. Each
+export format is written from both and the files are checked to be equal.
+
+Usage:
+    python benchmarks/bench_export_memory.py [--cases 100000] [--formats csv,json,xml,xray]
+"""
+import argparse
+import filecmp
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_json_codec import make_payload  # noqa: E402
+from bench_name_resolver import make_metadata, make_project  # noqa: E402
+from testrail_exporter.models.case import LazyCase  # noqa: E402
+from testrail_exporter.utils.exporter import Exporter  # noqa: E402
+from testrail_exporter.utils.name_resolver import CaseNameResolver  # noqa: E402
+
+WRITERS = {
+    'csv': lambda data, path: Exporter.export_to_csv(data, path),
+    'json': lambda data, path: Exporter.export_to_json(data, path),
+    'xml': lambda data, path: Exporter.export_to_xml(data, path),
+    'xray': lambda data, path: Exporter.export_to_xray_csv(data, path),
+}
+
+
+def run(prepare, write, path):
+    """Return (bytes held by the prepared cases, peak bytes while preparing and writing)."""
+    gc.collect()
+    tracemalloc.start()
+    data = prepare()
+    held = tracemalloc.get_traced_memory()[0]
+    write(data, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return held, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cases', type=int, default=100000, help='Number of synthetic cases')
+    parser.add_argument('--formats', default='csv,json,xml,xray', help='Comma-separated export formats')
+    args = parser.parse_args()
+
+    payload = make_payload(args.cases)['cases']
+    project = make_project(payload)
+    metadata = make_metadata(project.id)
+    cases = [LazyCase(data) for data in payload]
+    # The JSON exporter writes data as given, so leave out the Suite objects
+    base = {'project': {'id': project.id, 'name': project.name}}
+    suites = {'suites': project.suites}
+
+    def prepared(method, with_suites):
+        return lambda: dict(base, cases=getattr(CaseNameResolver(project, metadata), method)(cases),
+                            **(suites if with_suites else {}))
+
+    MB = 1024 * 1024
+    print(f"{args.cases} cases")
+    print(f"{'format':<8}{'held: resolve':>15}{'overlay':>10}{'peak: resolve':>16}{'overlay':>10}{'saved':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.formats.split(','):
+            write = WRITERS[name]
+            with_suites = name in ('xml', 'xray')
+            paths = [os.path.join(directory, f'{name}-{method}.out') for method in ('resolve', 'overlay')]
+            copy_held, copy_peak = run(prepared('resolve', with_suites), write, paths[0])
+            view_held, view_peak = run(prepared('overlay', with_suites), write, paths[1])
+            assert filecmp.cmp(*paths, shallow=False), f"{name} output differs"
+            print(f"{name:<8}{copy_held / MB:>13.1f}MB{view_held / MB:>8.1f}MB"
+                  f"{copy_peak / MB:>14.1f}MB{view_peak / MB:>8.1f}MB{1 - view_peak / copy_peak:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare the standard library json module with testrail_exporter's JSON codec.
+
+Builds a synthetic get_cases payload and times decoding it (as the API client
+does) and pretty-printing it (as Exporter.export_to_json does).
+
+Usage:
+    python benchmarks/bench_json_codec.py [--cases 100000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from testrail_exporter.utils import json_codec  # noqa: E402
+
+
+def make_payload(count):
+    """Build a get_cases envelope with ``count`` realistic cases."""
+    steps = [
+        {
+            'content': f'<p>Open the <strong>settings</strong> page and select option {i}</p>',
+            'expected': f'<p>Option {i} is highlighted and the "Save" button is enabled</p>'
+        }
+        for i in range(4)
+    ]
+    cases = [
+        {
+            'id': case_id,
+            'title': f'Verify checkout flow variant {case_id}',
+            'section_id': 1000 + case_id % 500,
+            'template_id': 2,
+            'type_id': 1 + case_id % 12,
+            'priority_id': 1 + case_id % 4,
+            'milestone_id': None,
+            'refs': f'JIRA-{case_id}',
+            'created_by': 5,
+            'created_on': 1600000000 + case_id,
+            'updated_by': 7,
+            'updated_on': 1650000000 + case_id,
+            'estimate': None,
+            'suite_id': 11,
+            'custom_automation_type': 0,
+            'custom_preconds': '<p>User is logged in with a <em>premium</em> account</p>',
+            'custom_steps_separated': steps,
+        }
+        for case_id in range(1, count + 1)
+    ]
+    return {'offset': 0, 'limit': count, 'size': count, '_links': {'next': None, 'prev': None}, 'cases': cases}
+
+
+def best_of(func, repeat):
+    """Return the fastest of ``repeat`` runs of ``func`` in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cases', type=int, default=100000, help='Number of synthetic cases')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    payload = make_payload(args.cases)
+    raw = json.dumps(payload).encode('utf-8')
+    print(f"{args.cases} cases, {len(raw) / 1024 / 1024:.1f} MiB; codec backend: {json_codec.BACKEND}")
+
+    results = [
+        ('decode', best_of(lambda: json.loads(raw), args.repeat),
+         best_of(lambda: json_codec.loads(raw), args.repeat)),
+        ('encode (indent=2)', best_of(lambda: json.dumps(payload, indent=2), args.repeat),
+         best_of(lambda: json_codec.dumps(payload, indent=True), args.repeat)),
+    ]
+
+    print(f"{'operation':<20}{'stdlib json':>14}{'json_codec':>14}{'speedup':>10}")
+    for name, stdlib_time, codec_time in results:
+        print(f"{name:<20}{stdlib_time:>13.3f}s{codec_time:>13.3f}s{stdlib_time / codec_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
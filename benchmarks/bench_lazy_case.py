@@ -0,0 +1,51 @@
+"""
+Time counting and filtering cases as Case objects and as LazyCase wrappers.
+
+Mirrors what the tree does with per-section fetches: build the case objects
+from decoded get_cases data, count them and keep those in selected sections.
+LazyCase only wraps each payload dict, so fields are read on access and
+custom fields are never collected.
+
+Usage:
+    python benchmarks/bench_lazy_case.py [--cases 100000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_json_codec import best_of, make_payload  # noqa: E402
+from testrail_exporter.models.case import Case, LazyCase  # noqa: E402
+
+
+def count_and_select(model, payload, section_ids):
+    """Build cases with ``model``, count them and filter them by section."""
+    cases = [model(data) for data in payload]
+    return len(cases), [case for case in cases if case.section_id in section_ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cases', type=int, default=100000, help='Number of synthetic cases')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    payload = make_payload(args.cases)['cases']
+    section_ids = set(range(1000, 1050))
+    assert all(LazyCase(data).to_dict() == Case(data).to_dict() for data in payload[:1000])
+
+    print(f"{args.cases} cases, keeping {len(section_ids)} of 500 sections")
+    print(f"{'operation':<20}{'Case':>12}{'LazyCase':>12}{'speedup':>10}")
+    results = [
+        ('construct', best_of(lambda: [Case(data) for data in payload], args.repeat),
+         best_of(lambda: [LazyCase(data) for data in payload], args.repeat)),
+        ('count + select', best_of(lambda: count_and_select(Case, payload, section_ids), args.repeat),
+         best_of(lambda: count_and_select(LazyCase, payload, section_ids), args.repeat)),
+    ]
+    for name, eager_time, lazy_time in results:
+        print(f"{name:<20}{eager_time:>11.3f}s{lazy_time:>11.3f}s{eager_time / lazy_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
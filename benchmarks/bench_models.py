@@ -0,0 +1,78 @@
+"""
+Measure the memory held by testrail_exporter's model objects.
+
+Builds the models from synthetic API payloads and compares them with plain
+classes that keep a per-instance __dict__, as the models did before they
+declared __slots__, and with a columnar CaseStore. Only the model objects are
+counted; the payload dicts they are built from exist before measuring starts.
+
+Usage:
+    python benchmarks/bench_models.py [--cases 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_json_codec import make_payload  # noqa: E402
+from testrail_exporter.models.case import Case  # noqa: E402
+from testrail_exporter.models.case_store import CaseStore  # noqa: E402
+from testrail_exporter.models.section import Section  # noqa: E402
+
+
+def plain_class(model):
+    """Return a class running ``model``'s constructor but storing attributes in a __dict__."""
+    return type(f'Plain{model.__name__}', (), {'__init__': model.__init__, 'to_dict': getattr(model, 'to_dict', None)})
+
+
+def measure(build):
+    """Return the bytes still allocated by the objects ``build`` returns, and the objects."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cases', type=int, default=100000, help='Number of synthetic cases')
+    args = parser.parse_args()
+
+    cases = make_payload(args.cases)['cases']
+    sections = [
+        {'id': 1000 + i, 'suite_id': 11, 'name': f'Section {i}', 'description': None,
+         'parent_id': None if i < 50 else 1000 + i // 10, 'depth': 0 if i < 50 else 1}
+        for i in range(args.cases // 20)
+    ]
+
+    print(f"{args.cases} cases, {len(sections)} sections")
+    print(f"{'model':<10}{'plain class':>14}{'__slots__':>14}{'per object':>22}{'saved':>8}")
+    for model, payloads in ((Case, cases), (Section, sections)):
+        plain = plain_class(model)
+        plain_size, objects = measure(lambda: [plain(data) for data in payloads])
+        del objects
+        slotted_size, objects = measure(lambda: [model(data) for data in payloads])
+        del objects
+        count = len(payloads)
+        print(
+            f"{model.__name__:<10}{plain_size / 1024 / 1024:>12.1f}MB{slotted_size / 1024 / 1024:>12.1f}MB"
+            f"{plain_size // count:>11} -> {slotted_size // count:>4} B"
+            f"{1 - slotted_size / plain_size:>8.0%}"
+        )
+
+    plain = plain_class(Case)
+    plain_size, objects = measure(lambda: [plain(data) for data in cases])
+    del objects
+    store_size, store = measure(lambda: CaseStore.from_dicts(cases))
+    print(f"{'CaseStore':<10}{'':>14}{store_size / 1024 / 1024:>12.1f}MB"
+          f"{'':>15}{store_size // len(store):>4} B{1 - store_size / plain_size:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Time adding suite, section, priority, type, template and milestone names to cases.
+
+Compares CaseNameResolver's single pass over a batch with the per-case
+conversion the export used before, which scanned the suite and section lists
+for every case. The project has 20 suites of 200 sections each.
+
+Usage:
+    python benchmarks/bench_name_resolver.py [--cases 100000]
+"""
+import argparse
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_json_codec import best_of, make_payload  # noqa: E402
+from testrail_exporter.models.case import Case  # noqa: E402
+from testrail_exporter.models.case_store import CaseStore  # noqa: E402
+from testrail_exporter.models.project import Project  # noqa: E402
+from testrail_exporter.models.section import Section  # noqa: E402
+from testrail_exporter.models.suite import Suite  # noqa: E402
+from testrail_exporter.utils.name_resolver import CaseNameResolver  # noqa: E402
+
+SUITES = 20
+SECTIONS_PER_SUITE = 200
+
+
+def make_project(cases):
+    """Build a project whose suites and sections cover the cases' IDs, and place the cases in it."""
+    project = Project({'id': 1, 'name': 'Benchmark'})
+    for suite_index in range(SUITES):
+        suite = Suite({'id': 100 + suite_index, 'name': f'Suite {suite_index}'})
+        first = 1000 + suite_index * SECTIONS_PER_SUITE
+        suite.sections = [
+            Section({'id': first + i, 'name': f'Section {i}', 'parent_id': None if i < 10 else first + i % 10,
+                     'depth': 0 if i < 10 else 1})
+            for i in range(SECTIONS_PER_SUITE)
+        ]
+        project.add_suite(suite)
+    for index, case in enumerate(cases):
+        suite_index = index % SUITES
+        case['suite_id'] = 100 + suite_index
+        case['section_id'] = 1000 + suite_index * SECTIONS_PER_SUITE + index // SUITES % SECTIONS_PER_SUITE
+        case['milestone_id'] = 1 + index % 50
+    return project
+
+
+def make_metadata(project_id):
+    return SimpleNamespace(
+        priorities={i: f'Priority {i}' for i in range(1, 5)},
+        case_types={i: f'Type {i}' for i in range(1, 13)},
+        templates={project_id: {i: f'Template {i}' for i in range(1, 4)}},
+        milestones={project_id: {i: f'Milestone {i}' for i in range(1, 51)}}
+    )
+
+
+def convert_per_case(case, project, metadata):
+    """The former per-case conversion, scanning suites and sections for every case."""
+    case_dict = case.to_dict()
+    if case.suite_id:
+        suite = next((s for s in project.suites if s.id == case.suite_id), None)
+        if suite:
+            case_dict['suite_name'] = suite.name
+    if case.section_id:
+        suite = next((s for s in project.suites if s.id == case.suite_id), None)
+        if suite:
+            section = next((sec for sec in suite.sections if sec.id == case.section_id), None)
+            if section:
+                case_dict['section_name'] = section.name
+                case_dict['section_parent_id'] = section.parent_id
+                case_dict['section_depth'] = section.depth
+    if case.priority_id in metadata.priorities:
+        case_dict['priority_name'] = metadata.priorities[case.priority_id]
+    if case.type_id in metadata.case_types:
+        case_dict['type_name'] = metadata.case_types[case.type_id]
+    template_name = metadata.templates.get(project.id, {}).get(case.template_id)
+    if template_name:
+        case_dict['template_name'] = template_name
+    milestone_name = metadata.milestones.get(project.id, {}).get(case.milestone_id)
+    if milestone_name:
+        case_dict['milestone_name'] = milestone_name
+    return case_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--cases', type=int, default=100000, help='Number of synthetic cases')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    payload = make_payload(args.cases)['cases']
+    project = make_project(payload)
+    metadata = make_metadata(project.id)
+    cases = [Case(data) for data in payload]
+    store = CaseStore.from_dicts(payload)
+
+    expected = [convert_per_case(case, project, metadata) for case in cases]
+    assert CaseNameResolver(project, metadata).resolve(cases) == expected
+    assert CaseNameResolver(project, metadata).resolve(store) == expected
+
+    print(f"{args.cases} cases, {SUITES} suites x {SECTIONS_PER_SUITE} sections")
+    print(f"{'input':<12}{'per case':>12}{'batch':>12}{'speedup':>10}")
+    per_case = best_of(lambda: [convert_per_case(case, project, metadata) for case in cases], args.repeat)
+    for name, batch in (('Case list', cases), ('CaseStore', store)):
+        batch_time = best_of(lambda: CaseNameResolver(project, metadata).resolve(batch), args.repeat)
+        print(f"{name:<12}{per_case:>11.3f}s{batch_time:>11.3f}s{per_case / batch_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
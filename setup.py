@@ -12,11 +12,16 @@ setup(
         "requests>=2.28.0",
         "Pillow>=9.2.0",
         "pandas>=1.3.0",
+        "numpy>=1.17.3",
         "customtkinter>=5.2.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.6.0"],
+    },
     entry_points={
         "console_scripts": [
             "testrail-exporter=testrail_exporter.main:main",
+            "testrail-mock-server=testrail_exporter.utils.mock_server:main",
         ],
     },
     author="Doug Mason",
@@ -0,0 +1,198 @@
+import base64
+import gzip
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+
+from ..utils import json_codec
+
+CASSETTE_VERSION = 2
+
+# Response headers that change how the client handles a response
+RECORDED_HEADERS = ('Content-Type', 'Content-Length', 'Content-Range', 'Retry-After')
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class CassetteError(Exception):
+    """Raised when a cassette cannot be read or has no response for a request."""
+    pass
+
+
+class Cassette:
+    """
+    Records TestRail API traffic to a file and replays it without a network.
+
+    A cassette is a gzip-compressed JSON-lines file: a header line followed by
+    one line per request with the method, endpoint, query parameters, status,
+    the headers the client reads (Content-Type, Retry-After, ...), the raw
+    body in base64, so binary attachments survive, and latency. In replay mode, responses are served per
+    (method, endpoint, params) in the order they were recorded; once a
+    request's recordings are used up, its last response is repeated, so
+    replays are deterministic however often the same page is requested.
+
+    429 responses are not recorded, since throttling depends on the server's
+    load at the time rather than on the traffic itself.
+    """
+
+    def __init__(self, path, mode=REPLAY, replay_latency=False):
+        """
+        Open a cassette.
+
+        Args:
+            path (str): Cassette file, conventionally ending in '.jsonl.gz'
+            mode (str): 'record' to capture traffic (overwriting the file) or
+                'replay' to serve it back
+            replay_latency (bool): When replaying, sleep for each response's
+                recorded latency
+
+        Raises:
+            CassetteError: If the mode is unknown or the file cannot be read
+        """
+        if mode not in (RECORD, REPLAY):
+            raise CassetteError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._file = None
+        self._interactions = defaultdict(deque)
+        self._last = {}
+
+        # Statistics
+        self.recorded = 0
+        self.replayed = 0
+
+        if mode == RECORD:
+            self._file = gzip.open(path, 'wb')
+            self._write({'version': CASSETTE_VERSION, 'created': time.time()})
+        else:
+            self._load()
+
+    @property
+    def replaying(self):
+        """bool: True if responses come from the cassette instead of the network."""
+        return self.mode == REPLAY
+
+    @staticmethod
+    def _key(method, endpoint, params):
+        """
+        Build the lookup key of a request.
+
+        Returns:
+            tuple: (method, endpoint, sorted params)
+        """
+        return (method, endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+    def _write(self, entry):
+        """Append one JSON line to the cassette file."""
+        self._file.write(json_codec.dumps(entry) + b'\n')
+
+    def _load(self):
+        """
+        Read every recorded interaction into memory.
+
+        Raises:
+            CassetteError: If the file is missing, corrupt or of another version
+        """
+        try:
+            with gzip.open(self.path, 'rb') as f:
+                header = json_codec.loads(f.readline())
+                if header.get('version') != CASSETTE_VERSION:
+                    raise CassetteError(f"Unsupported cassette version in {self.path}: {header.get('version')}")
+                for line in f:
+                    entry = json_codec.loads(line)
+                    key = self._key(entry['method'], entry['endpoint'], entry['params'])
+                    self._interactions[key].append(entry)
+        except (OSError, EOFError, ValueError, KeyError) as e:
+            raise CassetteError(f"Cannot read cassette {self.path}: {e}") from e
+
+    def record(self, method, endpoint, params, response, latency):
+        """
+        Save one response. Reads the body, so streamed responses are buffered.
+
+        Args:
+            method (str): HTTP method
+            endpoint (str): API endpoint
+            params (dict): Query parameters
+            response (requests.Response): Response to save
+            latency (float): Seconds from sending the request to reading the body
+        """
+        if response.status_code == 429:
+            return
+        entry = {
+            'method': method,
+            'endpoint': endpoint,
+            'params': {k: str(v) for k, v in (params or {}).items()},
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'latency': round(latency, 6)
+        }
+        with self._lock:
+            self._write(entry)
+            self.recorded += 1
+
+    def play(self, method, url, endpoint, params):
+        """
+        Serve the recorded response for a request.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL, used for error messages
+            endpoint (str): API endpoint
+            params (dict): Query parameters
+
+        Returns:
+            requests.Response: Recorded response with its body already loaded
+
+        Raises:
+            CassetteError: If the request was never recorded
+        """
+        key = self._key(method, endpoint, params)
+        with self._lock:
+            queue = self._interactions.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            else:
+                entry = self._last.get(key)
+            self.replayed += 1
+        if entry is None:
+            raise CassetteError(f"No recorded response for {method} {endpoint} with params {dict(key[2])}")
+
+        if self.replay_latency and entry['latency'] > 0:
+            time.sleep(entry['latency'])
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = ''
+        response.url = url
+        response.encoding = 'utf-8'
+        response.headers.update(entry.get('headers') or {})
+        response._content = base64.b64decode(entry['body'])
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        """Flush and close the cassette file when recording."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self):
+        """
+        Get cassette statistics.
+
+        Returns:
+            dict: Mode and number of recorded and replayed responses
+        """
+        return {
+            'mode': self.mode,
+            'recorded': self.recorded,
+            'replayed': self.replayed
+        }
@@ -0,0 +1,172 @@
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _StreamBuffer:
+    """Text buffer over a stream of UTF-8 byte chunks that decodes JSON values on demand."""
+
+    def __init__(self, chunks):
+        """
+        Initialize the buffer.
+
+        Args:
+            chunks: Iterable of bytes chunks (e.g. response.iter_content())
+        """
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._exhausted = False
+        self.text = ''
+        self.pos = 0
+
+    def _fill(self, min_growth=1):
+        """
+        Read more chunks into the buffer, dropping text that was already consumed.
+
+        Args:
+            min_growth (int): Minimum number of characters to add
+
+        Returns:
+            bool: False if the stream is exhausted
+        """
+        if self._exhausted:
+            return False
+
+        parts = []
+        added = 0
+        while added < min_growth:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._utf8.decode(b'', final=True))
+                self._exhausted = True
+                break
+            decoded = self._utf8.decode(chunk)
+            parts.append(decoded)
+            added += len(decoded)
+
+        self.text = self.text[self.pos:] + ''.join(parts)
+        self.pos = 0
+        return added > 0 or not self._exhausted
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            str: Next character, or None at the end of the stream
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char):
+        """
+        Consume the next non-whitespace character, which must be ``char``.
+
+        Raises:
+            ValueError: If a different character is found
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON stream: expected '{char}', found {found!r}")
+        self.pos += 1
+
+    def decode_value(self):
+        """
+        Decode the next complete JSON value.
+
+        If the value is cut off at the end of the buffer, more of the stream
+        is read (at least doubling the buffer) and decoding is retried.
+
+        Returns:
+            Decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(max(len(self.text) - self.pos, 1)):
+                    raise
+                continue
+
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.text) and isinstance(value, (int, float)) and not self._exhausted:
+                self._fill()
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """
+        Yield the items of the JSON array starting at the current position.
+
+        Yields:
+            Decoded array items
+        """
+        self.expect('[')
+        while True:
+            char = self.peek()
+            if char == ']':
+                self.pos += 1
+                return
+            if char == ',':
+                self.pos += 1
+                continue
+            if char is None:
+                raise ValueError("Invalid JSON stream: unterminated array")
+            yield self.decode_value()
+
+
+def iter_json_items(chunks, key, meta=None):
+    """
+    Incrementally decode the items of a TestRail bulk response.
+
+    Handles both the paginated envelope (``{"offset": .., "_links": ..,
+    "cases": [...]}``) and a plain top-level list. Only one item is decoded
+    at a time, so memory stays proportional to the largest item rather than
+    the whole response.
+
+    Args:
+        chunks: Iterable of bytes chunks
+        key (str): Envelope key holding the items (e.g. 'cases')
+        meta (dict, optional): Receives the envelope's other keys (such as
+            '_links') once the stream has been consumed
+
+    Yields:
+        Decoded items
+    """
+    buffer = _StreamBuffer(chunks)
+    first = buffer.peek()
+
+    if first == '[':
+        # Pre-6.7 servers return a plain list
+        yield from buffer.iter_array()
+        return
+
+    buffer.expect('{')
+    while True:
+        char = buffer.peek()
+        if char == '}':
+            return
+        if char == ',':
+            buffer.pos += 1
+            continue
+        if char is None:
+            raise ValueError("Invalid JSON stream: unterminated object")
+
+        name = buffer.decode_value()
+        buffer.expect(':')
+        if name == key and buffer.peek() == '[':
+            yield from buffer.iter_array()
+        else:
+            value = buffer.decode_value()
+            if meta is not None:
+                meta[name] = value
@@ -0,0 +1,223 @@
+import bisect
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Name of the path argument of each endpoint, used to build endpoint templates
+ENDPOINT_ARGUMENTS = {
+    'get_project': 'project',
+    'get_suites': 'project',
+    'get_sections': 'project',
+    'get_cases': 'project',
+    'get_templates': 'project',
+    'get_milestones': 'project',
+    'get_shared_steps': 'project',
+    'get_suite': 'suite',
+    'get_section': 'section',
+    'get_case': 'case',
+    'get_milestone': 'milestone',
+    'get_shared_step': 'shared_step',
+    'get_attachment': 'attachment',
+    'get_attachments_for_case': 'case',
+}
+
+
+def endpoint_template(endpoint):
+    """
+    Reduce an endpoint to its template so calls for different IDs are grouped.
+
+    Args:
+        endpoint (str): Endpoint such as 'get_cases/12' or 'get_cases/12&offset=250'
+
+    Returns:
+        str: Template such as 'get_cases/{project}'
+    """
+    path = endpoint.split('&', 1)[0]
+    name, _, argument = path.partition('/')
+    if not argument:
+        return name
+    return f"{name}/{{{ENDPOINT_ARGUMENTS.get(name, 'id')}}}"
+
+
+def _latency_label(index):
+    if index < len(LATENCY_BUCKETS):
+        return f"<={LATENCY_BUCKETS[index]:g}s"
+    return f">{LATENCY_BUCKETS[-1]:g}s"
+
+
+class _EndpointStats:
+    """Counters for one endpoint template."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, fraction):
+        """
+        Estimate a latency percentile from the histogram.
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile, capped
+                at the maximum latency seen
+        """
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.histogram[:len(LATENCY_BUCKETS)]):
+            seen += count
+            if seen >= target:
+                return min(LATENCY_BUCKETS[index], self.latency_max)
+        return self.latency_max
+
+
+class RequestTimer:
+    """Tracks one logical API call, including its retries, until it finishes."""
+
+    def __init__(self, metrics, endpoint):
+        self._metrics = metrics
+        self.endpoint = endpoint
+        self.retries = 0
+        self.bytes_received = 0
+        self._started = time.perf_counter()
+
+    def begin_attempt(self):
+        """Restart the latency clock for a new attempt, so waits between retries are not counted."""
+        self._started = time.perf_counter()
+
+    def finish(self, error=None):
+        """
+        Record the call.
+
+        Args:
+            error (Exception, optional): Error the call failed with
+        """
+        self._metrics.record(self.endpoint, time.perf_counter() - self._started,
+                             self.bytes_received, self.retries, error)
+
+
+class ApiMetrics:
+    """
+    Thread-safe per-endpoint statistics for API calls.
+
+    Calls are grouped by endpoint template (``get_cases/{project}``) and
+    counted with a latency histogram, bytes received, retries and errors.
+    Listeners registered with ``add_listener`` are called after every call,
+    for callers that want to forward the data elsewhere.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._listeners = []
+
+    def start(self, endpoint):
+        """
+        Start timing a call.
+
+        Args:
+            endpoint (str): API endpoint
+
+        Returns:
+            RequestTimer: Timer to update and finish when the call completes
+        """
+        return RequestTimer(self, endpoint)
+
+    def add_listener(self, listener):
+        """
+        Register a callable receiving a dict per finished call with 'endpoint',
+        'template', 'latency', 'bytes_received', 'retries' and 'error'.
+
+        Args:
+            listener (callable): Function to call
+        """
+        self._listeners.append(listener)
+
+    def record(self, endpoint, latency, bytes_received=0, retries=0, error=None):
+        """
+        Record a finished call.
+
+        Args:
+            endpoint (str): API endpoint
+            latency (float): Seconds taken by the final attempt
+            bytes_received (int): Response body size
+            retries (int): Attempts repeated after errors or 429 responses
+            error (Exception, optional): Error the call failed with
+        """
+        template = endpoint_template(endpoint)
+        with self._lock:
+            stats = self._stats.get(template)
+            if stats is None:
+                stats = self._stats[template] = _EndpointStats()
+            stats.calls += 1
+            stats.retries += retries
+            stats.bytes_received += bytes_received
+            stats.latency_total += latency
+            stats.latency_max = max(stats.latency_max, latency)
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            if error is not None:
+                stats.errors += 1
+
+        for listener in self._listeners:
+            listener({
+                'endpoint': endpoint,
+                'template': template,
+                'latency': latency,
+                'bytes_received': bytes_received,
+                'retries': retries,
+                'error': error
+            })
+
+    def add_bytes(self, endpoint, bytes_received):
+        """
+        Add bytes read after a call was recorded, as happens for streamed responses.
+
+        Args:
+            endpoint (str): API endpoint
+            bytes_received (int): Additional bytes
+        """
+        template = endpoint_template(endpoint)
+        with self._lock:
+            stats = self._stats.get(template)
+            if stats is not None:
+                stats.bytes_received += bytes_received
+
+    def snapshot(self):
+        """
+        Get a copy of the current statistics.
+
+        Returns:
+            dict: Endpoint template -> calls, errors, retries, bytes_received,
+                latency_total, latency_mean, latency_max, latency_p50,
+                latency_p95 and latency_histogram (bucket label -> count)
+        """
+        with self._lock:
+            return {
+                template: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'retries': stats.retries,
+                    'bytes_received': stats.bytes_received,
+                    'latency_total': stats.latency_total,
+                    'latency_mean': stats.latency_total / stats.calls if stats.calls else 0.0,
+                    'latency_max': stats.latency_max,
+                    'latency_p50': stats.percentile(0.5),
+                    'latency_p95': stats.percentile(0.95),
+                    'latency_histogram': {
+                        _latency_label(index): count for index, count in enumerate(stats.histogram)
+                    }
+                }
+                for template, stats in self._stats.items()
+            }
+
+    def reset(self):
+        """Clear all statistics."""
+        with self._lock:
+            self._stats.clear()
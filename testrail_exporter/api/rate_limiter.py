@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+# Same logger as ExportLogger so throttling shows up in the export log
+logger = logging.getLogger('testrail_exporter')
+
+# TestRail Cloud's documented limit for Professional instances
+DEFAULT_REQUESTS_PER_MINUTE = 180
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that paces requests to the TestRail API.
+
+    Every request takes one token. Tokens refill at the configured
+    requests-per-minute rate up to a burst size. A 429 response pauses the
+    whole bucket until its Retry-After time has passed, so every thread and
+    client sharing the limiter backs off together.
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute (int): Request budget per minute; None or 0 disables pacing
+                (Retry-After is still honored)
+            burst (int, optional): Maximum tokens that can accumulate; defaults to
+                one second's worth of requests (at least 1)
+        """
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_rate(requests_per_minute, burst)
+        # Start with a full bucket
+        self._tokens = float(self.burst) if self._rate else 0.0
+
+        # Statistics
+        self.throttled_requests = 0
+        self.throttled_seconds = 0.0
+        self.retry_after_count = 0
+
+    def set_rate(self, requests_per_minute, burst=None):
+        """
+        Change the request budget.
+
+        Args:
+            requests_per_minute (int): Request budget per minute; None or 0 disables pacing
+            burst (int, optional): Maximum tokens that can accumulate
+        """
+        with self._lock:
+            self.requests_per_minute = requests_per_minute or 0
+            self._rate = self.requests_per_minute / 60.0
+            if burst is None:
+                burst = max(1, int(self._rate))
+            self.burst = burst
+            self._tokens = min(self._tokens, self.burst) if self._rate else 0.0
+
+    def reserve(self):
+        """
+        Take a token and return how long the caller must wait before sending.
+
+        ``acquire`` calls this and sleeps for the delay.
+
+        Returns:
+            float: Seconds to wait before the request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._rate and now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+            # Time still blocked by a Retry-After pause
+            delay = max(0.0, self._updated - now)
+
+            if self._rate:
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay += -self._tokens / self._rate
+
+            if delay > 0:
+                self.throttled_requests += 1
+                self.throttled_seconds += delay
+            return delay
+
+    def acquire(self):
+        """
+        Block the calling thread until a request may be sent.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            if delay >= 1:
+                logger.debug(f"Rate limiter throttling request for {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds):
+        """
+        Pause all requests after the server answered 429 Too Many Requests.
+
+        Args:
+            seconds (float): Time to wait, usually taken from Retry-After
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._updated = max(self._updated, now + seconds)
+            # Allow a single request when the pause ends, then refill at the normal rate
+            self._tokens = min(self._tokens, 1.0)
+            self.retry_after_count += 1
+        logger.warning(f"TestRail rate limit hit (429); pausing requests for {seconds:.1f}s")
+
+    def get_stats(self):
+        """
+        Get throttling statistics.
+
+        Returns:
+            dict: Throttled request count, total seconds throttled and 429 count
+        """
+        with self._lock:
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'throttled_requests': self.throttled_requests,
+                'throttled_seconds': round(self.throttled_seconds, 3),
+                'retry_after_count': self.retry_after_count
+            }
+
+
+def parse_retry_after(value, default=60.0):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value (str): Header value, either delay seconds or an HTTP date
+        default (float): Delay to use when the header is missing or invalid
+
+    Returns:
+        float: Seconds to wait
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter():
+    """
+    Get the process-wide rate limiter shared by all TestRail clients.
+
+    Returns:
+        RateLimiter: The shared limiter
+    """
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
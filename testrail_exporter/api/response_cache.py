@@ -0,0 +1,262 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from ..utils import json_codec
+
+logger = logging.getLogger('testrail_exporter')
+
+HOUR = 60 * 60
+
+# Time-to-live in seconds per endpoint class. Lookup tables rarely change,
+# while case data is edited all the time: sections and cases are not cached
+# (a TTL of 0) so an export never writes data older than the server's, unless
+# a caller opts in with its own TTLs.
+DEFAULT_TTLS = {
+    'get_priorities': 24 * HOUR,
+    'get_case_types': 24 * HOUR,
+    'get_case_fields': 24 * HOUR,
+    'get_templates': 24 * HOUR,
+    'get_projects': HOUR,
+    'get_project': HOUR,
+    'get_suites': HOUR,
+    'get_suite': HOUR,
+    'get_milestones': HOUR,
+    'get_sections': 0,
+    'get_cases': 0,
+    'get_case': 0,
+}
+
+# TTL for endpoints not listed above
+DEFAULT_TTL = 5 * 60
+
+# Default size cap for the cache directory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    On-disk cache of decoded TestRail GET responses.
+
+    Entries are stored as JSON files under ``~/.testrail_exporter/http_cache``,
+    one sub-directory per endpoint class (``get_cases``, ``get_priorities``, ...)
+    so each class can have its own time-to-live; classes with a TTL of 0 are
+    never stored. When the cache grows past its size cap, the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, cache_dir=None, ttls=None, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir (str, optional): Cache directory. If None, uses the default path.
+            ttls (dict, optional): Endpoint class -> TTL in seconds, merged over the defaults
+            max_bytes (int): Maximum total size of cached entries
+            enabled (bool): Whether the cache is used at all
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(str(Path.home()), '.testrail_exporter', 'http_cache')
+        self.cache_dir = cache_dir
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Computed lazily on first write
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def endpoint_class(endpoint):
+        """
+        Get the endpoint class used to pick a TTL.
+
+        Args:
+            endpoint (str): API endpoint such as 'get_cases/1' or 'get_cases/1&offset=250'
+
+        Returns:
+            str: Endpoint class such as 'get_cases'
+        """
+        return endpoint.split('/', 1)[0].split('&', 1)[0]
+
+    def ttl(self, endpoint):
+        """
+        Get how long responses of an endpoint stay fresh.
+
+        Args:
+            endpoint (str): API endpoint
+
+        Returns:
+            float: TTL in seconds; 0 if the endpoint is not cached
+        """
+        return self.ttls.get(self.endpoint_class(endpoint), DEFAULT_TTL)
+
+    def _entry_path(self, namespace, endpoint, params):
+        """
+        Get the file path for a cache entry.
+
+        Args:
+            namespace (str): Server and user the response belongs to
+            endpoint (str): API endpoint
+            params (dict): Query parameters
+
+        Returns:
+            str: Path of the entry file
+        """
+        key = json.dumps([namespace, endpoint, sorted((k, str(v)) for k, v in (params or {}).items())])
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, self.endpoint_class(endpoint), f"{digest}.json")
+
+    def get(self, namespace, endpoint, params=None):
+        """
+        Look up a cached response.
+
+        Args:
+            namespace (str): Server and user the response belongs to
+            endpoint (str): API endpoint
+            params (dict, optional): Query parameters
+
+        Returns:
+            tuple: (True, response) on a fresh hit, (False, None) otherwise
+        """
+        ttl = self.ttl(endpoint)
+        if not self.enabled or ttl <= 0:
+            return False, None
+
+        path = self._entry_path(namespace, endpoint, params)
+        try:
+            with open(path, 'rb') as f:
+                entry = json_codec.load(f)
+            if time.time() - entry['stored_at'] > ttl:
+                self.misses += 1
+                return False, None
+            # Touch the file so eviction drops the least recently used entries
+            os.utime(path)
+            self.hits += 1
+            return True, entry['body']
+        except FileNotFoundError:
+            self.misses += 1
+            return False, None
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return False, None
+
+    def set(self, namespace, endpoint, params, body):
+        """
+        Store a response.
+
+        Args:
+            namespace (str): Server and user the response belongs to
+            endpoint (str): API endpoint
+            params (dict): Query parameters
+            body: Decoded JSON response
+        """
+        if not self.enabled or self.ttl(endpoint) <= 0:
+            return
+
+        path = self._entry_path(namespace, endpoint, params)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payload = json_codec.dumps({'stored_at': time.time(), 'endpoint': endpoint, 'body': body})
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not write cache entry for {endpoint}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(payload) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """Delete every cached response."""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._total_bytes = 0
+
+    def _entries(self):
+        """
+        List cached entry files.
+
+        Returns:
+            list: (mtime, size, path) tuples
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        """
+        Compute the total size of the cache directory.
+
+        Returns:
+            int: Size in bytes
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Remove least recently used entries until the cache is below 90% of its cap."""
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(self._entries()):
+            if self._total_bytes <= target:
+                break
+            if self._remove(path):
+                self._total_bytes -= size
+                self.evictions += 1
+
+    @staticmethod
+    def _remove(path):
+        """
+        Remove a cache file, ignoring errors.
+
+        Returns:
+            bool: True if the file was removed
+        """
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses and evictions
+        """
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,329 @@
+import logging
+import random
+import threading
+import time
+
+# Same logger as ExportLogger so retries show up in the export log
+logger = logging.getLogger('testrail_exporter')
+
+# Statuses worth retrying: the server or a proxy in front of it is briefly unavailable
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# Methods that can be repeated without side effects
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised when the server stayed unhealthy for longer than a request may wait."""
+    pass
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of the request volume.
+
+    Every first attempt deposits ``ratio`` tokens and every retry withdraws
+    one, so during an outage retries add at most ``ratio`` extra load on top
+    of normal traffic instead of multiplying it. A small floor of retries per
+    second keeps low-volume callers able to retry at all.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1.0, capacity=20):
+        """
+        Initialize the retry budget.
+
+        Args:
+            ratio (float): Retries allowed per request
+            min_per_second (float): Retries always allowed per second
+            capacity (int): Maximum tokens that can accumulate
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self):
+        """Credit the budget for a new request."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_withdraw(self):
+        """
+        Take one retry from the budget.
+
+        Returns:
+            bool: True if a retry is allowed
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """
+    Stops all requests while the server is failing.
+
+    After ``failure_threshold`` consecutive failures (5xx responses,
+    connection errors or timeouts) the circuit opens and every caller waits
+    for ``reset_timeout`` seconds. Then a single probe request is let through:
+    if it succeeds the circuit closes, otherwise it opens again.
+    """
+
+    # How often callers waiting for a probe check its outcome
+    PROBE_POLL_INTERVAL = 0.5
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_wait=600.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a probe
+            max_wait (float): Longest a single request waits for the circuit to close
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_wait = max_wait
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.open_count = 0
+
+    def admit(self):
+        """
+        Ask whether a request may be sent now.
+
+        Returns:
+            float: 0 if the request may proceed, otherwise seconds to wait
+                before asking again
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            if self.state == OPEN:
+                remaining = self._opened_until - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if not self._probe_in_flight:
+                self._probe_in_flight = True
+                return 0.0
+            return self.PROBE_POLL_INTERVAL
+
+    def record_success(self):
+        """Record a response showing the server is healthy."""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("TestRail is responding again; resuming requests")
+            self.state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Let another request probe after a probe failed without a verdict on the server's health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Record a 5xx response, connection error or timeout."""
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_until = time.monotonic() + self.reset_timeout
+                self._probe_in_flight = False
+                self.open_count += 1
+                logger.warning(
+                    f"TestRail looks unhealthy after {self._failures} consecutive failures; "
+                    f"pausing all requests for {self.reset_timeout:.0f}s"
+                )
+
+
+class RetryPolicy:
+    """
+    Decides whether and when failed requests are retried.
+
+    Idempotent requests are retried on connection errors, timeouts and
+    500/502/503/504 responses with full-jitter exponential backoff. Requests
+    that may have side effects are only retried when they never reached the
+    server. All clients sharing a policy share its retry budget and circuit
+    breaker. The breaker only decides when an attempt is sent: while the
+    circuit is open, attempts wait for the server, for at most the breaker's
+    ``max_wait`` in total, but each request still gets at most
+    ``max_attempts`` attempts. 429 responses are handled by the rate
+    limiter, not here.
+    """
+
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=30.0, retry_statuses=RETRY_STATUSES,
+                 budget=None, breaker=None, seed=None):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts (int): Attempts per request, including the first
+            base_delay (float): Backoff before the first retry, doubled for each further retry
+            max_delay (float): Upper bound for a single backoff
+            retry_statuses (set): HTTP statuses that are retried
+            budget (RetryBudget, optional): Shared retry budget; created if omitted
+            breaker (CircuitBreaker, optional): Shared circuit breaker; created if omitted
+            seed (int, optional): Random seed for reproducible jitter
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.retries = 0
+        self.budget_exhausted = 0
+        self.circuit_wait_seconds = 0.0
+
+    def on_request(self):
+        """Register a new request (not a retry) with the retry budget."""
+        self.budget.deposit()
+
+    def should_retry(self, method, attempt, status=None, sent=True):
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            method (str): HTTP method
+            attempt (int): Attempts made so far, including the failed one
+            status (int, optional): Response status, or None for connection errors and timeouts
+            sent (bool): Whether the request may have reached the server
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if status is not None and status not in self.retry_statuses:
+            return False
+        if sent and method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        if attempt >= self.max_attempts:
+            return False
+        if not self.budget.try_withdraw():
+            with self._lock:
+                self.budget_exhausted += 1
+            logger.debug(f"Retry budget exhausted; not retrying {method} (attempt {attempt})")
+            return False
+        with self._lock:
+            self.retries += 1
+        return True
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt (int): Attempts made so far
+            retry_after (float, optional): Delay requested by the server
+
+        Returns:
+            float: Seconds to wait
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        with self._lock:
+            delay = self._random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def circuit_delay(self, waited):
+        """
+        Get how long to wait before the circuit breaker admits a request.
+
+        Args:
+            waited (float): Seconds this request has already spent waiting for the circuit
+
+        Returns:
+            float: 0 if the request may proceed, otherwise seconds to sleep
+
+        Raises:
+            CircuitOpenError: If the request has waited longer than the breaker allows
+        """
+        delay = self.breaker.admit()
+        if delay <= 0:
+            return 0.0
+        if waited >= self.breaker.max_wait:
+            raise CircuitOpenError(
+                f"TestRail has been unavailable for more than {self.breaker.max_wait:.0f}s; giving up"
+            )
+        delay = min(delay, self.breaker.max_wait - waited)
+        with self._lock:
+            self.circuit_wait_seconds += delay
+        return delay
+
+    def wait_for_circuit(self, waited=0.0):
+        """
+        Block the calling thread until the circuit breaker admits a request.
+
+        Args:
+            waited (float): Seconds this request has already spent waiting for the circuit
+
+        Returns:
+            float: Total seconds this request has spent waiting for the circuit
+        """
+        while True:
+            delay = self.circuit_delay(waited)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def get_stats(self):
+        """
+        Get retry statistics.
+
+        Returns:
+            dict: Retries made, retries refused by the budget, circuit
+                breaker openings and seconds spent waiting for the circuit
+        """
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'budget_exhausted': self.budget_exhausted,
+                'circuit_opens': self.breaker.open_count,
+                'circuit_wait_seconds': round(self.circuit_wait_seconds, 3)
+            }
+
+
+_shared_policy = None
+_shared_policy_lock = threading.Lock()
+
+
+def get_shared_retry_policy():
+    """
+    Get the process-wide retry policy shared by all TestRail clients.
+
+    Returns:
+        RetryPolicy: The shared policy
+    """
+    global _shared_policy
+    with _shared_policy_lock:
+        if _shared_policy is None:
+            _shared_policy = RetryPolicy()
+        return _shared_policy
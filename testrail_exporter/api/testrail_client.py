@@ -1,13 +1,31 @@
+import logging
 import requests
-import json
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from .json_stream import iter_json_items
+from .metrics import ApiMetrics
+from .rate_limiter import get_shared_rate_limiter, parse_retry_after
+from .retry import get_shared_retry_policy
+from ..utils import json_codec
+
+logger = logging.getLogger('testrail_exporter')
+
+# How many 429 responses a single request may wait out before failing
+MAX_RATE_LIMIT_RETRIES = 10
+
+# Bytes read from the socket at a time when streaming responses
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class TestRailClient:
     """Client for interacting with the TestRail API."""
 
-    def __init__(self, url, username, api_key):
+    def __init__(self, url, username, api_key, pool_connections=4, pool_maxsize=10, page_workers=1,
+                 rate_limiter=None, response_cache=None, stream_responses=False, cassette=None,
+                 metrics=None, retry_policy=None):
         """
         Initialize the TestRail API client.
 
@@ -15,6 +33,21 @@ class TestRailClient:
             url (str): TestRail URL
             username (str): TestRail username
             api_key (str): TestRail API key
+            pool_connections (int): Number of host connection pools to keep
+            pool_maxsize (int): Maximum keep-alive connections per host pool
+            page_workers (int): Number of case pages fetched concurrently once the
+                first page shows more pages follow (1 fetches pages sequentially)
+            rate_limiter (RateLimiter, optional): Limiter pacing requests; defaults to
+                the process-wide limiter shared by all clients
+            response_cache (ResponseCache, optional): On-disk cache for GET responses
+            stream_responses (bool): Decode case pages incrementally from the socket
+                instead of buffering each page (see stream_cases())
+            cassette (Cassette, optional): Records every response, or replays
+                recorded responses instead of contacting the server
+            metrics (ApiMetrics, optional): Per-endpoint call statistics; a new
+                collector is created if omitted
+            retry_policy (RetryPolicy, optional): Backoff, retry budget and circuit
+                breaker; defaults to the process-wide policy shared by all clients
         """
         # Ensure URL doesn't have trailing slash but has the correct format
         self.url = url.rstrip('/')
@@ -24,16 +57,100 @@ class TestRailClient:
             
         self.auth = (username, api_key)
         self.headers = {'Content-Type': 'application/json'}
+        self.page_workers = max(1, page_workers)
+        # Concurrent page fetches each need their own pooled connection
+        pool_maxsize = max(pool_maxsize, self.page_workers)
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry_policy = retry_policy or get_shared_retry_policy()
+        self.response_cache = response_cache
+        self.stream_responses = stream_responses
+        self.cassette = cassette
+        self.metrics = metrics or ApiMetrics()
+        # Cached responses are only valid for the same server and user
+        self._cache_namespace = f"{self.url}|{username}"
+
+        # Identical GETs in flight at the same time share one round trip
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced_requests = 0
+
+        # A single session keeps TCP/TLS connections alive between calls so
+        # consecutive requests reuse sockets instead of re-handshaking
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying session and release pooled connections."""
+        self.session.close()
+        if self.cassette:
+            self.cassette.close()
+
+    def matches(self, url, username, api_key):
+        """
+        Check whether this client was created for the given server and credentials.
 
-    def _send_request(self, method, endpoint, data=None, params=None):
+        Args:
+            url (str): TestRail URL
+            username (str): TestRail username
+            api_key (str): TestRail API key
+
+        Returns:
+            bool: True if the client targets the same server with the same credentials
+        """
+        other_url = url.rstrip('/')
+        if not other_url.endswith('/index.php'):
+            other_url = f"{other_url}/index.php"
+        return self.url == other_url and self.auth == (username, api_key)
+
+    def get_pool_stats(self):
+        """
+        Get connection pool statistics for this client.
+
+        Returns:
+            dict: Request count, new connections opened and connections reused
+        """
+        requests_sent = 0
+        new_connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            new_connections += pool.num_connections
+        return {
+            'requests': requests_sent,
+            'new_connections': new_connections,
+            'reused_connections': max(requests_sent - new_connections, 0)
+        }
+
+    def _send_request(self, method, endpoint, data=None, params=None, use_cache=True):
         """
         Send a request to the TestRail API.
 
+        GET responses are served from the response cache when a fresh entry
+        exists, unless ``use_cache`` is False. Concurrent GET requests for the same endpoint and parameters are
+        coalesced: the first caller performs the request and the others wait
+        for and share its decoded result, so callers must not mutate it.
+
         Args:
             method (str): HTTP method (GET, POST, etc.)
             endpoint (str): API endpoint
             data (dict, optional): Request data for POST requests
             params (dict, optional): Query parameters for GET requests
+            use_cache (bool): Whether the response cache may answer and store
+                the request; False for reads that must see the server's current state
 
         Returns:
             dict: API response as JSON
@@ -41,59 +158,366 @@ class TestRailClient:
         Raises:
             Exception: If the request fails
         """
+        if method != 'GET':
+            return self._perform_request(method, endpoint, data=data, params=params)
+
+        if self.response_cache and use_cache:
+            hit, cached = self.response_cache.get(self._cache_namespace, endpoint, params)
+            if hit:
+                return cached
+
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced_requests += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = self._perform_request(method, endpoint, params=params)
+            if self.response_cache and use_cache:
+                self.response_cache.set(self._cache_namespace, endpoint, params, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _perform_request(self, method, endpoint, data=None, params=None, stream=False, headers=None):
+        """
+        Perform a single request against the TestRail API, with retries.
+
+        Args:
+            method (str): HTTP method (GET, POST, etc.)
+            endpoint (str): API endpoint
+            data (dict, optional): Request data for POST requests
+            params (dict, optional): Query parameters for GET requests
+            stream (bool): Return the open response once the status is known
+                instead of reading and decoding the body
+            headers (dict, optional): Extra request headers, such as Range
+
+        Returns:
+            dict: API response as JSON, or the requests.Response when streaming
+
+        Raises:
+            Exception: If the request fails
+        """
+        timer = self.metrics.start(endpoint)
+        try:
+            result = self._request_with_retries(method, endpoint, data, params, stream, timer, headers)
+        except Exception as e:
+            timer.finish(error=e)
+            raise
+        timer.finish()
+        return result
+
+    def _request_with_retries(self, method, endpoint, data, params, stream, timer, headers=None):
+        """
+        Run the retry loop for _perform_request.
+
+        Args:
+            timer (RequestTimer): Collects retries, bytes and latency for the call
+
+        Returns:
+            dict: API response as JSON, or the requests.Response when streaming
+        """
         # Construct the full URL properly
         url = f"{self.url}?/api/v2/{endpoint}"
         
-        max_retries = 3
-        retry_count = 0
+        # Replayed responses never reach the server, so they bypass pacing and the breaker
+        live = not (self.cassette and self.cassette.replaying)
+        policy = self.retry_policy
+        policy.on_request()
+        attempt = 0
+        rate_limit_retries = 0
+        circuit_waited = 0.0
         
-        while retry_count < max_retries:
+        while True:
+            if live:
+                # Wait while the server is unhealthy, then for a slot in the shared request budget
+                circuit_waited = policy.wait_for_circuit(circuit_waited)
+                self.rate_limiter.acquire()
+            attempt += 1
+            
             try:
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    auth=self.auth,
-                    headers=self.headers,
-                    json=data,
-                    params=params,
-                    timeout=30  # Add timeout to prevent hanging
-                )
-                
-                # Add request details to error message for debugging
-                response.raise_for_status()
-                
-                try:
-                    return response.json()
-                except json.JSONDecodeError as je:
-                    raise Exception(f"Invalid JSON response: {response.text[:200]}...")
-                    
+                timer.begin_attempt()
+                response = self._request(method, url, endpoint, data, params, stream, headers)
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                # Retry on connection errors or timeouts
-                retry_count += 1
-                if retry_count >= max_retries:
-                    error_message = f"Failed after {max_retries} retries. URL: {url}\nError: {str(e)}"
-                    raise Exception(error_message)
-                
-                # Wait before retrying (exponential backoff)
-                time.sleep(1 * retry_count)
-                continue
-                
+                if live:
+                    policy.breaker.record_failure()
+                # A connect timeout means the request never reached the server
+                sent = not isinstance(e, requests.exceptions.ConnectTimeout)
+                if policy.should_retry(method, attempt, sent=sent):
+                    timer.retries += 1
+                    time.sleep(policy.backoff(attempt))
+                    continue
+                raise Exception(f"Failed after {attempt} attempts. URL: {url}\nError: {str(e)}")
             except requests.exceptions.RequestException as e:
-                error_message = f"Failed URL: {url}\n"
-                
-                if hasattr(e, 'response') and e.response is not None:
-                    error_message += f"Status code: {e.response.status_code}\n"
-                    if hasattr(e.response, 'content'):
-                        content = e.response.content.decode('utf-8')
-                        try:
-                            error_data = json.loads(content)
-                            error_message += f"Error: {error_data.get('error', content)}"
-                        except json.JSONDecodeError:
-                            error_message += f"Response: {content}"
+                if live:
+                    policy.breaker.release_probe()
+                raise Exception(f"Failed URL: {url}\nError: {str(e)}")
+            except BaseException:
+                # Never leave a half-open circuit waiting on a probe that is gone
+                if live:
+                    policy.breaker.release_probe()
+                raise
+            
+            status = response.status_code
+            if live:
+                if status >= 500:
+                    policy.breaker.record_failure()
                 else:
-                    error_message += f"Error: {str(e)}"
-                    
-                raise Exception(error_message)
+                    policy.breaker.record_success()
+            
+            if status == 429 and rate_limit_retries < MAX_RATE_LIMIT_RETRIES:
+                # Pause every client sharing the limiter for as long as the server asks
+                rate_limit_retries += 1
+                timer.retries += 1
+                response.close()
+                self.rate_limiter.pause(parse_retry_after(response.headers.get('Retry-After')))
+                continue
+            
+            if status >= 500 and policy.should_retry(method, attempt, status=status):
+                timer.retries += 1
+                retry_after = response.headers.get('Retry-After')
+                delay = policy.backoff(attempt, parse_retry_after(retry_after) if retry_after else None)
+                logger.warning(f"TestRail returned {status} for {endpoint}; retrying in {delay:.1f}s")
+                response.close()
+                time.sleep(delay)
+                continue
+            
+            if status >= 400:
+                raise Exception(self._format_http_error(url, response))
+            
+            if stream:
+                return response
+            
+            timer.bytes_received = len(response.content)
+            try:
+                return json_codec.loads(response.content)
+            except json_codec.JSONDecodeError:
+                raise Exception(f"Invalid JSON response: {response.text[:200]}...")
+
+    @staticmethod
+    def _format_http_error(url, response):
+        """
+        Build the error message for a failed response.
+
+        Args:
+            url (str): Request URL
+            response (requests.Response): Response with an error status
+
+        Returns:
+            str: Message with the URL, status code and TestRail's error text
+        """
+        error_message = f"Failed URL: {url}\n"
+        error_message += f"Status code: {response.status_code}\n"
+        content = response.content.decode('utf-8', errors='replace')
+        try:
+            error_data = json_codec.loads(content)
+            error_message += f"Error: {error_data.get('error', content)}"
+        except (json_codec.JSONDecodeError, AttributeError):
+            error_message += f"Response: {content}"
+        return error_message
+
+    def _request(self, method, url, endpoint, data, params, stream, headers=None):
+        """
+        Send one HTTP request, or serve it from the cassette when replaying.
+
+        Returns:
+            requests.Response: The response
+        """
+        if self.cassette and self.cassette.replaying:
+            return self.cassette.play(method, url, endpoint, params)
+
+        start = time.perf_counter()
+        response = self.session.request(
+            method=method,
+            url=url,
+            json=data,
+            params=params,
+            headers=headers,
+            timeout=30,  # Add timeout to prevent hanging
+            stream=stream
+        )
+        if self.cassette:
+            # Reading the body here includes the transfer in the recorded latency
+            response.content
+            self.cassette.record(method, endpoint, params, response, time.perf_counter() - start)
+        return response
+
+    def _iter_pages(self, endpoint, key, params=None, use_cache=True):
+        """
+        Iterate over every item of a bulk endpoint, following pagination links.
+
+        TestRail 6.7+ wraps bulk responses in an envelope with ``offset``,
+        ``limit``, ``size`` and ``_links.next``; older versions return a
+        plain list. Both shapes are handled. Pages are requested lazily as
+        the caller consumes items.
+
+        Args:
+            endpoint (str): API endpoint
+            key (str): Envelope key holding the items (e.g. 'cases')
+            params (dict, optional): Query parameters for the first page
+            use_cache (bool): Whether pages may come from the response cache
+
+        Yields:
+            dict: Individual items from each page
+        """
+        while endpoint:
+            response = self._send_request('GET', endpoint, params=params, use_cache=use_cache)
+
+            if isinstance(response, list):
+                # Pre-6.7 servers return everything in a single list
+                yield from response
+                return
+
+            yield from response.get(key) or []
+
+            next_link = (response.get('_links') or {}).get('next')
+            endpoint = self._endpoint_from_link(next_link)
+            # The next link already carries the query string
+            params = None
+
+    def _iter_pages_concurrent(self, endpoint, key, params=None, max_workers=4, use_cache=True):
+        """
+        Iterate over every item of a bulk endpoint, fetching pages concurrently.
+
+        The first page is fetched on its own. If it is full and a next link is
+        present, the remaining pages are requested by offset through a bounded
+        pool of worker threads. TestRail does not report the total, so the
+        number of pages in flight starts at one and doubles with every full
+        page, up to ``max_workers``: short results cost no speculative
+        requests, and long ones at most ``max_workers - 1`` past the end.
+        Pages are yielded strictly in offset order, so callers see the same
+        ordering as a sequential walk. Fetching stops at the first short page.
+
+        Args:
+            endpoint (str): API endpoint
+            key (str): Envelope key holding the items (e.g. 'cases')
+            params (dict, optional): Query parameters for the first page
+            max_workers (int): Maximum number of pages in flight
+            use_cache (bool): Whether pages may come from the response cache
+
+        Yields:
+            dict: Individual items from each page
+        """
+        params = dict(params or {})
+        first_page = self._send_request('GET', endpoint, params=params, use_cache=use_cache)
+
+        if isinstance(first_page, list):
+            # Pre-6.7 servers return everything in a single list
+            yield from first_page
+            return
+
+        items = first_page.get(key) or []
+        yield from items
+
+        next_link = (first_page.get('_links') or {}).get('next')
+        limit = first_page.get('limit') or len(items)
+        if not next_link or not limit or len(items) < limit:
+            # Either this was the last page or the server does not report a
+            # usable page size, so fall back to following the links
+            if next_link:
+                yield from self._iter_pages(self._endpoint_from_link(next_link), key, use_cache=use_cache)
+            return
+
+        next_offset = (first_page.get('offset') or 0) + limit
+
+        def fetch(offset):
+            page_params = dict(params, limit=limit, offset=offset)
+            return self._send_request('GET', endpoint, params=page_params, use_cache=use_cache)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = [executor.submit(fetch, next_offset)]
+        next_offset += limit
+        window = 1
+        try:
+            while pending:
+                page = pending.pop(0).result()
+                page_items = (page.get(key) or []) if isinstance(page, dict) else page
+                yield from page_items
+
+                has_next = isinstance(page, dict) and (page.get('_links') or {}).get('next')
+                if len(page_items) < limit or not has_next:
+                    break
+
+                # Another full page: widen the window and keep it full
+                window = min(max_workers, window * 2)
+                while len(pending) < window:
+                    pending.append(executor.submit(fetch, next_offset))
+                    next_offset += limit
+        finally:
+            # Drop speculative requests past the last page
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _stream_pages(self, endpoint, key, params=None):
+        """
+        Iterate over every item of a bulk endpoint, decoding each page as it arrives.
+
+        Unlike _iter_pages, page bodies are never held in memory as a whole:
+        items are parsed one at a time from the socket. Streamed pages are
+        rate limited and retried like any other request until the response
+        status arrives, but bypass the response cache and request coalescing.
+
+        Args:
+            endpoint (str): API endpoint
+            key (str): Envelope key holding the items (e.g. 'cases')
+            params (dict, optional): Query parameters for the first page
+
+        Yields:
+            dict: Individual items from each page
+        """
+        while endpoint:
+            envelope = {}
+            response = self._perform_request('GET', endpoint, params=params, stream=True)
+            received = [0]
+
+            def counted_chunks():
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    received[0] += len(chunk)
+                    yield chunk
+
+            try:
+                yield from iter_json_items(counted_chunks(), key, meta=envelope)
+            except ValueError as e:
+                raise Exception(f"Invalid JSON response from {endpoint}: {e}")
+            finally:
+                response.close()
+                # The body is read after the call was recorded
+                self.metrics.add_bytes(endpoint, received[0])
+
+            next_link = (envelope.get('_links') or {}).get('next')
+            endpoint = self._endpoint_from_link(next_link)
+            # The next link already carries the query string
+            params = None
+
+    @staticmethod
+    def _endpoint_from_link(link):
+        """
+        Convert a pagination link into an endpoint for _send_request.
+
+        Args:
+            link (str): Link such as '/api/v2/get_cases/1&limit=250&offset=250'
+
+        Returns:
+            str: Endpoint relative to the API root, or None if there is no link
+        """
+        if not link:
+            return None
+        prefix = '/api/v2/'
+        return link[len(prefix):] if link.startswith(prefix) else link.lstrip('/')
 
     def get_projects(self, is_completed=None):
         """
@@ -105,11 +529,23 @@ class TestRailClient:
         Returns:
             list: List of projects
         """
+        return list(self.iter_projects(is_completed))
+
+    def iter_projects(self, is_completed=None):
+        """
+        Iterate over all projects, fetching pages as needed.
+
+        Args:
+            is_completed (bool, optional): Filter for completed projects
+
+        Yields:
+            dict: Project data
+        """
         params = {}
         if is_completed is not None:
             params['is_completed'] = 1 if is_completed else 0
         
-        return self._send_request('GET', 'get_projects', params=params)
+        return self._iter_pages('get_projects', 'projects', params=params)
 
     def get_project(self, project_id):
         """
@@ -133,7 +569,19 @@ class TestRailClient:
         Returns:
             list: List of suites
         """
-        return self._send_request('GET', f'get_suites/{project_id}')
+        return list(self.iter_suites(project_id))
+
+    def iter_suites(self, project_id):
+        """
+        Iterate over all test suites for a project, fetching pages as needed.
+
+        Args:
+            project_id (int): Project ID
+
+        Yields:
+            dict: Suite data
+        """
+        return self._iter_pages(f'get_suites/{project_id}', 'suites')
 
     def get_suite(self, suite_id):
         """
@@ -158,13 +606,27 @@ class TestRailClient:
         Returns:
             list: List of sections
         """
+        return list(self.iter_sections(project_id, suite_id))
+
+    def iter_sections(self, project_id, suite_id=None):
+        """
+        Iterate over all sections for a project and suite, fetching pages as needed.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+
+        Yields:
+            dict: Section data
+        """
         params = {}
         if suite_id is not None:
             params['suite_id'] = suite_id
         
-        return self._send_request('GET', f'get_sections/{project_id}', params=params)
+        return self._iter_pages(f'get_sections/{project_id}', 'sections', params=params)
 
-    def get_cases(self, project_id, suite_id=None, section_id=None):
+    def get_cases(self, project_id, suite_id=None, section_id=None, max_workers=None,
+                  updated_after=None, created_after=None, use_cache=True):
         """
         Get all test cases for a project, optionally filtered by suite or section.
 
@@ -172,17 +634,115 @@ class TestRailClient:
             project_id (int): Project ID
             suite_id (int, optional): Suite ID
             section_id (int, optional): Section ID
+            max_workers (int, optional): Pages fetched concurrently; defaults
+                to the client's page_workers setting
+            updated_after (int, optional): Only cases updated after this UNIX timestamp
+            created_after (int, optional): Only cases created after this UNIX timestamp
+            use_cache (bool): Whether pages may come from the response cache
 
         Returns:
             list: List of test cases
         """
+        return list(self.iter_cases(project_id, suite_id, section_id, max_workers,
+                                    updated_after=updated_after, created_after=created_after,
+                                    use_cache=use_cache))
+
+    def iter_cases(self, project_id, suite_id=None, section_id=None, max_workers=None,
+                   updated_after=None, created_after=None, use_cache=True):
+        """
+        Iterate over test cases for a project, fetching pages as needed.
+
+        With more than one worker, pages after the first are fetched
+        concurrently by offset but still yielded in order. Otherwise, if the
+        client was created with ``stream_responses=True``, pages are decoded
+        incrementally (see stream_cases()).
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+            section_id (int, optional): Section ID
+            max_workers (int, optional): Pages fetched concurrently; defaults
+                to the client's page_workers setting
+            updated_after (int, optional): Only cases updated after this UNIX timestamp
+            created_after (int, optional): Only cases created after this UNIX timestamp
+            use_cache (bool): Whether pages may come from the response cache
+                (streamed pages never do)
+
+        Yields:
+            dict: Test case data
+        """
+        params = self._case_filter_params(suite_id, section_id, updated_after, created_after)
+        
+        max_workers = max_workers or self.page_workers
+        if max_workers > 1:
+            return self._iter_pages_concurrent(f'get_cases/{project_id}', 'cases', params=params,
+                                               max_workers=max_workers, use_cache=use_cache)
+        if self.stream_responses:
+            return self._stream_pages(f'get_cases/{project_id}', 'cases', params=params)
+        return self._iter_pages(f'get_cases/{project_id}', 'cases', params=params, use_cache=use_cache)
+
+    def stream_cases(self, project_id, suite_id=None, section_id=None, updated_after=None, created_after=None):
+        """
+        Iterate over test cases, parsing them one at a time from the response stream.
+
+        Peak memory scales with the largest single case rather than a whole
+        page, which matters for cases with large ``custom_steps_separated``
+        HTML. Pages are fetched sequentially and are not cached.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+            section_id (int, optional): Section ID
+            updated_after (int, optional): Only cases updated after this UNIX timestamp
+            created_after (int, optional): Only cases created after this UNIX timestamp
+
+        Yields:
+            dict: Test case data
+        """
+        params = self._case_filter_params(suite_id, section_id, updated_after, created_after)
+        return self._stream_pages(f'get_cases/{project_id}', 'cases', params=params)
+
+    def get_cases_page(self, project_id, suite_id=None, offset=0, limit=250, use_cache=True):
+        """
+        Get a single page of test cases.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+            offset (int): Index of the first case to return
+            limit (int): Maximum number of cases to return (1-250)
+            use_cache (bool): Whether the page may come from the response cache
+
+        Returns:
+            list: Test cases on the page
+        """
+        params = self._case_filter_params(suite_id)
+        params['offset'] = offset
+        params['limit'] = limit
+        response = self._send_request('GET', f'get_cases/{project_id}', params=params, use_cache=use_cache)
+        if isinstance(response, list):
+            # Pre-6.7 servers ignore offset/limit and return every case
+            return response[offset:offset + limit]
+        return response.get('cases') or []
+
+    @staticmethod
+    def _case_filter_params(suite_id=None, section_id=None, updated_after=None, created_after=None):
+        """
+        Build the query parameters for get_cases.
+
+        Returns:
+            dict: Query parameters
+        """
         params = {}
         if suite_id is not None:
             params['suite_id'] = suite_id
         if section_id is not None:
             params['section_id'] = section_id
-        
-        return self._send_request('GET', f'get_cases/{project_id}', params=params)
+        if updated_after is not None:
+            params['updated_after'] = int(updated_after)
+        if created_after is not None:
+            params['created_after'] = int(created_after)
+        return params
 
     def get_case(self, case_id):
         """
@@ -213,6 +773,15 @@ class TestRailClient:
             list: List of case types
         """
         return self._send_request('GET', 'get_case_types')
+
+    def get_case_fields(self):
+        """
+        Get all case fields from TestRail, including custom fields and their options.
+
+        Returns:
+            list: List of case fields
+        """
+        return self._send_request('GET', 'get_case_fields')
     
     def get_templates(self, project_id):
         """
@@ -234,6 +803,101 @@ class TestRailClient:
             project_id (int): Project ID
 
         Returns:
-            dict: Response containing milestones array
+            list: List of milestones
+        """
+        return list(self.iter_milestones(project_id))
+
+    def iter_milestones(self, project_id):
+        """
+        Iterate over all milestones for a project, fetching pages as needed.
+
+        Args:
+            project_id (int): Project ID
+
+        Yields:
+            dict: Milestone data
+        """
+        return self._iter_pages(f'get_milestones/{project_id}', 'milestones')
+
+    def get_shared_steps(self, project_id):
+        """
+        Get all shared steps for a project.
+
+        Args:
+            project_id (int): Project ID
+
+        Returns:
+            list: List of shared steps
+        """
+        return list(self.iter_shared_steps(project_id))
+
+    def iter_shared_steps(self, project_id):
+        """
+        Iterate over all shared steps for a project, fetching pages as needed.
+
+        Args:
+            project_id (int): Project ID
+
+        Yields:
+            dict: Shared step data
+        """
+        return self._iter_pages(f'get_shared_steps/{project_id}', 'shared_steps')
+
+    def get_shared_step(self, shared_step_id):
+        """
+        Get a shared step with its steps.
+
+        Args:
+            shared_step_id (int): Shared step ID
+
+        Returns:
+            dict: Shared step data
+        """
+        return self._send_request('GET', f'get_shared_step/{shared_step_id}')
+
+    def download_attachment(self, attachment_id, fp, offset=0):
+        """
+        Stream an attachment's content into a binary file.
+
+        The body is copied chunk by chunk, so attachments of any size are
+        never held in memory. The request is rate limited and retried like
+        any other until the response status arrives.
+
+        With an offset, only the rest of the content is requested with a
+        Range header and appended to ``fp``, which must be positioned at the
+        offset. If the server ignores the range and sends the whole
+        attachment (200 instead of 206), ``fp`` is truncated and rewritten
+        from the start.
+
+        Args:
+            attachment_id (int or str): Attachment ID (newer TestRail versions use string IDs)
+            fp: Binary file object to write to
+            offset (int): Bytes of the attachment already in ``fp``
+
+        Returns:
+            tuple: (bytes written by this call, Content-Type header or None)
+
+        Raises:
+            Exception: If the request fails, or the server returns a different range
         """
-        return self._send_request('GET', f'get_milestones/{project_id}')
\ No newline at end of file
+        endpoint = f'get_attachment/{attachment_id}'
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+        response = self._perform_request('GET', endpoint, stream=True, headers=headers)
+        written = 0
+        try:
+            if offset and response.status_code == 206:
+                content_range = response.headers.get('Content-Range', '')
+                if not content_range.startswith(f'bytes {offset}-'):
+                    raise Exception(f"Attachment {attachment_id}: asked for bytes {offset}- but got {content_range!r}")
+            elif offset:
+                # The server sent the whole attachment
+                fp.seek(0)
+                fp.truncate()
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                fp.write(chunk)
+                written += len(chunk)
+        finally:
+            response.close()
+            # The body is read after the call was recorded
+            self.metrics.add_bytes(endpoint, written)
+        return written, response.headers.get('Content-Type')
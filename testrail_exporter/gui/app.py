@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
+import logging
 import threading
 import json
 import os
@@ -11,16 +12,29 @@ from PIL import Image, ImageTk
 from testrail_exporter.utils.exporter import Exporter, ExportError
 from testrail_exporter.utils.testrail2xray import convert_xml_to_xray_csv, XrayConversionError
 from testrail_exporter.utils.logger import ExportLogger
+from testrail_exporter.utils.case_sync import IncrementalCaseSync
+from testrail_exporter.utils.mirror import LocalMirror, MirrorCaseSync
+from testrail_exporter.utils.call_planner import plan_case_fetches
+from testrail_exporter.utils.metadata import CaseMetadata
+from testrail_exporter.utils.attachments import AttachmentDownloader, collect_attachment_ids
+from testrail_exporter.utils.shared_steps import SharedStepResolver
+from testrail_exporter.utils.name_resolver import CaseNameResolver
 
 from testrail_exporter.gui.settings import SettingsFrame
 from testrail_exporter.gui.tree_view import CheckableTreeview
 from testrail_exporter.api.testrail_client import TestRailClient
+from testrail_exporter.api.rate_limiter import get_shared_rate_limiter, DEFAULT_REQUESTS_PER_MINUTE
+from testrail_exporter.api.response_cache import ResponseCache
 from testrail_exporter.models.project import Project
 from testrail_exporter.models.suite import Suite
 from testrail_exporter.models.section import Section
-from testrail_exporter.models.case import Case
+from testrail_exporter.models.case import LazyCase
+from testrail_exporter.models.case_store import CaseStore
 from testrail_exporter.utils.config import Config
 
+# Same logger as ExportLogger, for errors of background work outside an export
+logger = logging.getLogger('testrail_exporter')
+
 
 class Application(ctk.CTk):
     """Main application window."""
@@ -240,6 +254,10 @@ class Application(ctk.CTk):
         
         # Initialize instance variables
         self.client = None
+        self.case_sync = None  # Incremental case sync, if enabled in the config
+        self.mirror = None  # Local SQLite mirror of the current server, if enabled in the config
+        self.metadata = None  # ID -> name lookup tables for the current server
+        self.attachment_lock = threading.Lock()  # One attachment download run at a time
         self.projects = []
         self.current_project = None
         self.last_selected_project_name = None  # Store project name before MPS toggle
@@ -251,17 +269,18 @@ class Application(ctk.CTk):
         self.loading_cancelled = False
         self.active_thread = None
         
+        # On-disk cache of API responses so restarts don't re-download everything
+        self.response_cache = ResponseCache(
+            enabled=self.config.get_setting('testrail', 'response_cache', True)
+        )
+        
         # Create a cache for storing API data
         self.cache = {
             'projects': None,
             'suites': {},  # Project ID -> Suites
             'sections': {},  # Suite ID -> Sections
             'cases': {},  # Suite ID+Section ID -> Cases
-            'loading_state': {},  # Track loading completion state for projects
-            'priorities': None,  # Cache priorities (not project-specific)
-            'case_types': None,  # Cache case types (not project-specific)
-            'template': {},  # Project ID -> Templates
-            'milestone': {}  # Project ID -> Milestones
+            'loading_state': {}  # Track loading completion state for projects
         }
         
         
@@ -401,6 +420,9 @@ class Application(ctk.CTk):
         if width > 100 and height > 100:  # Avoid saving minimized size
             self.config.set_setting('ui', 'window_width', width)
             self.config.set_setting('ui', 'window_height', height)
+        
+        if self.mirror:
+            self.mirror.close()
             
         # Destroy the window
         self.destroy()
@@ -473,7 +495,45 @@ class Application(ctk.CTk):
         self.config.set_setting('testrail', 'username', settings['username'])
         self.config.set_setting('testrail', 'api_key', settings['api_key'])
         
-        self.client = TestRailClient(settings['url'], settings['username'], settings['api_key'])
+        # Keep the existing client (and its pooled connections) if the
+        # credentials have not changed
+        if self.client and self.client.matches(settings['url'], settings['username'], settings['api_key']):
+            return
+
+        # All clients share one request budget; TestRail Cloud enforces a per-minute limit
+        requests_per_minute = self.config.get_setting('testrail', 'requests_per_minute', DEFAULT_REQUESTS_PER_MINUTE)
+        get_shared_rate_limiter().set_rate(requests_per_minute)
+        
+        # Large suites fetch their remaining case pages concurrently, unless
+        # case pages are streamed to keep memory low (streaming is sequential)
+        stream_cases = self.config.get_setting('testrail', 'stream_cases', False)
+        page_workers = 1 if stream_cases else self.config.get_setting('testrail', 'page_workers', 4)
+        
+        self.client = TestRailClient(settings['url'], settings['username'], settings['api_key'],
+                                     page_workers=page_workers, response_cache=self.response_cache,
+                                     stream_responses=stream_cases)
+        
+        # With the local mirror enabled, the project tree is shown from disk and
+        # suite exports read the mirrored cases, downloading only changed ones
+        if self.mirror and (self.mirror.url != settings['url'] or
+                            not self.config.get_setting('export', 'local_mirror', False)):
+            self.mirror.close()
+            self.mirror = None
+        if self.config.get_setting('export', 'local_mirror', False):
+            if not self.mirror:
+                self.mirror = LocalMirror(settings['url'])
+            self.case_sync = MirrorCaseSync(self.client, self.mirror)
+        # Suite exports only download changed cases when incremental sync is enabled
+        elif self.config.get_setting('export', 'incremental_sync', False):
+            self.case_sync = IncrementalCaseSync(self.client)
+        else:
+            self.case_sync = None
+        
+        # Priorities, types, templates, milestones and case fields for ID -> name conversion
+        self.metadata = CaseMetadata(self.client)
+        if self.mirror:
+            # Names are available before the lookup tables are downloaded again
+            self.mirror.restore_metadata(self.metadata)
     
     def _load_projects(self):
         """Load projects from TestRail."""
@@ -485,35 +545,40 @@ class Application(ctk.CTk):
             
             # If refreshing, clear the cache
             if is_refresh:
+                # A refresh should always hit the server
+                self.response_cache.clear()
                 self.cache = {
                     'projects': None,
                     'suites': {},
                     'sections': {},
                     'cases': {},
-                    'loading_state': {},
-                    'priorities': None,
-                    'case_types': None,
-                    'template': {},
-                    'milestone': {}
+                    'loading_state': {}
                 }
+                self.metadata.clear()
             
             # Cancel any ongoing loading operations
             self.loading_cancelled = True
             
             # Wait a moment to ensure any running thread notices the cancellation flag
-            self.after(100, self._start_load_projects)
+            # (a refresh skips the local mirror and goes to the server)
+            self.after(100, lambda: self._start_load_projects(use_mirror=not is_refresh))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create client: {str(e)}")
             self._update_progress("", reset=True)
             self.status_var.set("")
     
-    def _start_load_projects(self):
-        """Start loading projects after ensuring previous operations are cancelled."""
+    def _start_load_projects(self, use_mirror=True):
+        """
+        Start loading projects after ensuring previous operations are cancelled.
+        
+        Args:
+            use_mirror: Whether projects may be shown from the local mirror
+        """
         # Check if there's still an active thread running
         if (hasattr(self, 'active_thread') and self.active_thread and 
             self.active_thread.is_alive()):
             # Thread is still running, wait a bit more
-            self.after(50, lambda: self._start_load_projects())
+            self.after(50, lambda: self._start_load_projects(use_mirror))
             return
             
         # Reset cancellation flag
@@ -530,8 +595,19 @@ class Application(ctk.CTk):
             self.after(0, self._update_projects_ui)
             return
         
-        # We'll have 3 API calls (for projects, priorities, and case types)
-        self.api_calls_total = 3
+        # Show the mirrored projects right away and refresh the mirror in the background
+        if self.mirror and use_mirror:
+            project_data = self.mirror.get_projects()
+            if project_data:
+                self.projects = [Project(p) for p in project_data]
+                self.cache['projects'] = self.projects
+                self._update_progress("Loading from local mirror...", reset=True)
+                self.after(0, self._update_projects_ui)
+                threading.Thread(target=self._mirror_projects_thread, args=(project_data,), daemon=True).start()
+                return
+        
+        # We'll have 2 API steps (projects, then the shared lookup tables)
+        self.api_calls_total = 2
         
         # Load projects in a separate thread
         self.active_thread = threading.Thread(target=self._load_projects_thread)
@@ -555,48 +631,18 @@ class Application(ctk.CTk):
             
             # Cache the projects
             self.cache['projects'] = self.projects
+            if self.mirror:
+                self.mirror.replace_projects(project_data)
             
             self._register_api_call()
             
-            # Load priorities if not cached yet
-            if self.cache['priorities'] is None:
-                # Check if operation has been cancelled before priorities call
-                if self.loading_cancelled:
-                    return
-                    
-                priorities_data = self.client.get_priorities()
-                
-                # Check if operation has been cancelled before processing
-                if self.loading_cancelled:
-                    return
-                    
-                # Cache the priorities
-                self.cache['priorities'] = priorities_data
-                
-                self._register_api_call()
-            else:
-                # Priorities already cached, skip API call
-                self._register_api_call()
-            
-            # Load case types if not cached yet
-            if self.cache['case_types'] is None:
-                # Check if operation has been cancelled before case types call
-                if self.loading_cancelled:
-                    return
-                    
-                case_types_data = self.client.get_case_types()
-                
-                # Check if operation has been cancelled before processing
-                if self.loading_cancelled:
-                    return
-                    
-                # Cache the case types
-                self.cache['case_types'] = case_types_data
-                
-                self._register_api_call()
-            else:
-                # Case types already cached, skip API call
-                self._register_api_call()
+            # Load priorities, case types and case fields concurrently
+            if self.loading_cancelled:
+                return
+            self.metadata.warm_up()
+            if self.mirror:
+                self.mirror.save_metadata(self.metadata)
+            self._register_api_call()
             
             # Update UI in the main thread
             if not self.loading_cancelled:
@@ -605,6 +651,27 @@ class Application(ctk.CTk):
             if not self.loading_cancelled:
                 self.after(0, lambda: self._show_error(f"Failed to load projects: {str(e)}"))
     
+    def _mirror_projects_thread(self, mirrored):
+        """
+        Refresh the mirrored projects and lookup tables from the server in the background.
+        
+        Args:
+            mirrored: Project dictionaries shown from the mirror
+        """
+        try:
+            project_data = self.client.get_projects()
+            self.mirror.replace_projects(project_data)
+            self.metadata.warm_up()
+            self.mirror.save_metadata(self.metadata)
+        except Exception as e:
+            logger.warning(f"Failed to sync the local mirror: {e}")
+            return
+        
+        # The list on screen is kept; a refresh shows the server's
+        if [(p['id'], p['name']) for p in mirrored] != [(p['id'], p['name']) for p in self.mirror.get_projects()]:
+            self.cache['projects'] = None
+            self.after(0, lambda: self.status_var.set("Projects changed on the server, refresh to update the list"))
+    
     def _update_projects_ui(self):
         """Update the projects dropdown after loading projects."""
         # Sort projects alphabetically by name
@@ -707,6 +774,20 @@ class Application(ctk.CTk):
             self.after(0, self._update_suites_ui)
             return
         
+        # Show the mirrored suites and sections right away and sync the mirror in the background
+        if self.mirror:
+            suites = self._load_suites_from_mirror(self.current_project.id, current_wants_sections)
+            if suites is not None:
+                self.current_project.suites = suites
+                self.cache['suites'][self.current_project.id] = suites
+                self.cache['loading_state'][self.current_project.id] = (
+                    'completed_with_sections' if current_wants_sections else 'completed_without_sections')
+                self._update_progress("Loading from local mirror...", reset=True)
+                self.after(0, self._update_suites_ui)
+                threading.Thread(target=self._mirror_project_thread, args=(self.current_project, current_wants_sections),
+                                 daemon=True).start()
+                return
+        
         # Mark project as loading
         self.cache['loading_state'][self.current_project.id] = 'loading'
         
@@ -740,6 +821,8 @@ class Application(ctk.CTk):
                     self.cache['loading_state'][self.current_project.id] = 'incomplete'
                 return
                 
+            if self.mirror:
+                self.mirror.replace_suites(self.current_project.id, suites_data)
             suites = [Suite(s) for s in suites_data]
             
             # Sort suites alphabetically by name
@@ -782,6 +865,8 @@ class Application(ctk.CTk):
                                 self.cache['loading_state'][self.current_project.id] = 'incomplete'
                             return
                             
+                        if self.mirror:
+                            self.mirror.replace_sections(self.current_project.id, suite.id, sections_data)
                         sections = [Section(s) for s in sections_data]
                         
                         # Sort sections alphabetically by name
@@ -808,6 +893,123 @@ class Application(ctk.CTk):
             if not self.loading_cancelled:
                 self.after(0, lambda: self._show_error(f"Failed to load suites: {str(e)}"))
     
+    def _load_suites_from_mirror(self, project_id, with_sections):
+        """
+        Build a project's suites from the local mirror.
+        
+        Args:
+            project_id: The ID of the project
+            with_sections: Whether the suites' sections are needed
+            
+        Returns:
+            list: Suites sorted by name, or None if the mirror does not hold them yet
+        """
+        suites_data = self.mirror.get_suites(project_id)
+        if not suites_data:
+            return None
+        
+        suites = [Suite(s) for s in suites_data]
+        suites.sort(key=lambda s: s.name.lower())
+        sections_by_suite = {}
+        for suite in suites:
+            if with_sections:
+                sections_data = self.mirror.get_sections(project_id, suite.id)
+                if sections_data is None:
+                    return None
+                sections = [Section(s) for s in sections_data]
+                sections.sort(key=lambda s: s.name.lower())
+                sections_by_suite[suite.id] = sections
+            suite.sections = sections_by_suite.get(suite.id, [])
+        
+        self.cache['sections'].update(sections_by_suite)
+        return suites
+    
+    def _mirror_project_thread(self, project, with_sections):
+        """
+        Bring the mirrored tree of a project shown from it up to date in the background.
+        
+        Only suites and sections (if loaded) are synced; cases are synced
+        when they are exported. If the suites or sections changed, the
+        project's cached tree is dropped so selecting it again shows the new one.
+        
+        Args:
+            project: The project shown from the mirror
+            with_sections: Whether its sections were shown
+        """
+        try:
+            mirrored = self.mirror.get_suites(project.id)
+            suites_data = self.client.get_suites(project.id)
+            self.mirror.replace_suites(project.id, suites_data)
+            changed = mirrored != self.mirror.get_suites(project.id)
+            
+            for suite_data in suites_data if with_sections else ():
+                if self.current_project is not project:
+                    return
+                mirrored = self.mirror.get_sections(project.id, suite_data['id'])
+                sections_data = self.client.get_sections(project.id, suite_data['id'])
+                self.mirror.replace_sections(project.id, suite_data['id'], sections_data)
+                changed = changed or mirrored != self.mirror.get_sections(project.id, suite_data['id'])
+        except Exception as e:
+            logger.warning(f"Failed to sync the local mirror: {e}")
+            return
+        
+        if changed:
+            self.cache['suites'].pop(project.id, None)
+            self.cache['loading_state'].pop(project.id, None)
+            for suite in project.suites:
+                self.cache['sections'].pop(suite.id, None)
+            self.after(0, lambda: self.status_var.set(
+                f"Suites or sections of {project.name} changed on the server, select it again to update the tree"))
+    
+    def _fetch_suite_cases(self, project_id, suite_id, suite_filter=True):
+        """
+        Fetch every test case in a suite.
+        
+        Uses the local mirror or the incremental sync store when enabled, so
+        only cases changed since the last sync are downloaded. Those are
+        always keyed by the suite ID, also for single-suite projects, so a
+        suite has one sync state however it is exported.
+        
+        Args:
+            project_id: The ID of the project
+            suite_id: The ID of the suite
+            suite_filter: Whether a plain download needs the suite_id filter
+                (False for single-suite projects)
+            
+        Returns:
+            CaseStore: The suite's cases, stored column by column
+        """
+        if self.case_sync:
+            result = self.case_sync.sync(project_id, suite_id)
+            return CaseStore.from_dicts(result['cases'])
+        return CaseStore.from_dicts(self.client.iter_cases(project_id, suite_id if suite_filter else None))
+    
+    def _fetch_section_cases(self, project_id, suite_id, section_id, synced_suites, suite_filter=True):
+        """
+        Fetch the test cases directly in a section.
+        
+        Once the local mirror holds a suite, the suite is synced at most once
+        per export and its sections are read from disk; otherwise the section
+        is downloaded.
+        
+        Args:
+            project_id: The ID of the project
+            suite_id: The ID of the suite
+            section_id: The ID of the section
+            synced_suites: IDs of the suites synced during this export, updated in place
+            suite_filter: Whether a download needs the suite_id filter
+                (False for single-suite projects)
+            
+        Returns:
+            list: LazyCase objects
+        """
+        if self.mirror and self.mirror.get_case_sync(project_id, suite_id):
+            if suite_id not in synced_suites:
+                self.case_sync.sync(project_id, suite_id)
+                synced_suites.add(suite_id)
+            return [LazyCase(c) for c in self.mirror.get_cases(project_id, suite_id, [section_id])]
+        return [LazyCase(c) for c in self.client.iter_cases(project_id, suite_id if suite_filter else None, section_id)]
+    
     def _get_case_count_for_suite(self, suite_id, load_data=False):
         """
         Get the number of test cases in a suite.
@@ -827,8 +1029,7 @@ class Application(ctk.CTk):
         if load_data:
             # Load actual cases data
             try:
-                cases_data = self.client.get_cases(self.current_project.id, suite_id)
-                cases = [Case(c) for c in cases_data]
+                cases = CaseStore.from_dicts(self.client.iter_cases(self.current_project.id, suite_id))
                 
                 # Cache the cases
                 self.cache['cases'][cache_key] = cases
@@ -861,8 +1062,7 @@ class Application(ctk.CTk):
         if load_data:
             # Load actual cases data
             try:
-                cases_data = self.client.get_cases(self.current_project.id, suite_id, section_id)
-                cases = [Case(c) for c in cases_data]
+                cases = [LazyCase(c) for c in self.client.iter_cases(self.current_project.id, suite_id, section_id)]
                 
                 # Cache the cases
                 self.cache['cases'][cache_key] = cases
@@ -928,8 +1128,7 @@ class Application(ctk.CTk):
             if cache_key not in self.cache['cases']:
                 try:
                     # Get cases for this section
-                    cases_data = self.client.get_cases(self.current_project.id, suite.id, section.id)
-                    cases = [Case(c) for c in cases_data]
+                    cases = [LazyCase(c) for c in self.client.iter_cases(self.current_project.id, suite.id, section.id)]
                     
                     # Cache the cases
                     self.cache['cases'][cache_key] = cases
@@ -1062,11 +1261,9 @@ class Application(ctk.CTk):
             self._update_progress("", reset=True)
             return
         
-        # Calculate needed API calls for progress tracking
-        # One call per suite and one per section that has been selected
+        # Work out the API calls needed for the selection; each one is a progress step
         try:
-            suite_count = sum(1 for item in valid_checked_items if not self.tree.parent(item))
-            section_count = sum(1 for item in valid_checked_items if self.tree.parent(item))
+            plan = self._plan_export(valid_checked_items)
         except Exception:
             # If we can't determine parents, show warning and return
             messagebox.showwarning("Warning", "Unable to process selected items. Please select items again.")
@@ -1075,150 +1272,118 @@ class Application(ctk.CTk):
         
         # Reset and start progress tracking
         self._update_progress("Preparing export...", reset=True)
-        self.api_calls_total = suite_count + section_count
+        self.api_calls_total = plan.call_count
         
         # Export in a separate thread
-        self.active_thread = threading.Thread(target=lambda: self._export_cases_thread(valid_checked_items, format, selected_columns))
+        self.active_thread = threading.Thread(target=lambda: self._export_cases_thread(plan, format, selected_columns))
         self.active_thread.start()
     
-    def _export_cases_thread(self, checked_items, format='json', selected_columns=None):
+    def _plan_export(self, checked_items):
         """
-        Export test cases in a background thread.
+        Turn the checked tree items into a plan of API calls.
+        
+        Must run on the main thread, since it reads the tree.
         
         Args:
             checked_items: List of checked tree items
+            
+        Returns:
+            CallPlan: The API calls needed to export the selection
+        """
+        project = self.current_project
+        
+        # Map the checked items to suites and sections; a checked suite
+        # covers all of its sections
+        selection = {}
+        for item_id in checked_items:
+            parent_id = self.tree.parent(item_id)
+            if not parent_id:
+                suite = next((s for s in project.suites if s.name == self.tree.item(item_id, "values")[0]), None)
+                if suite:
+                    selection[suite] = None
+        for item_id in checked_items:
+            parent_id = self.tree.parent(item_id)
+            if not parent_id or parent_id in checked_items:
+                continue
+            suite_name = self.tree.item(parent_id, "values")[0]
+            suite = next((s for s in project.suites if s.name == suite_name), None)
+            if not suite:
+                continue
+            section_name = self.tree.item(item_id, "values")[0]
+            section = next((s for s in suite.sections if s.name == section_name), None)
+            if section:
+                selection.setdefault(suite, []).append(section)
+        
+        # Suites whose sections were loaded before need no new request
+        for suite in selection:
+            if not suite.sections and suite.id in self.cache['sections']:
+                suite.sections = self.cache['sections'][suite.id]
+        
+        # Case counts of results already in the cache
+        case_counts = {}
+        prefix = f"{project.id}_"
+        for key, cached_cases in self.cache['cases'].items():
+            if key.startswith(prefix):
+                _, suite_id, section_id = key.split('_')
+                case_counts[(int(suite_id), None if section_id == 'None' else int(section_id))] = len(cached_cases)
+        
+        return plan_case_fetches(project, selection, case_counts, sections_loaded=self.load_sections_var.get())
+    
+    def _export_cases_thread(self, plan, format='json', selected_columns=None):
+        """
+        Export test cases in a background thread.
+        
+        Args:
+            plan (CallPlan): API calls covering the selected suites and sections
             format (str): Export format ('json', 'csv', or 'xml')
         """
         try:
             cases = []
             processed_cases = set()  # Track processed case IDs to avoid duplicates
+            synced_suites = set()  # Suites brought up to date in the local mirror
+            project_id = self.current_project.id
             
-            # Check if operation has been cancelled
-            if self.loading_cancelled:
-                return
-            
-            # Separate suites and sections to avoid duplicates
-            # If a suite is checked, don't process its individual sections
-            suites_to_process = []
-            sections_to_process = []
+            # Download the lookup tables while the cases are being fetched
+            metadata_thread = threading.Thread(target=self.metadata.warm_up, args=([project_id],), daemon=True)
+            metadata_thread.start()
             
-            for item_id in checked_items:
-                parent_id = self.tree.parent(item_id)
-                if not parent_id:
-                    # This is a suite
-                    suites_to_process.append(item_id)
-                else:
-                    # This is a section - only add if its parent suite is not also selected
-                    if parent_id not in checked_items:
-                        sections_to_process.append(item_id)
-                
-            # Process suites first
-            for item_id in suites_to_process:
+            for fetch in plan.fetches:
                 # Check if operation has been cancelled
                 if self.loading_cancelled:
                     return
-                    
-                item_values = self.tree.item(item_id, "values")
-                suite_display_name = item_values[0]
-                # Don't extract name - use the full display name since it should match exactly
-                suite_name = suite_display_name
-                    
-                # Debug logging
-                print(f"DEBUG: Looking for suite with display name: '{suite_display_name}'")
-                print(f"DEBUG: Using suite name: '{suite_name}'")
-                    
-                suite = next((s for s in self.current_project.suites if s.name == suite_name), None)
-                if suite:
-                    # Update progress
-                    self._update_progress(f"Exporting suite: {suite_name}")
+                
+                # Update progress
+                if fetch.section:
+                    self._update_progress(f"Exporting section: {fetch.section.name}")
+                else:
+                    self._update_progress(f"Exporting suite: {fetch.suite.name}")
+                
+                # Check if we have cached cases for this suite or section
+                cache_key = fetch.cache_key(project_id)
+                if cache_key in self.cache['cases']:
+                    # Use cached data
+                    fetched_cases = self.cache['cases'][cache_key]
+                else:
+                    # Get the cases from the API, page by page
+                    if fetch.section:
+                        fetched_cases = self._fetch_section_cases(project_id, fetch.suite.id, fetch.section_id,
+                                                                  synced_suites, fetch.suite_filter)
+                    else:
+                        fetched_cases = self._fetch_suite_cases(project_id, fetch.suite.id, fetch.suite_filter)
                     
                     # Check if operation has been cancelled
                     if self.loading_cancelled:
                         return
-                        
-                    # Check if we have cached cases for this suite
-                    cache_key = f"{self.current_project.id}_{suite.id}_None"
-                    if cache_key in self.cache['cases']:
-                        # Use cached data
-                        suite_cases = self.cache['cases'][cache_key]
-                    else:
-                        # Get cases for the entire suite from API
-                        cases_data = self.client.get_cases(self.current_project.id, suite.id)
-                        
-                        # Check if operation has been cancelled
-                        if self.loading_cancelled:
-                            return
-                        
-                        suite_cases = [Case(c) for c in cases_data]
-                        
-                        # Cache the cases
-                        self.cache['cases'][cache_key] = suite_cases
                     
-                    # Add cases, avoiding duplicates
-                    for case in suite_cases:
-                        if case.id not in processed_cases:
-                            cases.append(case)
-                            processed_cases.add(case.id)
-                            
+                    # Cache the cases
+                    self.cache['cases'][cache_key] = fetched_cases
                     self._register_api_call()
-                else:
-                    # Suite not found - log for debugging
-                    print(f"DEBUG: Suite '{suite_name}' not found in current project")
-                    print(f"DEBUG: Available suites: {[s.name for s in self.current_project.suites]}")
-            
-            # Process individual sections (only if their parent suite wasn't processed)
-            for item_id in sections_to_process:
-                # Check if operation has been cancelled
-                if self.loading_cancelled:
-                    return
-                    
-                item_values = self.tree.item(item_id, "values")
-                parent_id = self.tree.parent(item_id)
                 
-                section_display_name = item_values[0]
-                # Don't extract name - use the full display name
-                section_name = section_display_name
-                    
-                suite_display_name = self.tree.item(parent_id, "values")[0]
-                # Don't extract name - use the full display name
-                suite_name = suite_display_name
-                    
-                suite = next((s for s in self.current_project.suites if s.name == suite_name), None)
-                if suite:
-                    section = next((s for s in suite.sections if s.name == section_name), None)
-                    if section:
-                        # Update progress
-                        self._update_progress(f"Exporting section: {section_name}")
-                        
-                        # Check if operation has been cancelled
-                        if self.loading_cancelled:
-                            return
-                            
-                        # Check if we have cached cases for this section
-                        cache_key = f"{self.current_project.id}_{suite.id}_{section.id}"
-                        if cache_key in self.cache['cases']:
-                            # Use cached data
-                            section_cases = self.cache['cases'][cache_key]
-                        else:
-                            # Get cases for the section from API
-                            cases_data = self.client.get_cases(self.current_project.id, suite.id, section.id)
-                            
-                            # Check if operation has been cancelled
-                            if self.loading_cancelled:
-                                return
-                            
-                            section_cases = [Case(c) for c in cases_data]
-                            
-                            # Cache the cases
-                            self.cache['cases'][cache_key] = section_cases
-                        
-                        # Add cases, avoiding duplicates
-                        for case in section_cases:
-                            if case.id not in processed_cases:
-                                cases.append(case)
-                                processed_cases.add(case.id)
-                                
-                        self._register_api_call()
+                # Add the selected cases, avoiding duplicates
+                for case in fetch.select(fetched_cases):
+                    if case.id not in processed_cases:
+                        cases.append(case)
+                        processed_cases.add(case.id)
             
             # Check if operation has been cancelled
             if self.loading_cancelled:
@@ -1230,35 +1395,29 @@ class Application(ctk.CTk):
                 if case.suite_id:
                     suite_ids_in_export.add(case.suite_id)
             
-            # Only include suites that have test cases in the export
-            suites_for_export = []
-            for suite in self.current_project.suites:
-                if suite.id in suite_ids_in_export:
-                    # If sections were not loaded during initial load, load them now for export
-                    if not self.load_sections_var.get() and (not hasattr(suite, 'sections') or not suite.sections):
-                        # Check if we have cached sections for this suite
-                        if suite.id in self.cache['sections']:
-                            suite.sections = self.cache['sections'][suite.id]
-                        else:
-                            # Load sections for this suite
-                            try:
-                                self._update_progress(f"Loading sections for suite: {suite.name}")
-                                sections_data = self.client.get_sections(self.current_project.id, suite.id)
-                                sections = [Section(s) for s in sections_data]
-                                
-                                # Sort sections alphabetically by name
-                                sections.sort(key=lambda s: s.name.lower())
-                                
-                                suite.sections = sections
-                                
-                                # Cache the sections
-                                self.cache['sections'][suite.id] = sections
-                            except Exception as e:
-                                # If we fail to load sections, continue with empty sections
-                                print(f"Failed to load sections for suite {suite.name}: {e}")
-                                suite.sections = []
+            # If sections were not loaded during initial load, load them now for export
+            for suite in plan.section_loads:
+                if self.loading_cancelled:
+                    return
+                try:
+                    self._update_progress(f"Loading sections for suite: {suite.name}")
+                    sections = [Section(s) for s in self.client.iter_sections(self.current_project.id, suite.id)]
+                    
+                    # Sort sections alphabetically by name
+                    sections.sort(key=lambda s: s.name.lower())
+                    
+                    suite.sections = sections
                     
-                    suites_for_export.append(suite)
+                    # Cache the sections
+                    self.cache['sections'][suite.id] = sections
+                except Exception as e:
+                    # If we fail to load sections, continue with empty sections
+                    print(f"Failed to load sections for suite {suite.name}: {e}")
+                    suite.sections = []
+                self._register_api_call()
+            
+            # Only include suites that have test cases in the export
+            suites_for_export = [suite for suite in self.current_project.suites if suite.id in suite_ids_in_export]
             
             # Check if we found any test cases
             if not cases:
@@ -1276,19 +1435,26 @@ class Application(ctk.CTk):
                     self.after(0, lambda: self._update_progress("", reset=True))
                 return
             
-            # Prepare export data with names instead of IDs
+            # Conversion only uses the lookup tables, so wait until they are loaded
+            metadata_thread.join()
+            
+            # Prepare export data with names next to the IDs; the cases are wrapped, not copied
             export_data = {
                 'project': {
                     'id': self.current_project.id,
                     'name': self.current_project.name
                 },
-                'cases': [self._convert_case_ids_to_names(case) for case in cases],
+                'cases': CaseNameResolver(self.current_project, self.metadata).overlay(cases),
                 'suites': suites_for_export  # Include only suites with exported test cases
             }
             
+            # Load the project's shared steps here rather than on the UI thread
+            shared_steps = SharedStepResolver(self.client)
+            shared_steps.prefetch(export_data['cases'], project_id)
+            
             # Update UI in the main thread
             if not self.loading_cancelled:
-                self.after(0, lambda: self._save_export_file(export_data, format, selected_columns))
+                self.after(0, lambda: self._save_export_file(export_data, format, selected_columns, shared_steps))
         except Exception as e:
             if not self.loading_cancelled:
                 self.after(0, lambda: self._show_error(f"Failed to export test cases: {str(e)}"))
@@ -1304,101 +1470,23 @@ class Application(ctk.CTk):
         Returns:
             dict: Case data with names instead of IDs
         """
-        # Store old current project temporarily
-        old_project = self.current_project
-        self.current_project = project
-        
-        try:
-            # Call the original method
-            return self._convert_case_ids_to_names(case)
-        finally:
-            # Restore old current project
-            self.current_project = old_project
+        return CaseNameResolver(project, self.metadata).resolve([case])[0]
     
     def _convert_case_ids_to_names(self, case):
         """
         Convert a test case's IDs to names for export.
         
+        Exports convert whole batches with CaseNameResolver instead.
+        
         Args:
             case (Case): Test case object
             
         Returns:
             dict: Case dictionary with names instead of IDs where possible
         """
-        case_dict = case.to_dict()
-        
-        # Convert suite_id to suite name (keep both for XML export)
-        if case.suite_id:
-            suite = next((s for s in self.current_project.suites if s.id == case.suite_id), None)
-            if suite:
-                case_dict['suite_name'] = suite.name
-                # Keep suite_id for XML export
-        
-        # Convert section_id to section name and add hierarchy info (keep all for XML export)
-        if case.section_id:
-            suite = next((s for s in self.current_project.suites if s.id == case.suite_id), None)
-            if suite:
-                section = next((sec for sec in suite.sections if sec.id == case.section_id), None)
-                if section:
-                    case_dict['section_name'] = section.name
-                    case_dict['section_parent_id'] = section.parent_id
-                    case_dict['section_depth'] = section.depth
-                    # Keep section_id for XML export
-        
-        # Convert priority_id to priority name (keep both for XML export)
-        if case.priority_id and self.cache['priorities']:
-            priority = next((p for p in self.cache['priorities'] if p['id'] == case.priority_id), None)
-            if priority:
-                case_dict['priority_name'] = priority['name']
-                # Keep priority_id for XML export
-        
-        # Convert type_id to type name (keep both for XML export)
-        if case.type_id and self.cache['case_types']:
-            case_type = next((t for t in self.cache['case_types'] if t['id'] == case.type_id), None)
-            if case_type:
-                case_dict['type_name'] = case_type['name']
-                # Keep type_id for XML export
-        
-        # Convert template_id to template name (keep both for XML export)
-        if hasattr(case, 'template_id') and case.template_id:
-            project_id = self.current_project.id
-            # Load templates for this project if not cached
-            if project_id not in self.cache['template']:
-                try:
-                    templates_data = self.client.get_templates(project_id)
-                    self.cache['template'][project_id] = templates_data
-                except Exception as e:
-                    print(f"Failed to load templates: {e}")
-                    self.cache['template'][project_id] = []
-            
-            # Find the template name
-            if project_id in self.cache['template']:
-                template = next((t for t in self.cache['template'][project_id] if t['id'] == case.template_id), None)
-                if template:
-                    case_dict['template_name'] = template['name']
-        
-        # Convert milestone_id to milestone name (keep both for XML export)
-        if hasattr(case, 'milestone_id') and case.milestone_id:
-            project_id = self.current_project.id
-            # Load milestones for this project if not cached
-            if project_id not in self.cache['milestone']:
-                try:
-                    milestones_response = self.client.get_milestones(project_id)
-                    # API returns a dict with 'milestones' array
-                    self.cache['milestone'][project_id] = milestones_response.get('milestone', [])
-                except Exception as e:
-                    print(f"Failed to load milestone: {e}")
-                    self.cache['milestone'][project_id] = []
-            
-            # Find the milestone name
-            if project_id in self.cache['milestone']:
-                milestone = next((m for m in self.cache['milestone'][project_id] if m['id'] == case.milestone_id), None)
-                if milestone:
-                    case_dict['milestone_name'] = milestone['name']
-        
-        return case_dict
+        return self._convert_case_ids_to_names_for_project(case, self.current_project)
     
-    def _save_export_file(self, export_data, format='xml', selected_columns=None):
+    def _save_export_file(self, export_data, format='xml', selected_columns=None, shared_steps=None):
         """
         Automatically save export file with timestamped filename.
         
@@ -1406,6 +1494,7 @@ class Application(ctk.CTk):
             export_data (dict): Data to export
             format (str): Export format ('xml', 'xray_csv', or 'both')
             selected_columns (list): Optional list of columns to include in CSV export
+            shared_steps (SharedStepResolver): Optional resolver for shared step references
         """
         # Get export directory from settings
         settings = self.settings_frame.get_settings()
@@ -1417,6 +1506,9 @@ class Application(ctk.CTk):
         # Create logger instance
         logger = ExportLogger(export_dir)
         
+        # Download referenced images alongside the export files
+        self._start_attachment_download(export_data['cases'], export_dir, logger)
+        
         # Generate timestamp
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         
@@ -1436,7 +1528,7 @@ class Application(ctk.CTk):
                 # Export XML
                 xml_filename = f"{sanitized_project_name}_export_{timestamp}.xml"
                 xml_filepath = os.path.join(export_dir, xml_filename)
-                Exporter.export_to_xml(export_data, xml_filepath, logger)
+                Exporter.export_to_xml(export_data, xml_filepath, logger, shared_steps)
                 
                 # Export CSV using direct method
                 csv_filename = f"{sanitized_project_name}_xray_export_{timestamp}.csv"
@@ -1444,7 +1536,8 @@ class Application(ctk.CTk):
                 
                 # Get TestRail endpoint for link handling
                 testrail_endpoint = settings.get('url', '')
-                Exporter.export_to_xray_csv(export_data, csv_filepath, testrail_endpoint, logger, selected_columns)
+                Exporter.export_to_xray_csv(export_data, csv_filepath, testrail_endpoint, logger, selected_columns,
+                                            shared_steps)
                 
                 self.status_var.set(f"Exported {len(export_data['cases'])} test cases to both formats")
                 messagebox.showinfo("Export Complete", 
@@ -1486,11 +1579,12 @@ class Application(ctk.CTk):
                 if format == 'xray_csv':
                     # Use direct CSV export
                     testrail_endpoint = settings.get('url', '')
-                    Exporter.export_to_xray_csv(export_data, filepath, testrail_endpoint, logger, selected_columns)
+                    Exporter.export_to_xray_csv(export_data, filepath, testrail_endpoint, logger, selected_columns,
+                                                shared_steps)
                     self.status_var.set(f"Exported {len(export_data['cases'])} test cases to {filename}")
                     messagebox.showinfo("Success", f"Successfully exported {len(export_data['cases'])} test cases to CSV format\n\nSaved as: {filename}")
                 else:  # xml
-                    Exporter.export_to_xml(export_data, filepath, logger)
+                    Exporter.export_to_xml(export_data, filepath, logger, shared_steps)
                     self.status_var.set(f"Exported {len(export_data['cases'])} test cases to {filename}")
                     messagebox.showinfo("Success", f"Successfully exported {len(export_data['cases'])} test cases to XML format\n\nSaved as: {filename}")
                     
@@ -1511,7 +1605,117 @@ class Application(ctk.CTk):
                 # Show detailed error with log file reference
                 log_file = logger.get_log_file_path()
                 self._show_export_error(error_msg, log_file, format)
+        
+        # Close the log with the API statistics for this export
+        self._log_shared_step_stats(logger, shared_steps)
+        self._log_client_stats(logger)
+    
+    
+    def _start_attachment_download(self, cases, export_dir, logger):
+        """
+        Download the attachments referenced by exported cases in a background thread,
+        if enabled in the config.
+        
+        Attachments go to an 'attachments' folder in the export directory that
+        is shared by all exports, so files downloaded by earlier (or
+        interrupted) exports are not downloaded again.
+        
+        Args:
+            cases (list): Exported case dictionaries
+            export_dir (str): Export directory
+            logger (ExportLogger): Logger for the current export
+        """
+        if not self.config.get_setting('export', 'download_attachments', False):
+            return
+        references = collect_attachment_ids(cases)
+        if not references:
+            return
+        
+        downloader = AttachmentDownloader(
+            self.client, os.path.join(export_dir, 'attachments'),
+            workers=self.config.get_setting('export', 'attachment_workers', 8)
+        )
+        logger.info(f"Downloading {len(references)} attachments to {downloader.target_dir}")
+        
+        def progress(finished, total):
+            self.after(0, lambda: self.status_var.set(f"Downloading attachments: {finished}/{total}"))
+        
+        def run():
+            with self.attachment_lock:
+                start = time.time()
+                stats = downloader.download(references, progress)
+            elapsed = max(time.time() - start, 0.001)
+            logger.info(
+                f"Attachments: {stats['downloaded']} downloaded ({stats['bytes'] / 1024 / 1024:.1f} MB "
+                f"at {stats['bytes'] / 1024 / 1024 / elapsed:.1f} MB/s), "
+                f"{stats['skipped']} already present, {stats['failed']} failed"
+            )
+            if stats['failed']:
+                self.after(0, lambda: self.status_var.set(
+                    f"{stats['failed']} attachments failed to download; export again to retry them"
+                ))
+            else:
+                self.after(0, lambda: self.status_var.set(f"Downloaded {len(references)} attachments"))
+        
+        threading.Thread(target=run, daemon=True).start()
     
+    def _log_shared_step_stats(self, logger, shared_steps):
+        """
+        Write shared step resolution statistics to the export log.
+        
+        Args:
+            logger (ExportLogger): Logger for the current export
+            shared_steps (SharedStepResolver): Resolver used by the export, or None
+        """
+        if not shared_steps:
+            return
+        stats = shared_steps.get_stats()
+        if stats['hits'] or stats['misses']:
+            logger.info(
+                f"Shared steps: {stats['hits']} references resolved from {stats['indexed']} indexed "
+                f"shared steps, {stats['misses']} misses"
+            )
+    
+    def _log_client_stats(self, logger):
+        """
+        Write the API client's connection, cache, throttling and per-endpoint
+        statistics to the export log.
+        
+        Args:
+            logger (ExportLogger): Logger for the current export
+        """
+        if not self.client:
+            return
+        stats = self.client.get_pool_stats()
+        logger.info(
+            f"API connections: {stats['requests']} requests, "
+            f"{stats['new_connections']} new connections, "
+            f"{stats['reused_connections']} reused connections, "
+            f"{self.client.coalesced_requests} duplicate requests coalesced"
+        )
+        
+        cache_stats = self.response_cache.get_stats()
+        if cache_stats['enabled']:
+            logger.info(
+                f"API response cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses, {cache_stats['evictions']} evictions"
+            )
+        
+        throttle = self.client.rate_limiter.get_stats()
+        logger.info(
+            f"API rate limiting: {throttle['throttled_requests']} requests throttled "
+            f"for {throttle['throttled_seconds']:.1f}s total, "
+            f"{throttle['retry_after_count']} Retry-After pauses"
+        )
+        
+        retry = self.client.retry_policy.get_stats()
+        logger.info(
+            f"API retries: {retry['retries']} retries, {retry['budget_exhausted']} refused by the retry budget, "
+            f"circuit breaker opened {retry['circuit_opens']} times "
+            f"({retry['circuit_wait_seconds']:.1f}s paused)"
+        )
+        
+        logger.log_api_metrics(self.client.metrics.snapshot())
     
     def _show_column_selection_dialog(self, checked_items, format):
         """Show dialog for selecting CSV columns to export."""
@@ -1663,6 +1867,10 @@ class Application(ctk.CTk):
             self.api_calls_total = total_projects * estimated_calls_per_project
             self.api_calls_done = 0
             
+            # Load every project's lookup tables concurrently before any case is converted
+            self.after(0, lambda: self._update_progress("Loading priorities, types, templates and milestones..."))
+            self.metadata.warm_up([project.id for project in projects])
+            
             for project in projects:
                 # Check if operation has been cancelled
                 if self.loading_cancelled:
@@ -1675,32 +1883,30 @@ class Application(ctk.CTk):
                 # Load project data
                 try:
                     # Get suites for project
-                    suites_data = self.client.get_suites(project.id)
-                    suites = [Suite(s) for s in suites_data]
+                    suites = [Suite(s) for s in self.client.iter_suites(project.id)]
                     suites.sort(key=lambda s: s.name.lower())
                     project.suites = suites
                     self._register_api_call()
                     
+                    all_cases = []
+                    
                     # Load sections for each suite
                     for suite in suites:
                         if self.loading_cancelled:
                             return
                             
-                        sections_data = self.client.get_sections(project.id, suite.id)
-                        sections = [Section(s) for s in sections_data]
+                        sections = [Section(s) for s in self.client.iter_sections(project.id, suite.id)]
                         sections.sort(key=lambda s: s.name.lower())
                         suite.sections = sections
                         self._register_api_call()
                     
                     # Load all test cases for the project
-                    all_cases = []
                     for suite in suites:
                         if self.loading_cancelled:
                             return
                             
                         # Get all cases for the suite
-                        cases_data = self.client.get_cases(project.id, suite.id)
-                        cases = [Case(c) for c in cases_data]
+                        cases = self._fetch_suite_cases(project.id, suite.id)
                         all_cases.extend(cases)
                         self._register_api_call()
                     
@@ -1710,16 +1916,20 @@ class Application(ctk.CTk):
                             'id': project.id,
                             'name': project.name
                         },
-                        'cases': [self._convert_case_ids_to_names_for_project(case, project) for case in all_cases],
+                        'cases': CaseNameResolver(project, self.metadata).overlay(all_cases),
                         'suites': suites
                     }
                     
+                    # Load the project's shared steps here rather than on the UI thread
+                    shared_steps = SharedStepResolver(self.client)
+                    shared_steps.prefetch(export_data['cases'], project.id)
+                    
                     # Export project data
                     if not self.loading_cancelled:
                         # Capture project name in closure
                         project_name = project.name
-                        self.after(0, lambda ed=export_data, pn=project_name: self._save_project_export_file(
-                            ed, format, pn, selected_columns
+                        self.after(0, lambda ed=export_data, pn=project_name, ss=shared_steps: self._save_project_export_file(
+                            ed, format, pn, selected_columns, ss
                         ))
                     
                     completed_projects += 1
@@ -1747,7 +1957,7 @@ class Application(ctk.CTk):
             if not self.loading_cancelled:
                 self.after(0, lambda: self._show_error(f"Failed to export projects: {str(e)}"))
     
-    def _save_project_export_file(self, export_data, format, project_name, selected_columns=None):
+    def _save_project_export_file(self, export_data, format, project_name, selected_columns=None, shared_steps=None):
         """Save export file for a single project."""
         # Get export directory from settings
         settings = self.settings_frame.get_settings()
@@ -1756,6 +1966,9 @@ class Application(ctk.CTk):
         # Create logger instance
         logger = ExportLogger(export_dir)
         
+        # Download referenced images alongside the export files
+        self._start_attachment_download(export_data['cases'], export_dir, logger)
+        
         # Generate timestamp
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         
@@ -1769,7 +1982,7 @@ class Application(ctk.CTk):
                 # Export XML
                 xml_filename = f"{sanitized_project_name}_export_{timestamp}.xml"
                 xml_filepath = os.path.join(export_dir, xml_filename)
-                Exporter.export_to_xml(export_data, xml_filepath, logger)
+                Exporter.export_to_xml(export_data, xml_filepath, logger, shared_steps)
                 
                 # Export CSV using direct method
                 csv_filename = f"{sanitized_project_name}_xray_export_{timestamp}.csv"
@@ -1778,7 +1991,8 @@ class Application(ctk.CTk):
                 # Get TestRail endpoint
                 settings = self.settings_frame.get_settings()
                 testrail_endpoint = settings.get('url', '')
-                Exporter.export_to_xray_csv(export_data, csv_filepath, testrail_endpoint, logger, selected_columns)
+                Exporter.export_to_xray_csv(export_data, csv_filepath, testrail_endpoint, logger, selected_columns,
+                                            shared_steps)
                 
                 logger.info(f"Successfully exported project '{project_name}' to both XML and CSV")
                 
@@ -1805,9 +2019,10 @@ class Application(ctk.CTk):
                     # Use direct CSV export
                     settings = self.settings_frame.get_settings()
                     testrail_endpoint = settings.get('url', '')
-                    Exporter.export_to_xray_csv(export_data, filepath, testrail_endpoint, logger, selected_columns)
+                    Exporter.export_to_xray_csv(export_data, filepath, testrail_endpoint, logger, selected_columns,
+                                                shared_steps)
                 else:  # xml
-                    Exporter.export_to_xml(export_data, filepath, logger)
+                    Exporter.export_to_xml(export_data, filepath, logger, shared_steps)
                 
                 logger.info(f"Successfully exported project '{project_name}' to {filename}")
             
@@ -1815,6 +2030,10 @@ class Application(ctk.CTk):
                 error_msg = f"Failed to save export for project '{project_name}': {str(e)}"
                 logger.error(error_msg, exc_info=True)
                 messagebox.showerror("Export Error", error_msg)
+        
+        # Close the log with the API statistics so far
+        self._log_shared_step_stats(logger, shared_steps)
+        self._log_client_stats(logger)
     
     
     def _show_multi_export_complete_dialog(self, completed_count, total_count, export_dir):
@@ -1,6 +1,16 @@
+from types import MappingProxyType
+
+# Interned custom field name tuples; cases with the same fields share one tuple
+_CUSTOM_KEYS = {}
+
+
 class Case:
     """Represents a TestRail test case."""
 
+    # No per-instance __dict__: projects can hold hundreds of thousands of these
+    __slots__ = ('id', 'title', 'section_id', 'suite_id', 'priority_id', 'template_id', 'type_id',
+                 'milestone_id', 'refs', 'estimate', '_custom_keys', '_custom_values', '_custom_dict')
+
     def __init__(self, case_data):
         """
         Initialize a Case instance from API data.
@@ -19,15 +29,46 @@ class Case:
         self.refs = case_data.get('refs')
         self.estimate = case_data.get('estimate')
         
-        # Extract custom fields
-        self.custom_fields = {}
-        for key, value in case_data.items():
-            if key.startswith('custom_'):
-                self.custom_fields[key] = value
-                
+        # Extract custom fields, stored as a shared name tuple plus a value tuple
+        custom = [(key, value) for key, value in case_data.items() if key.startswith('custom_')]
+        keys = tuple(key for key, _ in custom)
+        self._custom_keys = _CUSTOM_KEYS.setdefault(keys, keys)
+        self._custom_values = tuple(value for _, value in custom)
+        self._custom_dict = None
+
+    @property
+    def custom_fields(self):
+        """
+        dict: Custom field name -> value.
+        
+        The fields stay in their compact tuples until this attribute is first
+        used; it then becomes an ordinary dict owned by the case, so changes
+        made to it are kept.
+        """
+        if self._custom_dict is None:
+            self._custom_dict = dict(zip(self._custom_keys, self._custom_values))
+            self._custom_keys = self._custom_values = ()
+        return self._custom_dict
+
+    @custom_fields.setter
+    def custom_fields(self, fields):
+        self._custom_dict = fields
+        self._custom_keys = self._custom_values = ()
+
+    def custom_items(self):
+        """
+        Iterate over the custom fields without building a dict.
+        
+        Returns:
+            iterable: (field name, value) pairs
+        """
+        if self._custom_dict is not None:
+            return self._custom_dict.items()
+        return zip(self._custom_keys, self._custom_values)
+
     def __str__(self):
         return self.title
-        
+
     def to_dict(self):
         """
         Convert the case to a dictionary for export.
@@ -49,6 +90,80 @@ class Case:
         }
         
         # Add custom fields
-        case_dict.update(self.custom_fields)
+        case_dict.update(self.custom_items())
+        
+        return case_dict
+
+
+# Standard fields, in the order Case.to_dict() lists them
+FIELDS = ('id', 'title', 'section_id', 'suite_id', 'priority_id', 'template_id', 'type_id',
+          'milestone_id', 'refs', 'estimate')
+
+
+def _payload_property(name):
+    return property(lambda case: case._data.get(name), doc=f"Case {name}")
+
+
+class LazyCase:
+    """
+    A test case that reads its fields from the API payload on access.
+
+    Wrapping the decoded dict costs one small object per case; nothing is
+    copied and custom fields are only collected when custom_fields or
+    to_dict() is used. Suited to cases that are mostly counted or filtered,
+    such as per-section fetches for the tree. Behaves like Case otherwise.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, case_data):
+        """
+        Wrap case data from the TestRail API.
+        
+        Args:
+            case_data (dict): Case data from TestRail API; kept, not copied
+        """
+        self._data = case_data
+
+    @property
+    def custom_fields(self):
+        """Mapping: Custom field name -> value, read-only, collected from the payload on each access."""
+        return MappingProxyType({key: value for key, value in self._data.items() if key.startswith('custom_')})
+
+    def custom_items(self):
+        """
+        Iterate over the custom fields without building a dict.
         
-        return case_dict
\ No newline at end of file
+        Returns:
+            iterable: (field name, value) pairs, in payload order
+        """
+        return ((key, value) for key, value in self._data.items() if key.startswith('custom_'))
+
+    def __str__(self):
+        return self.title
+
+    def materialize(self):
+        """
+        Build a full Case from the payload.
+        
+        Returns:
+            Case: Case holding its own copy of the fields
+        """
+        return Case(self._data)
+
+    def to_dict(self):
+        """
+        Convert the case to a dictionary for export.
+        
+        Returns:
+            dict: Case as a dictionary, equal to Case(payload).to_dict()
+        """
+        data = self._data
+        case_dict = {name: data.get(name) for name in FIELDS}
+        case_dict.update((key, value) for key, value in data.items() if key.startswith('custom_'))
+        return case_dict
+
+
+for _name in FIELDS:
+    setattr(LazyCase, _name, _payload_property(_name))
+del _name
@@ -0,0 +1,315 @@
+from array import array
+from types import MappingProxyType
+
+import numpy as np
+
+# Integer columns; 0 stands for a missing value, as TestRail IDs start at 1
+INT_COLUMNS = ('id', 'section_id', 'suite_id', 'priority_id', 'template_id', 'type_id', 'milestone_id')
+
+# String columns, stored as codes into a table of distinct values
+STRING_COLUMNS = ('title', 'refs', 'estimate')
+
+# Order of the standard fields in CaseView.to_dict(), matching Case.to_dict()
+FIELD_ORDER = ('id', 'title', 'section_id', 'suite_id', 'priority_id', 'template_id', 'type_id',
+               'milestone_id', 'refs', 'estimate')
+
+# Marks custom fields a case does not have
+_ABSENT = object()
+
+
+class _StringColumn:
+    """Dictionary-encoded strings: an int32 code per case into a list of distinct values."""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.values = values
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def take(self, rows):
+        return _StringColumn(self.codes[rows], self.values)
+
+
+class CaseStore:
+    """
+    A project's test cases stored column by column.
+
+    Integer fields are numpy arrays and string fields are dictionary-encoded,
+    so repeated values (references, estimates, preconditions) are stored
+    once. Custom fields are object columns whose string values are interned
+    per store. Filtering and grouping work on whole columns instead of Python
+    loops over case objects, and iterating the store yields CaseView objects
+    that behave like Case without copying any data.
+    """
+
+    def __init__(self, ints, strings, custom):
+        """
+        Initialize the store from prepared columns; use from_dicts to build one.
+
+        Args:
+            ints (dict): Column name -> int64 array
+            strings (dict): Column name -> _StringColumn
+            custom (dict): Custom field name -> object array (_ABSENT where unset)
+        """
+        self._ints = ints
+        self._strings = strings
+        self._custom = custom
+
+    @classmethod
+    def from_dicts(cls, cases):
+        """
+        Build a store from case data as returned by get_cases.
+
+        Args:
+            cases (iterable): Case dictionaries
+
+        Returns:
+            CaseStore: Store holding the cases
+        """
+        ints = {name: array('q') for name in INT_COLUMNS}
+        codes = {name: array('i') for name in STRING_COLUMNS}
+        tables = {name: {None: 0} for name in STRING_COLUMNS}
+        custom = {}
+        interned = {}
+        count = 0
+
+        for case in cases:
+            for name in INT_COLUMNS:
+                ints[name].append(case.get(name) or 0)
+            for name in STRING_COLUMNS:
+                table = tables[name]
+                value = case.get(name)
+                code = table.get(value)
+                if code is None:
+                    code = table[value] = len(table)
+                codes[name].append(code)
+            for key, value in case.items():
+                if not key.startswith('custom_'):
+                    continue
+                column = custom.get(key)
+                if column is None:
+                    column = custom[key] = [_ABSENT] * count
+                if isinstance(value, str):
+                    value = interned.setdefault(value, value)
+                column.append(value)
+            count += 1
+            for column in custom.values():
+                if len(column) < count:
+                    column.append(_ABSENT)
+
+        strings = {name: _StringColumn(np.frombuffer(codes[name], dtype=np.int32), list(tables[name]))
+                   for name in STRING_COLUMNS}
+        object_columns = {}
+        for key, values in custom.items():
+            column = np.empty(count, dtype=object)
+            column[:] = values
+            object_columns[key] = column
+        return cls({name: np.frombuffer(ints[name], dtype=np.int64) for name in INT_COLUMNS},
+                   strings, object_columns)
+
+    def __len__(self):
+        return len(self._ints['id'])
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield CaseView(self, row)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError('case index out of range')
+        return CaseView(self, row)
+
+    def column(self, name):
+        """
+        Get a whole column.
+
+        Args:
+            name (str): Field name, e.g. 'section_id' or 'custom_preconds'
+
+        Returns:
+            numpy.ndarray: int64 array for ID fields (0 where missing), or an
+                object array of values (None where missing)
+        """
+        if name in self._ints:
+            return self._ints[name]
+        if name in self._strings:
+            column = self._strings[name]
+            return np.asarray(column.values, dtype=object)[column.codes]
+        values = self._custom.get(name)
+        if values is None:
+            return np.full(len(self), None, dtype=object)
+        return np.where(values == _ABSENT, None, values)
+
+    def take(self, rows):
+        """
+        Get a store holding a subset of the cases.
+
+        Args:
+            rows: Boolean mask or array of row positions
+
+        Returns:
+            CaseStore: Store with the selected cases, sharing the string tables
+        """
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return CaseStore(
+            {name: values[rows] for name, values in self._ints.items()},
+            {name: column.take(rows) for name, column in self._strings.items()},
+            {key: values[rows] for key, values in self._custom.items()}
+        )
+
+    def in_sections(self, section_ids):
+        """
+        Keep the cases belonging to any of the given sections.
+
+        Args:
+            section_ids (iterable): Section IDs
+
+        Returns:
+            CaseStore: Matching cases
+        """
+        ids = np.fromiter(section_ids, dtype=np.int64)
+        return self.take(np.isin(self._ints['section_id'], ids))
+
+    def group_rows(self, name):
+        """
+        Group row positions by the value of an ID column.
+
+        Args:
+            name (str): ID column, e.g. 'suite_id' or 'section_id'
+
+        Returns:
+            dict: Value (None for missing) -> array of row positions in store order
+        """
+        values = self._ints[name]
+        order = np.argsort(values, kind='stable')
+        keys, starts = np.unique(values[order], return_index=True)
+        return {
+            (int(key) or None): rows
+            for key, rows in zip(keys, np.split(order, starts[1:]))
+        }
+
+    def group_by(self, name):
+        """
+        Split the store by the value of an ID column.
+
+        Args:
+            name (str): ID column, e.g. 'suite_id' or 'section_id'
+
+        Returns:
+            dict: Value (None for missing) -> CaseStore
+        """
+        return {key: self.take(rows) for key, rows in self.group_rows(name).items()}
+
+    def group_by_suite(self):
+        """dict: Suite ID -> CaseStore of that suite's cases."""
+        return self.group_by('suite_id')
+
+    def group_by_section(self):
+        """dict: Section ID -> CaseStore of that section's cases."""
+        return self.group_by('section_id')
+
+    def counts(self, name):
+        """
+        Count cases per value of an ID column.
+
+        Args:
+            name (str): ID column, e.g. 'section_id'
+
+        Returns:
+            dict: Value (None for missing) -> number of cases
+        """
+        keys, counts = np.unique(self._ints[name], return_counts=True)
+        return {(int(key) or None): int(count) for key, count in zip(keys, counts)}
+
+    def iter_dicts(self):
+        """
+        Iterate over the cases as dictionaries, as Case.to_dict() returns them.
+
+        Yields:
+            dict: Case data
+        """
+        # Convert each column to Python objects once instead of once per value
+        columns = []
+        for name in FIELD_ORDER:
+            if name in self._ints:
+                columns.append((name, [value or None for value in self._ints[name].tolist()]))
+            else:
+                column = self._strings[name]
+                columns.append((name, [column.values[code] for code in column.codes.tolist()]))
+        custom = [(key, values.tolist()) for key, values in self._custom.items()]
+
+        for row in range(len(self)):
+            case_dict = {name: values[row] for name, values in columns}
+            for key, values in custom:
+                value = values[row]
+                if value is not _ABSENT:
+                    case_dict[key] = value
+            yield case_dict
+
+    def _value(self, name, row):
+        if name in self._ints:
+            return int(self._ints[name][row]) or None
+        return self._strings[name][row]
+
+    def _row_custom(self, row):
+        for key, values in self._custom.items():
+            value = values[row]
+            if value is not _ABSENT:
+                yield key, value
+
+    def _row_dict(self, row):
+        case_dict = {name: self._value(name, row) for name in FIELD_ORDER}
+        case_dict.update(self._row_custom(row))
+        return case_dict
+
+
+def _column_property(name):
+    return property(lambda view: view._store._value(name, view._row), doc=f"Case {name}")
+
+
+class CaseView:
+    """A case inside a CaseStore, with the attributes and methods of Case."""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    @property
+    def custom_fields(self):
+        """Mapping: Custom field name -> value, read-only."""
+        return MappingProxyType(dict(self._store._row_custom(self._row)))
+
+    def custom_items(self):
+        """
+        Iterate over the custom fields without building a dict.
+
+        Returns:
+            iterable: (field name, value) pairs
+        """
+        return self._store._row_custom(self._row)
+
+    def __str__(self):
+        return self.title
+
+    def to_dict(self):
+        """
+        Convert the case to a dictionary for export.
+
+        Returns:
+            dict: Case as a dictionary
+        """
+        return self._store._row_dict(self._row)
+
+
+for _name in FIELD_ORDER:
+    setattr(CaseView, _name, _column_property(_name))
+del _name
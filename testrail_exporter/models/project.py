@@ -1,6 +1,8 @@
 class Project:
     """Represents a TestRail project."""
 
+    __slots__ = ('id', 'name', 'announcement', 'is_completed', 'suite_mode', '_suites', '_suite_index')
+
     def __init__(self, project_data):
         """
         Initialize a Project instance from API data.
@@ -15,6 +17,30 @@ class Project:
         self.suite_mode = project_data.get('suite_mode')
         self.suites = []
 
+    @property
+    def suites(self):
+        """list: Suites of the project; assign a new list to replace them."""
+        return self._suites
+
+    @suites.setter
+    def suites(self, suites):
+        self._suites = suites
+        self._suite_index = None
+
+    def get_suite(self, suite_id):
+        """
+        Get a suite by ID.
+        
+        Args:
+            suite_id (int): Suite ID
+            
+        Returns:
+            Suite: The suite, or None if the project has no such suite
+        """
+        if self._suite_index is None:
+            self._suite_index = {suite.id: suite for suite in self._suites}
+        return self._suite_index.get(suite_id)
+
     def __str__(self):
         return self.name
 
@@ -25,4 +51,5 @@ class Project:
         Args:
             suite: Suite instance
         """
-        self.suites.append(suite)
\ No newline at end of file
+        self._suites.append(suite)
+        self._suite_index = None
\ No newline at end of file
@@ -1,6 +1,8 @@
 class Section:
     """Represents a TestRail section."""
 
+    __slots__ = ('id', 'name', 'description', 'suite_id', 'parent_id', 'depth', 'cases', 'checked')
+
     def __init__(self, section_data):
         """
         Initialize a Section instance from API data.
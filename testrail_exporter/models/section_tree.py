@@ -0,0 +1,116 @@
+class SectionTree:
+    """
+    Index over the sections of one suite.
+
+    Built once from the suite's flat section list. It maps section IDs to
+    sections and parents to children, and precomputes every section's
+    'Suite/Parent/Child' path and depth, so lookups during export are
+    dictionary reads instead of scans or string building per case. Sections
+    whose parent is not in the list are treated as roots, as TestRail does
+    for sections of a partially loaded suite.
+    """
+
+    __slots__ = ('suite_name', 'sections', 'children', 'roots', 'depths', 'paths')
+
+    def __init__(self, sections, suite_name=None):
+        """
+        Initialize the index.
+
+        Args:
+            sections (iterable): Section instances, or any objects with id,
+                name and parent_id attributes
+            suite_name (str, optional): Name prefixed to full paths
+        """
+        self.suite_name = suite_name
+        self.sections = {}  # Section ID -> section
+        self.children = {}  # Parent section ID -> child section IDs, in suite order
+        self.roots = []
+        self.depths = {}
+        self.paths = {}  # Section ID -> 'Parent/Child', without the suite name
+
+        for section in sections:
+            self.sections[section.id] = section
+        for section_id, section in self.sections.items():
+            parent_id = section.parent_id
+            if parent_id is not None and parent_id in self.sections and parent_id != section_id:
+                self.children.setdefault(parent_id, []).append(section_id)
+            else:
+                self.roots.append(section_id)
+
+        # Breadth-first from the roots, so parents are done before their children
+        queue = list(self.roots)
+        for section_id in queue:
+            self.depths.setdefault(section_id, 0)
+            self.paths.setdefault(section_id, self.sections[section_id].name or '')
+        for section_id in queue:
+            path = self.paths[section_id]
+            depth = self.depths[section_id] + 1
+            for child_id in self.children.get(section_id, ()):
+                if child_id in self.paths:
+                    continue  # Guard against parent cycles in bad data
+                self.depths[child_id] = depth
+                self.paths[child_id] = f"{path}/{self.sections[child_id].name or ''}"
+                queue.append(child_id)
+
+    @classmethod
+    def from_suite(cls, suite):
+        """
+        Build the index for a suite's loaded sections.
+
+        Args:
+            suite (Suite): Suite with its sections
+
+        Returns:
+            SectionTree: Index of the suite's sections
+        """
+        return cls(suite.sections, suite.name)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, section_id):
+        return section_id in self.sections
+
+    def get(self, section_id):
+        """
+        Get a section by ID.
+
+        Args:
+            section_id (int): Section ID
+
+        Returns:
+            Section: The section, or None if it is not in the suite
+        """
+        return self.sections.get(section_id)
+
+    def depth(self, section_id):
+        """int: Nesting level of a section, 0 for root sections."""
+        return self.depths.get(section_id, 0)
+
+    def section_path(self, section_id):
+        """
+        Get the path of a section within its suite.
+
+        Args:
+            section_id (int): Section ID
+
+        Returns:
+            str: 'Parent/Child', or None if the section is not in the suite
+        """
+        return self.paths.get(section_id)
+
+    def path(self, section_id):
+        """
+        Get the full path of a section.
+
+        Args:
+            section_id (int): Section ID
+
+        Returns:
+            str: 'Suite/Parent/Child' ('Parent/Child' without a suite name),
+                or None if the section is not in the suite
+        """
+        path = self.paths.get(section_id)
+        if path is None or not self.suite_name:
+            return path
+        return f"{self.suite_name}/{path}"
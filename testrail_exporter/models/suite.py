@@ -1,6 +1,12 @@
+from .section_tree import SectionTree
+
+
 class Suite:
     """Represents a TestRail test suite."""
 
+    __slots__ = ('id', 'name', 'description', 'project_id', 'is_master', 'is_baseline',
+                 'is_completed', '_sections', '_section_tree', 'checked')
+
     def __init__(self, suite_data):
         """
         Initialize a Suite instance from API data.
@@ -18,6 +24,27 @@ class Suite:
         self.sections = []
         self.checked = False
         
+    @property
+    def sections(self):
+        """list: Sections of the suite; assign a new list to replace them."""
+        return self._sections
+
+    @sections.setter
+    def sections(self, sections):
+        self._sections = sections
+        self._section_tree = None
+
+    def section_tree(self):
+        """
+        Get the index of the suite's sections, building it on first use.
+        
+        Returns:
+            SectionTree: Index shared by everything reading this suite's sections
+        """
+        if self._section_tree is None:
+            self._section_tree = SectionTree.from_suite(self)
+        return self._section_tree
+
     def __str__(self):
         return self.name
         
@@ -28,7 +55,8 @@ class Suite:
         Args:
             section: Section instance
         """
-        self.sections.append(section)
+        self._sections.append(section)
+        self._section_tree = None
         
     def has_sections(self):
         """
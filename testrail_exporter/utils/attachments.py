@@ -0,0 +1,243 @@
+import logging
+import mimetypes
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from . import json_codec
+
+logger = logging.getLogger('testrail_exporter')
+
+# Attachment references in case text, e.g. ![](index.php?/attachments/get/123).
+# TestRail 7.1+ uses string IDs such as 2ec27be4-2a5c-4a5e-9a4e-1c1d9b6a7f3e
+ATTACHMENT_LINK = re.compile(r'index\.php\?/attachments/get/([\w-]+)')
+
+# Attachments downloading at once; stays within the client's default connection pool
+DEFAULT_WORKERS = 8
+
+MANIFEST_FILENAME = 'manifest.jsonl'
+
+
+def _iter_text(value):
+    """Yield every string inside a case field, including separated steps."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_text(item)
+
+
+def collect_attachment_ids(cases):
+    """
+    Find the attachments referenced by the cases' custom fields.
+
+    Args:
+        cases (list): Case dictionaries as prepared for export
+
+    Returns:
+        dict: Attachment ID (str) -> IDs of the cases referencing it, in the
+            order the attachments were first seen
+    """
+    references = {}
+    for case in cases:
+        for key, value in case.items():
+            if not key.startswith('custom_'):
+                continue
+            for text in _iter_text(value):
+                if 'attachments/get/' not in text:
+                    continue
+                for attachment_id in ATTACHMENT_LINK.findall(text):
+                    case_ids = references.setdefault(attachment_id, [])
+                    if case.get('id') not in case_ids:
+                        case_ids.append(case.get('id'))
+    return references
+
+
+class AttachmentDownloader:
+    """
+    Downloads attachments into a directory, resuming interrupted runs.
+
+    Each attachment is streamed to ``<id>.part`` and renamed to ``<id><ext>``
+    once complete, so a file with its final name is always whole. Completed
+    downloads are appended to ``manifest.jsonl`` in the same directory; a
+    later run skips every attachment listed there whose file is still
+    present with the recorded size. A ``.part`` file left by an interrupted
+    download is continued with a Range request; if the server sends the
+    whole attachment instead, it is downloaded again from the start.
+    """
+
+    def __init__(self, client, target_dir, workers=DEFAULT_WORKERS):
+        """
+        Initialize the downloader.
+
+        Args:
+            client (TestRailClient): API client
+            target_dir (str): Directory for the attachments and the manifest
+            workers (int): Attachments downloading at once
+        """
+        self.client = client
+        self.target_dir = target_dir
+        self.workers = workers
+        self.manifest_path = os.path.join(target_dir, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def load_manifest(self):
+        """
+        Load the attachments completed by earlier runs.
+
+        Returns:
+            dict: Attachment ID -> manifest entry with 'id', 'file', 'size',
+                'content_type' and 'cases'
+        """
+        entries = {}
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = json_codec.loads(line)
+                    except json_codec.JSONDecodeError:
+                        # The last line of an interrupted run may be cut off
+                        continue
+                    entries[entry['id']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _is_complete(self, entry):
+        path = os.path.join(self.target_dir, entry['file'])
+        try:
+            return os.path.getsize(path) == entry['size']
+        except OSError:
+            return False
+
+    @staticmethod
+    def _part_size(part_path):
+        try:
+            return os.path.getsize(part_path)
+        except OSError:
+            return 0
+
+    def _fetch(self, attachment_id, part_path, offset):
+        """
+        Download an attachment into its .part file, continuing at offset.
+
+        Returns:
+            tuple: (size of the complete file, bytes downloaded, Content-Type header or None)
+        """
+        with open(part_path, 'r+b' if offset else 'wb') as f:
+            f.seek(offset)
+            written, content_type = self.client.download_attachment(attachment_id, f, offset=offset)
+            return f.tell(), written, content_type
+
+    def _download_one(self, attachment_id, case_ids):
+        """
+        Download one attachment, resuming a partial download, and record it in the manifest.
+
+        Returns:
+            tuple: (manifest entry, bytes downloaded by this run)
+        """
+        part_path = os.path.join(self.target_dir, f"{attachment_id}.part")
+        offset = self._part_size(part_path)
+        try:
+            try:
+                size, written, content_type = self._fetch(attachment_id, part_path, offset)
+            except Exception as e:
+                if not offset or self._part_size(part_path) != offset:
+                    raise
+                # Nothing arrived for the range (e.g. 416 after the attachment shrank); start over
+                logger.debug(f"Could not resume attachment {attachment_id} at byte {offset}: {e}")
+                offset = 0
+                size, written, content_type = self._fetch(attachment_id, part_path, offset)
+        except Exception:
+            # Keep what arrived so the next run can continue from there
+            if not self._part_size(part_path):
+                try:
+                    os.remove(part_path)
+                except OSError:
+                    pass
+            raise
+        if written < size:
+            logger.debug(f"Resumed attachment {attachment_id} at byte {size - written}")
+
+        media_type = (content_type or '').split(';', 1)[0].strip()
+        extension = mimetypes.guess_extension(media_type) if media_type else None
+        filename = f"{attachment_id}{extension or ''}"
+        os.replace(part_path, os.path.join(self.target_dir, filename))
+
+        entry = {
+            'id': attachment_id,
+            'file': filename,
+            'size': size,
+            'content_type': media_type or None,
+            'cases': case_ids
+        }
+        with self._lock:
+            with open(self.manifest_path, 'ab') as manifest:
+                manifest.write(json_codec.dumps(entry) + b'\n')
+        return entry, written
+
+    def cancel(self):
+        """Stop starting new downloads; downloads in progress finish."""
+        self._cancelled.set()
+
+    def download(self, references, progress=None):
+        """
+        Download every referenced attachment that is not on disk yet.
+
+        Args:
+            references (dict): Attachment ID -> referencing case IDs, as
+                returned by collect_attachment_ids
+            progress (callable, optional): Called with (finished, total)
+                after each attachment
+
+        Returns:
+            dict: Counts of 'downloaded', 'skipped' and 'failed' attachments,
+                'bytes' downloaded and 'errors' (attachment ID -> message)
+        """
+        os.makedirs(self.target_dir, exist_ok=True)
+        done = self.load_manifest()
+        pending = {attachment_id: case_ids for attachment_id, case_ids in references.items()
+                   if attachment_id not in done or not self._is_complete(done[attachment_id])}
+
+        stats = {
+            'downloaded': 0,
+            'skipped': len(references) - len(pending),
+            'failed': 0,
+            'bytes': 0,
+            'errors': {}
+        }
+        if stats['skipped']:
+            logger.info(f"Attachments: {stats['skipped']} already downloaded, {len(pending)} to go")
+        if not pending:
+            return stats
+
+        def run(attachment_id, case_ids):
+            if self._cancelled.is_set():
+                return None
+            return self._download_one(attachment_id, case_ids)
+
+        finished = stats['skipped']
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+            futures = {executor.submit(run, attachment_id, case_ids): attachment_id
+                       for attachment_id, case_ids in pending.items()}
+            for future in as_completed(futures):
+                attachment_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    stats['failed'] += 1
+                    stats['errors'][attachment_id] = str(e)
+                    logger.warning(f"Failed to download attachment {attachment_id}: {e}")
+                else:
+                    if result is None:
+                        continue
+                    stats['downloaded'] += 1
+                    stats['bytes'] += result[1]
+                finished += 1
+                if progress:
+                    progress(finished, len(references))
+        return stats
@@ -0,0 +1,178 @@
+import math
+from ..models.case_store import CaseStore
+
+# TestRail's page size for bulk endpoints
+PAGE_SIZE = 250
+
+# Assumed size of a section whose case count is unknown, used to estimate
+# how many pages a suite-wide fetch needs
+AVERAGE_CASES_PER_SECTION = 20
+
+# Project.suite_mode of projects with one suite and no baselines
+SINGLE_SUITE_MODE = 1
+
+
+class CaseFetch:
+    """One get_cases walk in an export plan."""
+
+    def __init__(self, suite, section=None, section_ids=None, suite_filter=True, cached=False, pages=1):
+        """
+        Initialize the fetch.
+
+        Args:
+            suite (Suite): Suite the cases belong to
+            section (Section, optional): Section to fetch on its own; None fetches the whole suite
+            section_ids (set, optional): For suite-wide fetches, the sections to keep
+                when partitioning locally; None keeps every case
+            suite_filter (bool): Whether the request needs the suite_id filter
+            cached (bool): Whether the result is already cached and needs no request
+            pages (int): Estimated number of pages the walk requests
+        """
+        self.suite = suite
+        self.section = section
+        self.section_ids = section_ids
+        self.suite_filter = suite_filter
+        self.cached = cached
+        self.pages = pages
+
+    @property
+    def suite_id(self):
+        """int: suite_id argument for get_cases, or None when the project has a single suite."""
+        return self.suite.id if self.suite_filter else None
+
+    @property
+    def section_id(self):
+        """int: section_id argument for get_cases, or None for suite-wide fetches."""
+        return self.section.id if self.section else None
+
+    def cache_key(self, project_id):
+        """
+        Get the key of this fetch's result in the app's case cache.
+
+        Args:
+            project_id (int): Project ID
+
+        Returns:
+            str: Cache key
+        """
+        return f"{project_id}_{self.suite.id}_{self.section_id}"
+
+    def select(self, cases):
+        """
+        Keep the cases this fetch was planned for.
+
+        Args:
+            cases (list or CaseStore): Cases returned by the fetch
+
+        Returns:
+            list or CaseStore: Cases in the selected sections
+        """
+        if self.section_ids is None:
+            return cases
+        if isinstance(cases, CaseStore):
+            return cases.in_sections(self.section_ids)
+        return [case for case in cases if case.section_id in self.section_ids]
+
+    def __repr__(self):
+        target = f"section {self.section_id}" if self.section else f"suite {self.suite.id}"
+        if self.section_ids is not None:
+            target += f" (keeping {len(self.section_ids)} sections)"
+        return f"<CaseFetch {target}{' cached' if self.cached else ''}>"
+
+
+class CallPlan:
+    """The API calls needed to export a tree selection."""
+
+    def __init__(self, fetches, section_loads):
+        """
+        Initialize the plan.
+
+        Args:
+            fetches (list): CaseFetch objects in execution order
+            section_loads (list): Suites whose sections must be loaded for the export
+        """
+        self.fetches = fetches
+        self.section_loads = section_loads
+
+    @property
+    def call_count(self):
+        """int: Fetches and section loads that need the API, one progress step each."""
+        return sum(1 for fetch in self.fetches if not fetch.cached) + len(self.section_loads)
+
+    @property
+    def estimated_requests(self):
+        """int: Estimated HTTP requests, counting each page of a walk."""
+        return sum(fetch.pages for fetch in self.fetches if not fetch.cached) + len(self.section_loads)
+
+
+def _pages(case_count):
+    return max(1, math.ceil(case_count / PAGE_SIZE))
+
+
+def plan_case_fetches(project, selection, case_counts=None, sections_loaded=True):
+    """
+    Work out the fewest get_cases calls covering a tree selection.
+
+    A fully selected suite is fetched in one walk. For partly selected suites
+    the cost of one get_cases call per section is compared with one
+    suite-wide walk partitioned locally by section_id, using known case
+    counts (from earlier fetches) and an estimate otherwise. Results that are
+    already cached cost nothing, and a cached suite-wide result also serves
+    any of its sections.
+
+    Args:
+        project (Project): Project being exported; its suite_mode decides
+            whether get_cases needs a suite filter
+        selection (dict): Suite -> list of selected Sections, or None when
+            the whole suite is selected
+        case_counts (dict, optional): (suite_id, section_id or None) -> case
+            count for results that are already cached
+        sections_loaded (bool): Whether suites already have their sections;
+            if not, suites are queued for a section load
+
+    Returns:
+        CallPlan: Plan for the selection
+    """
+    case_counts = case_counts or {}
+    # In single-suite mode get_cases covers the only suite without a filter
+    suite_filter = project.suite_mode != SINGLE_SUITE_MODE
+
+    fetches = []
+    for suite, sections in selection.items():
+        suite_cached = (suite.id, None) in case_counts
+
+        if sections is not None and suite.sections and len(sections) >= len(suite.sections):
+            # Every section is selected, which is the same as the whole suite
+            sections = None
+
+        if sections is None:
+            fetches.append(CaseFetch(suite, suite_filter=suite_filter, cached=suite_cached,
+                                     pages=_pages(case_counts.get((suite.id, None), 0))))
+            continue
+
+        if suite_cached:
+            fetches.append(CaseFetch(suite, section_ids={s.id for s in sections},
+                                     suite_filter=suite_filter, cached=True))
+            continue
+
+        # Sections without a known count are assumed to fit on one page
+        per_section_cost = sum(1 for s in sections if (suite.id, s.id) not in case_counts)
+
+        known_total = sum(count for (suite_id, section_id), count in case_counts.items()
+                          if suite_id == suite.id and section_id is not None)
+        unknown_sections = max(0, len(suite.sections) - sum(
+            1 for (suite_id, section_id) in case_counts if suite_id == suite.id and section_id is not None
+        ))
+        suite_cost = _pages(known_total + unknown_sections * AVERAGE_CASES_PER_SECTION)
+
+        if per_section_cost > 1 and suite_cost < per_section_cost:
+            fetches.append(CaseFetch(suite, section_ids={s.id for s in sections},
+                                     suite_filter=suite_filter, pages=suite_cost))
+        else:
+            for section in sections:
+                count = case_counts.get((suite.id, section.id))
+                fetches.append(CaseFetch(suite, section, suite_filter=suite_filter,
+                                         cached=count is not None, pages=_pages(count or 0)))
+
+    section_loads = [] if sections_loaded else [s for s in selection if not s.sections]
+    return CallPlan(fetches, section_loads)
@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from . import json_codec
+
+logger = logging.getLogger('testrail_exporter')
+
+# Seconds subtracted from the high-water mark so cases updated in the same
+# second as the last sync are fetched again rather than missed
+HIGH_WATER_MARK_OVERLAP = 1
+
+
+class IncrementalCaseSync:
+    """
+    Keeps a local copy of each project/suite's test cases up to date.
+
+    The first sync of a suite pulls every case. Later syncs only request cases
+    with ``updated_after`` set to the stored high-water mark and merge them into
+    the local store. Deleted cases are detected by probing the remote case
+    count with two single-item pages; only when the count does not match the
+    merged store are all case IDs fetched and reconciled. Every request
+    bypasses the response cache: a stale answer would miss edits and
+    deletions and move the high-water mark past them.
+    """
+
+    def __init__(self, client, store_dir=None):
+        """
+        Initialize the incremental sync.
+
+        Args:
+            client (TestRailClient): API client
+            store_dir (str, optional): Directory for the local stores. If None, uses the default path.
+        """
+        if store_dir is None:
+            store_dir = os.path.join(str(Path.home()), '.testrail_exporter', 'case_sync')
+        self.client = client
+        self.store_dir = store_dir
+        self._lock = threading.Lock()
+        self._suite_locks = {}  # (project ID, suite ID) -> lock held for a whole sync
+
+    def _store_path(self, project_id, suite_id):
+        """
+        Get the file path of a project/suite store.
+
+        Returns:
+            str: Path of the store file
+        """
+        return os.path.join(self.store_dir, f"{project_id}_{suite_id or 'all'}.json")
+
+    def _load_store(self, project_id, suite_id):
+        """
+        Load a local store.
+
+        Returns:
+            dict: Store with 'high_water_mark' and 'cases' (case ID -> case data),
+                or None if there is no usable store
+        """
+        path = self._store_path(project_id, suite_id)
+        try:
+            with open(path, 'rb') as f:
+                store = json_codec.load(f)
+            # JSON object keys are strings; restore integer case IDs
+            store['cases'] = {int(case_id): case for case_id, case in store['cases'].items()}
+            return store
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable case store {path}: {e}")
+            return None
+
+    def _save_store(self, project_id, suite_id, store):
+        """
+        Save a local store atomically.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int): Suite ID
+            store (dict): Store to save
+        """
+        path = self._store_path(project_id, suite_id)
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            json_codec.dump(store, f)
+        os.replace(tmp_path, path)
+
+    def sync(self, project_id, suite_id=None):
+        """
+        Bring the local store for a project/suite up to date and return its cases.
+
+        Syncs of the same project/suite run one at a time, from loading the
+        store to saving it, so concurrent syncs never lose each other's updates.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+
+        Returns:
+            dict: 'cases' (list of case data), 'full' (whether every case was
+                fetched), 'updated' (cases fetched) and 'deleted' (cases removed)
+        """
+        with self._lock:
+            suite_lock = self._suite_locks.setdefault((project_id, suite_id), threading.Lock())
+        with suite_lock:
+            return self._sync(project_id, suite_id)
+
+    def _sync(self, project_id, suite_id):
+        with self._lock:
+            store = self._load_store(project_id, suite_id)
+
+        if store is None:
+            cases = {case['id']: case for case in self.client.iter_cases(project_id, suite_id, use_cache=False)}
+            result = {'full': True, 'updated': len(cases), 'deleted': 0}
+        else:
+            cases = store['cases']
+            since = max(0, store['high_water_mark'] - HIGH_WATER_MARK_OVERLAP)
+            changed = list(self.client.iter_cases(project_id, suite_id, updated_after=since, use_cache=False))
+            for case in changed:
+                cases[case['id']] = case
+
+            deleted = 0
+            if self._remote_count_differs(project_id, suite_id, len(cases)):
+                deleted = self._reconcile_ids(project_id, suite_id, cases)
+            result = {'full': False, 'updated': len(changed), 'deleted': deleted}
+
+        high_water_mark = max(
+            (max(case.get('updated_on') or 0, case.get('created_on') or 0) for case in cases.values()),
+            default=store['high_water_mark'] if store else 0
+        )
+        with self._lock:
+            self._save_store(project_id, suite_id, {
+                'high_water_mark': high_water_mark,
+                'cases': cases
+            })
+
+        logger.info(
+            f"Case sync for project {project_id}, suite {suite_id}: "
+            f"{'full' if result['full'] else 'incremental'}, "
+            f"{result['updated']} fetched, {result['deleted']} deleted, {len(cases)} total"
+        )
+        result['cases'] = list(cases.values())
+        return result
+
+    def _remote_count_differs(self, project_id, suite_id, expected):
+        """
+        Check whether the server holds a different number of cases than expected.
+
+        Two single-item pages at offsets ``expected - 1`` and ``expected``
+        tell whether the remote count is exactly ``expected``.
+
+        Returns:
+            bool: True if the counts differ
+        """
+        if expected == 0:
+            return bool(self.client.get_cases_page(project_id, suite_id, offset=0, limit=1, use_cache=False))
+        last = self.client.get_cases_page(project_id, suite_id, offset=expected - 1, limit=1, use_cache=False)
+        beyond = self.client.get_cases_page(project_id, suite_id, offset=expected, limit=1, use_cache=False)
+        return not last or bool(beyond)
+
+    def _reconcile_ids(self, project_id, suite_id, cases):
+        """
+        Drop local cases that no longer exist on the server.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int): Suite ID
+            cases (dict): Local cases keyed by ID; modified in place
+
+        Returns:
+            int: Number of cases removed
+        """
+        remote = {}
+        for case in self.client.iter_cases(project_id, suite_id, use_cache=False):
+            remote[case['id']] = case
+
+        removed = [case_id for case_id in cases if case_id not in remote]
+        for case_id in removed:
+            del cases[case_id]
+        # The full walk also returns current data, so refresh everything
+        cases.update(remote)
+        return len(removed)
+
+    def reset(self, project_id, suite_id=None):
+        """
+        Delete the local store so the next sync fetches every case.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+        """
+        with self._lock:
+            try:
+                os.remove(self._store_path(project_id, suite_id))
+            except FileNotFoundError:
+                pass
@@ -71,10 +71,18 @@ class Config:
             'testrail': {
                 'url': 'https://testrail.testeng.mlbinfra.net',
                 'username': '',
-                'api_key': ''
+                'api_key': '',
+                'page_workers': 4,
+                'requests_per_minute': 180,
+                'response_cache': True,
+                'stream_cases': False
             },
             'export': {
-                'directory': os.path.join(self.home_dir, 'Documents')
+                'directory': os.path.join(self.home_dir, 'Documents'),
+                'incremental_sync': False,
+                'local_mirror': False,
+                'download_attachments': False,
+                'attachment_workers': 8
             },
             'ui': {
                 'window_width': 1000,
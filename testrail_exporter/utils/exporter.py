@@ -1,11 +1,13 @@
-import json
 import csv
 import os
 import xml.etree.ElementTree as ET
 import xml.dom.minidom as minidom
 import re
+from collections.abc import Mapping
 import pandas as pd
 from .logger import ExportLogger
+from . import json_codec
+from ..models.case_store import CaseStore
 
 
 class ExportError(Exception):
@@ -16,6 +18,28 @@ class ExportError(Exception):
 class Exporter:
     """Class for exporting TestRail data to various formats."""
 
+    @staticmethod
+    def _case_dicts(cases):
+        """
+        Get the cases to export as dictionaries.
+        
+        Args:
+            cases: List of case dictionaries or NamedCase views, or a CaseStore
+            
+        Returns:
+            iterable: Case mappings; a CaseStore is converted one case at a time
+        """
+        if isinstance(cases, CaseStore):
+            return cases.iter_dicts()
+        return cases
+    
+    @staticmethod
+    def _json_default(value):
+        """Encode case views such as NamedCase as objects, one at a time while writing."""
+        if isinstance(value, Mapping):
+            return dict(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
     @staticmethod
     def _clean_xml_text(text):
         """
@@ -94,8 +118,11 @@ class Exporter:
             # Ensure directory exists
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            if isinstance(data.get('cases'), CaseStore):
+                data = dict(data, cases=list(data['cases'].iter_dicts()))
+            
+            with open(filepath, 'wb') as f:
+                json_codec.dump(data, f, indent=True, default=Exporter._json_default)
             
             if logger:
                 logger.info(f"Successfully exported JSON to: {filepath}")
@@ -142,6 +169,9 @@ class Exporter:
             
             if logger:
                 logger.debug(f"Exporting {len(cases)} test cases to CSV")
+            
+            # Every case is needed twice: once to find the fields, once to write it
+            cases = list(Exporter._case_dicts(cases))
                 
             # Determine all possible fields from the first case
             first_case = cases[0]
@@ -185,7 +215,7 @@ class Exporter:
             raise ExportError(error_msg) from e
     
     @staticmethod
-    def export_to_xml(data, filepath, logger=None):
+    def export_to_xml(data, filepath, logger=None, shared_steps=None):
         """
         Export test cases to a TestRail-compatible XML file.
         
@@ -193,6 +223,8 @@ class Exporter:
             data (dict): Data to export (must have a 'cases' key and project info)
             filepath (str): Path to save the file
             logger (ExportLogger): Optional logger instance
+            shared_steps (SharedStepResolver): Optional resolver expanding shared
+                step references in separated steps
             
         Raises:
             ExportError: If export fails
@@ -214,43 +246,50 @@ class Exporter:
             
             # Build complete suite hierarchy first, then populate with cases
             suites_dict = {}
+            suite_keys = {}  # Suite ID -> key in suites_dict
             
             # Step 1: Build complete section hierarchy from suite data
             suites_data = data.get('suites', [])
             for suite in suites_data:
                 suite_key = f"{suite.name}_{suite.id}" if suite.id else suite.name
+                suite_keys[suite.id] = suite_key
                 
                 if logger:
                     logger.debug(f"Processing suite: {suite.name} (ID: {suite.id})")
                 
                 # Initialize suite structure
+                tree = suite.section_tree() if hasattr(suite, 'section_tree') else None
                 suites_dict[suite_key] = {
                     'name': suite.name,
                     'id': suite.id,
                     'description': suite.description,
-                    'sections': {}
+                    'sections': {},
+                    'tree': tree
                 }
                 
                 # Add all sections from the suite (including those without test cases)
-                if hasattr(suite, 'sections') and suite.sections:
-                    for section in suite.sections:
-                        suites_dict[suite_key]['sections'][section.id] = {
-                            'id': section.id,
+                if tree:
+                    for section_id, section in tree.sections.items():
+                        suites_dict[suite_key]['sections'][section_id] = {
+                            'id': section_id,
                             'name': section.name,
                             'parent_id': section.parent_id,
-                            'depth': section.depth,
+                            'depth': tree.depth(section_id),
                             'cases': [],
                             'children': {}
                         }
             
             # Step 2: Populate test cases into the appropriate sections
-            for case in cases:
+            for case in Exporter._case_dicts(cases):
                 suite_name = case.get('suite_name', 'Unknown Suite')
                 suite_id = case.get('suite_id')
                 section_id = case.get('section_id')
                 
                 # Use a key that includes the suite ID if available
                 suite_key = f"{suite_name}_{suite_id}" if suite_id else suite_name
+                if 'suite_name' not in case and suite_id in suite_keys:
+                    # Cases straight from a CaseStore carry the suite ID only
+                    suite_key = suite_keys[suite_id]
                 
                 # Create suite entry if it doesn't exist (fallback for missing suite data)
                 if suite_key not in suites_dict:
@@ -291,35 +330,44 @@ class Exporter:
             # Build hierarchical section structure for each suite
             for suite_key, suite_info in suites_dict.items():
                 sections = suite_info['sections']
-                
-                # Build parent-child relationships
+                tree = suite_info.get('tree')
+                
+                # Link the suite's sections as its SectionTree does; only the
+                # fallback entries created above need their parents looked up
+                root_ids = list(tree.roots) if tree else []
+                if tree:
+                    for parent_id, child_ids in tree.children.items():
+                        sections[parent_id]['children'] = {sid: sections[sid] for sid in child_ids}
                 for section_id, section in sections.items():
+                    if tree and section_id in tree:
+                        continue
                     parent_id = section['parent_id']
-                    if parent_id and parent_id in sections:
+                    if parent_id and parent_id in sections and parent_id != section_id:
                         sections[parent_id]['children'][section_id] = section
+                    else:
+                        root_ids.append(section_id)
                 
                 # Store root sections (sections with no parent or parent not in the export)
-                suite_info['root_sections'] = {
-                    sid: section for sid, section in sections.items() 
-                    if not section['parent_id'] or section['parent_id'] not in sections
-                }
+                suite_info['root_sections'] = {sid: sections[sid] for sid in root_ids}
             
             if logger:
                 logger.debug(f"Building XML structure for {len(suites_dict)} suite(s)")
             
             # Create XML structure - handle multiple suites
+            project_id = data.get('project', {}).get('id')
             if len(suites_dict) == 1:
                 # Single suite - use the original structure
                 suite_key = list(suites_dict.keys())[0]
                 suite_info = suites_dict[suite_key]
                 root = ET.Element("suite")
-                Exporter._add_suite_xml(root, suite_info, True)
+                Exporter._add_suite_xml(root, suite_info, True, shared_steps, project_id)
             else:
                 # Multiple suites - wrap in a container
                 root = ET.Element("suites")
                 for suite_key, suite_info in suites_dict.items():
                     suite_elem = ET.SubElement(root, "suite")
-                    Exporter._add_suite_xml(suite_elem, suite_info, True)  # Always include suite metadata
+                    # Always include suite metadata
+                    Exporter._add_suite_xml(suite_elem, suite_info, True, shared_steps, project_id)
             
             # Convert to pretty XML string using manual indentation
             def indent_xml(elem, level=0):
@@ -375,7 +423,7 @@ class Exporter:
             raise ExportError(error_msg) from e
     
     @staticmethod
-    def _add_suite_xml(suite_elem, suite_info, add_metadata=True):
+    def _add_suite_xml(suite_elem, suite_info, add_metadata=True, shared_steps=None, project_id=None):
         """
         Add suite information to XML element with nested sections support.
         
@@ -383,6 +431,8 @@ class Exporter:
             suite_elem: XML element to add to
             suite_info: Dictionary with suite name, id, and root_sections
             add_metadata: Whether to add ID/name/description elements
+            shared_steps: Optional SharedStepResolver for separated steps
+            project_id: Project the cases belong to, for shared step lookups
         """
         if add_metadata:
             # Add suite metadata
@@ -405,16 +455,18 @@ class Exporter:
         # Use root_sections from the hierarchical structure
         root_sections = suite_info.get('root_sections', {})
         for section_id, section in root_sections.items():
-            Exporter._add_section_xml(sections_elem, section)
+            Exporter._add_section_xml(sections_elem, section, shared_steps, project_id)
     
     @staticmethod
-    def _add_section_xml(parent_elem, section):
+    def _add_section_xml(parent_elem, section, shared_steps=None, project_id=None):
         """
         Recursively add section and its nested children to XML.
         
         Args:
             parent_elem: Parent XML element to add section to
             section: Section dictionary with name, cases, and children
+            shared_steps: Optional SharedStepResolver for separated steps
+            project_id: Project the cases belong to, for shared step lookups
         """
         section_elem = ET.SubElement(parent_elem, "section")
         
@@ -429,7 +481,7 @@ class Exporter:
         if section['children']:
             nested_sections_elem = ET.SubElement(section_elem, "sections")
             for child_id, child_section in section['children'].items():
-                Exporter._add_section_xml(nested_sections_elem, child_section)
+                Exporter._add_section_xml(nested_sections_elem, child_section, shared_steps, project_id)
         
         # Add cases if any
         if section['cases']:
@@ -498,6 +550,10 @@ class Exporter:
                             expected_elem = ET.SubElement(custom_elem, "expected")
                             expected_elem.text = Exporter._clean_xml_text(str(value))
                         elif field_name == 'steps_separated' and value and isinstance(value, list) and len(value) > 0:
+                            # Replace shared step references with their steps
+                            if shared_steps:
+                                value = shared_steps.expand(value, project_id)
+                            
                             # Only create steps_separated if there are actual steps
                             steps_sep_elem = ET.SubElement(custom_elem, "steps_separated")
                             for i, step_data in enumerate(value, 1):
@@ -518,7 +574,8 @@ class Exporter:
                                     additional_elem.text = Exporter._clean_xml_text(str(step_data.get('additional_info', '')))
     
     @staticmethod
-    def export_to_xray_csv(data, filepath, testrail_endpoint='', logger=None, selected_columns=None):
+    def export_to_xray_csv(data, filepath, testrail_endpoint='', logger=None, selected_columns=None,
+                           shared_steps=None):
         """
         Export test cases directly to Xray-compatible CSV format without XML intermediate.
         
@@ -528,6 +585,8 @@ class Exporter:
             testrail_endpoint (str): Optional TestRail endpoint URL for link handling
             logger (ExportLogger): Optional logger instance
             selected_columns (list): Optional list of columns to include in CSV
+            shared_steps (SharedStepResolver): Optional resolver expanding shared
+                step references in separated steps
             
         Raises:
             ExportError: If export fails
@@ -558,9 +617,10 @@ class Exporter:
             # Build CSV rows
             rows = []
             issue_id = 1
+            project_id = data.get('project', {}).get('id')
             
             # Process each test case
-            for case in cases:
+            for case in Exporter._case_dicts(cases):
                 # Get basic fields
                 suite_name = case.get('suite_name', '')
                 section_name = case.get('section_name', '')
@@ -604,6 +664,10 @@ class Exporter:
                         expected = Exporter._clean_html_for_csv(str(value))
                         expected = Exporter._handle_testrail_links(expected, testrail_endpoint)
                     elif key == 'custom_steps_separated' and value and isinstance(value, list):
+                        # Replace shared step references with their steps
+                        if shared_steps:
+                            value = shared_steps.expand(value, project_id)
+                        
                         # Handle separated steps
                         first_step = True
                         for step_data in value:
@@ -0,0 +1,82 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency
+    orjson = None
+
+# Name of the library doing the work, for logs and benchmarks
+BACKEND = 'orjson' if orjson else 'json'
+
+# orjson.JSONDecodeError subclasses this, so callers can catch one type
+JSONDecodeError = json.JSONDecodeError
+
+if orjson:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+    _INDENT_OPTIONS = _OPTIONS | orjson.OPT_INDENT_2
+
+
+def loads(data):
+    """
+    Decode a JSON document.
+
+    Args:
+        data (bytes or str): JSON document
+
+    Returns:
+        Decoded value
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent=False, default=None):
+    """
+    Encode a value as UTF-8 JSON bytes.
+
+    Non-string dictionary keys (such as integer IDs) are converted to
+    strings, matching the standard library.
+
+    Args:
+        obj: Value to encode
+        indent (bool): Pretty-print with two-space indentation
+        default (callable, optional): Called with each value the encoder
+            does not support; returns an encodable replacement or raises
+            TypeError
+
+    Returns:
+        bytes: Encoded document
+    """
+    if orjson:
+        return orjson.dumps(obj, default=default, option=_INDENT_OPTIONS if indent else _OPTIONS)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=default).encode('utf-8')
+
+
+def load(fp):
+    """
+    Decode a JSON document from a file opened in binary mode.
+
+    Args:
+        fp: Binary file object
+
+    Returns:
+        Decoded value
+    """
+    return loads(fp.read())
+
+
+def dump(obj, fp, indent=False, default=None):
+    """
+    Encode a value as JSON into a file opened in binary mode.
+
+    Args:
+        obj: Value to encode
+        fp: Binary file object
+        indent (bool): Pretty-print with two-space indentation
+        default (callable, optional): Replacement hook, as for dumps
+    """
+    fp.write(dumps(obj, indent=indent, default=default))
@@ -64,6 +64,36 @@ class ExportLogger:
         """Log error message with optional exception info."""
         self.logger.error(message, exc_info=exc_info)
         
+    def log_api_metrics(self, snapshot):
+        """
+        Log a per-endpoint summary of API calls.
+        
+        Args:
+            snapshot (dict): Endpoint template -> statistics, as returned by
+                ApiMetrics.snapshot()
+        """
+        if not snapshot:
+            self.logger.info("API calls: none")
+            return
+        
+        self.logger.info("API calls by endpoint:")
+        self.logger.info(
+            f"  {'endpoint':<28}{'calls':>7}{'errors':>8}{'retries':>9}{'KB':>10}"
+            f"{'mean':>9}{'p50':>8}{'p95':>8}{'max':>8}"
+        )
+        # Slowest endpoints first, so the cause of a slow export is at the top
+        ordered = sorted(snapshot.items(), key=lambda item: item[1]['latency_total'], reverse=True)
+        for template, stats in ordered:
+            self.logger.info(
+                f"  {template:<28}{stats['calls']:>7}{stats['errors']:>8}{stats['retries']:>9}"
+                f"{stats['bytes_received'] / 1024:>10.1f}"
+                f"{stats['latency_mean']:>8.3f}s{stats['latency_p50']:>7.2f}s"
+                f"{stats['latency_p95']:>7.2f}s{stats['latency_max']:>7.2f}s"
+            )
+        for template, stats in ordered:
+            histogram = ', '.join(f"{bucket}: {count}" for bucket, count in stats['latency_histogram'].items() if count)
+            self.logger.debug(f"  {template} latency histogram: {histogram}")
+        
     def get_log_file_path(self):
         """Return the path to the current log file."""
         return self.log_file_path
@@ -0,0 +1,156 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger('testrail_exporter')
+
+# Lookup tables shared by all projects: table -> client method
+GLOBAL_TABLES = {
+    'priorities': 'get_priorities',
+    'case_types': 'get_case_types',
+    'case_fields': 'get_case_fields',
+}
+
+# Lookup tables loaded per project: table -> client method taking the project ID
+PROJECT_TABLES = {
+    'templates': 'get_templates',
+    'milestones': 'get_milestones',
+}
+
+# Most lookup requests in flight at once
+DEFAULT_WORKERS = 8
+
+
+def _names_by_id(items):
+    return {item['id']: item['name'] for item in items}
+
+
+def _flatten_milestones(milestones):
+    """Yield milestones and their sub-milestones, which cases can reference too."""
+    for milestone in milestones:
+        yield milestone
+        yield from _flatten_milestones(milestone.get('milestones') or [])
+
+
+class CaseMetadata:
+    """
+    Lookup tables used to convert case IDs to names.
+
+    ``warm_up`` downloads every table an export needs concurrently, before
+    any case is converted, so conversion itself is pure dictionary lookups
+    and never waits on the network. Tables are kept until ``clear`` is
+    called; a table that failed to load is empty and fetched again by the
+    next warm-up.
+
+    Attributes:
+        priorities (dict): Priority ID -> name
+        case_types (dict): Case type ID -> name
+        case_fields (dict): Field system name (e.g. 'custom_preconds') -> field data
+        templates (dict): Project ID -> {template ID -> name}
+        milestones (dict): Project ID -> {milestone ID -> name}
+    """
+
+    def __init__(self, client, max_workers=DEFAULT_WORKERS):
+        """
+        Initialize the lookup tables.
+
+        Args:
+            client (TestRailClient): API client; its response cache, metrics
+                and cassette apply to every lookup request
+            max_workers (int): Lookup requests in flight at once
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Forget all tables, so the next warm-up downloads them again."""
+        self.priorities = {}
+        self.case_types = {}
+        self.case_fields = {}
+        self.templates = {}
+        self.milestones = {}
+        self._loaded = set()
+
+    def is_loaded(self, table, project_id=None):
+        """
+        Check whether a table was downloaded since the last clear.
+
+        Args:
+            table (str): Table name, e.g. 'priorities' or 'milestones'
+            project_id (int, optional): Project ID for per-project tables
+
+        Returns:
+            bool: True if the table holds the server's current data
+        """
+        return (table, project_id) in self._loaded
+
+    def _missing_calls(self, project_ids):
+        """
+        Get the requests needed for the tables that are not loaded yet.
+
+        Returns:
+            list: (table, project ID or None, method name, args) tuples
+        """
+        calls = [(table, None, method, ()) for table, method in GLOBAL_TABLES.items()
+                 if (table, None) not in self._loaded]
+        for project_id in dict.fromkeys(project_ids):
+            calls += [(table, project_id, method, (project_id,)) for table, method in PROJECT_TABLES.items()
+                      if (table, project_id) not in self._loaded]
+        return calls
+
+    def _fetch(self, calls):
+        """
+        Run the requests concurrently from a thread pool on the client.
+
+        Returns:
+            list: Results in the order of ``calls``; failed requests are
+                returned as their exception
+        """
+        def run(call):
+            _, _, method, args = call
+            try:
+                return getattr(self.client, method)(*args)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            return list(executor.map(run, calls))
+
+    def _store(self, table, project_id, data):
+        if table == 'case_fields':
+            self.case_fields = {field['system_name']: field for field in data}
+        elif table == 'milestones':
+            self.milestones[project_id] = _names_by_id(_flatten_milestones(data))
+        elif project_id is None:
+            setattr(self, table, _names_by_id(data))
+        else:
+            getattr(self, table)[project_id] = _names_by_id(data)
+
+    def warm_up(self, project_ids=()):
+        """
+        Download the shared tables and those of the given projects that are not loaded yet.
+
+        Args:
+            project_ids (iterable): IDs of the projects about to be exported
+
+        Returns:
+            int: Number of requests made
+        """
+        with self._lock:
+            calls = self._missing_calls(project_ids)
+            if not calls:
+                return 0
+
+            results = self._fetch(calls)
+            for (table, project_id, _, _), result in zip(calls, results):
+                if isinstance(result, Exception):
+                    # Cases are exported with IDs only for this table
+                    logger.warning(f"Failed to load {table}"
+                                   f"{f' for project {project_id}' if project_id else ''}: {result}")
+                    self._store(table, project_id, [])
+                    continue
+                self._store(table, project_id, result)
+                self._loaded.add((table, project_id))
+            return len(calls)
@@ -0,0 +1,394 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from . import json_codec
+from .case_sync import IncrementalCaseSync
+
+logger = logging.getLogger('testrail_exporter')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS suites (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    name TEXT,
+    sections_synced INTEGER NOT NULL DEFAULT 0,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    suite_id INTEGER,
+    parent_id INTEGER,
+    name TEXT,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    suite_id INTEGER,
+    section_id INTEGER,
+    updated_on INTEGER,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    kind TEXT NOT NULL,
+    project_id INTEGER NOT NULL,
+    key BLOB NOT NULL,
+    value BLOB,
+    PRIMARY KEY (kind, project_id, key)
+);
+CREATE TABLE IF NOT EXISTS case_sync (
+    project_id INTEGER NOT NULL,
+    suite_id INTEGER NOT NULL,
+    high_water_mark INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (project_id, suite_id)
+);
+CREATE INDEX IF NOT EXISTS suites_project_id ON suites (project_id);
+CREATE INDEX IF NOT EXISTS sections_suite_id ON sections (suite_id);
+CREATE INDEX IF NOT EXISTS cases_project_id ON cases (project_id);
+CREATE INDEX IF NOT EXISTS cases_suite_id ON cases (suite_id);
+CREATE INDEX IF NOT EXISTS cases_section_id ON cases (section_id);
+CREATE INDEX IF NOT EXISTS cases_updated_on ON cases (updated_on);
+"""
+
+# CaseMetadata tables kept in the mirror; per-project tables are {project ID -> table}
+GLOBAL_METADATA = ('priorities', 'case_types', 'case_fields')
+PROJECT_METADATA = ('templates', 'milestones')
+
+
+def _suite_clause(project_id, suite_id):
+    """WHERE clause selecting a project's cases, or one suite's if suite_id is set."""
+    if suite_id is None:
+        return "project_id = ?", (project_id,)
+    return "project_id = ? AND suite_id = ?", (project_id, suite_id)
+
+
+class LocalMirror:
+    """
+    SQLite mirror of a TestRail server's projects, suites, sections and cases.
+
+    One database per server lives under ``~/.testrail_exporter/mirror``.
+    Every row keeps the API payload as JSON next to the columns used for
+    lookups (project, suite, section, parent and updated_on are indexed), so
+    the app can show a project tree and export cases straight from disk
+    while a background sync brings the mirror up to date. Lookup tables
+    such as priorities and case types are kept in the ``metadata`` table.
+
+    A single connection is shared by all threads and serialized with a lock.
+    """
+
+    def __init__(self, url, mirror_dir=None):
+        """
+        Open (or create) the mirror of a server.
+
+        Args:
+            url (str): TestRail server URL; each server has its own database
+            mirror_dir (str, optional): Directory for the databases. If None, uses the default path.
+        """
+        if mirror_dir is None:
+            mirror_dir = os.path.join(str(Path.home()), '.testrail_exporter', 'mirror')
+        os.makedirs(mirror_dir, exist_ok=True)
+        self.url = url
+        server_key = hashlib.sha1(url.rstrip('/').encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(mirror_dir, f"{server_key}.sqlite3")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        # Readers (the UI) are not blocked by the background sync's writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # Projects, suites and sections
+
+    def get_projects(self):
+        """
+        Get the mirrored projects.
+
+        Returns:
+            list: Project data as returned by get_projects
+        """
+        return [json_codec.loads(data) for data, in self._query("SELECT data FROM projects ORDER BY id")]
+
+    def replace_projects(self, projects):
+        """
+        Store the server's project list, dropping projects no longer on it.
+
+        Args:
+            projects (list): Project data as returned by get_projects
+        """
+        rows = [(p['id'], p.get('name'), json_codec.dumps(p)) for p in projects]
+        with self._lock, self._db:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS keep (id INTEGER PRIMARY KEY)")
+            self._db.execute("DELETE FROM keep")
+            self._db.executemany("INSERT INTO keep VALUES (?)", [(row[0],) for row in rows])
+            for table in ('cases', 'sections', 'suites', 'case_sync'):
+                self._db.execute(f"DELETE FROM {table} WHERE project_id NOT IN (SELECT id FROM keep)")
+            self._db.execute("DELETE FROM projects WHERE id NOT IN (SELECT id FROM keep)")
+            self._db.executemany("INSERT OR REPLACE INTO projects (id, name, data) VALUES (?, ?, ?)", rows)
+
+    def get_suites(self, project_id):
+        """
+        Get a project's mirrored suites.
+
+        Args:
+            project_id (int): Project ID
+
+        Returns:
+            list: Suite data as returned by get_suites; empty if never synced
+        """
+        return [json_codec.loads(data) for data, in self._query(
+            "SELECT data FROM suites WHERE project_id = ? ORDER BY id", (project_id,))]
+
+    def replace_suites(self, project_id, suites):
+        """
+        Store a project's suites, dropping suites (and their sections and
+        cases) that no longer exist.
+
+        Args:
+            project_id (int): Project ID
+            suites (list): Suite data as returned by get_suites
+        """
+        suite_ids = [s['id'] for s in suites]
+        with self._lock, self._db:
+            for table, column, keep in (('cases', 'suite_id', suite_ids), ('sections', 'suite_id', suite_ids),
+                                        ('suites', 'id', suite_ids),
+                                        # Suite 0 holds the state of project-wide syncs
+                                        ('case_sync', 'suite_id', suite_ids + [0])):
+                stale = f" AND {column} NOT IN ({', '.join('?' * len(keep))})" if keep else ""
+                self._db.execute(f"DELETE FROM {table} WHERE project_id = ?{stale}", (project_id, *keep))
+            # Keep the sections_synced flag of suites that are already mirrored
+            self._db.executemany(
+                "INSERT INTO suites (id, project_id, name, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET name = excluded.name, data = excluded.data",
+                [(s['id'], project_id, s.get('name'), json_codec.dumps(s)) for s in suites]
+            )
+
+    def get_sections(self, project_id, suite_id):
+        """
+        Get a suite's mirrored sections.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int): Suite ID
+
+        Returns:
+            list: Section data as returned by get_sections, or None if the
+                suite's sections were never synced
+        """
+        synced = self._query("SELECT sections_synced FROM suites WHERE id = ?", (suite_id,))
+        if not synced or not synced[0][0]:
+            return None
+        return [json_codec.loads(data) for data, in self._query(
+            "SELECT data FROM sections WHERE project_id = ? AND suite_id = ? ORDER BY id", (project_id, suite_id))]
+
+    def replace_sections(self, project_id, suite_id, sections):
+        """
+        Store a suite's sections, dropping sections that no longer exist.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int): Suite ID
+            sections (list): Section data as returned by get_sections
+        """
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sections WHERE project_id = ? AND suite_id = ?", (project_id, suite_id))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sections (id, project_id, suite_id, parent_id, name, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(s['id'], project_id, suite_id, s.get('parent_id'), s.get('name'), json_codec.dumps(s))
+                 for s in sections]
+            )
+            self._db.execute("UPDATE suites SET sections_synced = 1 WHERE id = ?", (suite_id,))
+
+    # Cases
+
+    def get_cases(self, project_id, suite_id=None, section_ids=None):
+        """
+        Read mirrored cases.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Only cases of this suite
+            section_ids (iterable, optional): Only cases in these sections
+
+        Returns:
+            list: Case data as returned by get_cases, ordered by case ID
+        """
+        where, params = _suite_clause(project_id, suite_id)
+        if section_ids is not None:
+            section_ids = list(section_ids)
+            where += f" AND section_id IN ({', '.join('?' * len(section_ids)) or 'NULL'})"
+            params += tuple(section_ids)
+        rows = self._query(f"SELECT data FROM cases WHERE {where} ORDER BY id", params)
+        return [json_codec.loads(data) for data, in rows]
+
+    def count_cases(self, project_id, suite_id=None, section_id=None):
+        """
+        Count mirrored cases.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Only cases of this suite
+            section_id (int, optional): Only cases directly in this section
+
+        Returns:
+            int: Number of cases
+        """
+        where, params = _suite_clause(project_id, suite_id)
+        if section_id is not None:
+            where += " AND section_id = ?"
+            params += (section_id,)
+        return self._query(f"SELECT COUNT(*) FROM cases WHERE {where}", params)[0][0]
+
+    def get_case_sync(self, project_id, suite_id):
+        """
+        Get the sync state of a project/suite.
+
+        Returns:
+            tuple: (high-water mark, time of the last sync), or None if never synced
+        """
+        rows = self._query("SELECT high_water_mark, synced_at FROM case_sync WHERE project_id = ? AND suite_id = ?",
+                           (project_id, suite_id or 0))
+        return rows[0] if rows else None
+
+    def apply_case_changes(self, project_id, suite_id, changed, deleted_ids, high_water_mark):
+        """
+        Write the result of a case sync in one transaction.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int): Suite ID, or None for all of the project's cases
+            changed (iterable): New or updated case data
+            deleted_ids (iterable): IDs of cases removed on the server
+            high_water_mark (int): Latest created_on/updated_on seen
+        """
+        rows = [(case['id'], project_id, case.get('suite_id', suite_id), case.get('section_id'),
+                 case.get('updated_on'), json_codec.dumps(case)) for case in changed]
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM cases WHERE id = ?", [(case_id,) for case_id in deleted_ids])
+            self._db.executemany(
+                "INSERT OR REPLACE INTO cases (id, project_id, suite_id, section_id, updated_on, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.execute("INSERT OR REPLACE INTO case_sync VALUES (?, ?, ?, ?)",
+                             (project_id, suite_id or 0, high_water_mark, time.time()))
+
+    def clear_cases(self, project_id, suite_id=None):
+        """
+        Forget the mirrored cases of a project/suite, so the next sync fetches them all.
+
+        Args:
+            project_id (int): Project ID
+            suite_id (int, optional): Suite ID
+        """
+        where, params = _suite_clause(project_id, suite_id)
+        with self._lock, self._db:
+            self._db.execute(f"DELETE FROM cases WHERE {where}", params)
+            self._db.execute("DELETE FROM case_sync WHERE project_id = ? AND suite_id = ?", (project_id, suite_id or 0))
+
+    # Lookup tables
+
+    def save_metadata(self, metadata):
+        """
+        Store the CaseMetadata tables downloaded from the server.
+
+        Each downloaded table replaces its mirrored copy, so items removed on
+        the server are removed here too. Tables that are not loaded (never
+        fetched, or failed) keep their mirrored rows.
+
+        Args:
+            metadata (CaseMetadata): Lookup tables
+        """
+        tables = [(kind, None, getattr(metadata, kind)) for kind in GLOBAL_METADATA]
+        for kind in PROJECT_METADATA:
+            tables += [(kind, project_id, table) for project_id, table in getattr(metadata, kind).items()]
+
+        with self._lock, self._db:
+            for kind, project_id, table in tables:
+                if not metadata.is_loaded(kind, project_id):
+                    continue
+                self._db.execute("DELETE FROM metadata WHERE kind = ? AND project_id = ?", (kind, project_id or 0))
+                self._db.executemany("INSERT INTO metadata VALUES (?, ?, ?, ?)", [
+                    (kind, project_id or 0, json_codec.dumps(key), json_codec.dumps(value))
+                    for key, value in table.items()
+                ])
+
+    def restore_metadata(self, metadata):
+        """
+        Fill empty CaseMetadata tables from the mirror.
+
+        The tables are not marked as loaded, so the next warm-up still
+        downloads them; until then conversions use the mirrored names.
+
+        Args:
+            metadata (CaseMetadata): Lookup tables to fill
+        """
+        for kind, project_id, key, value in self._query("SELECT kind, project_id, key, value FROM metadata"):
+            if kind in GLOBAL_METADATA:
+                table = getattr(metadata, kind)
+            elif kind in PROJECT_METADATA:
+                table = getattr(metadata, kind).setdefault(project_id, {})
+            else:
+                continue
+            table.setdefault(json_codec.loads(key), json_codec.loads(value))
+
+
+class MirrorCaseSync(IncrementalCaseSync):
+    """
+    Incremental case sync that keeps its stores in a LocalMirror.
+
+    The sync itself works as in IncrementalCaseSync; only the cases that
+    changed or were deleted are written back, in one transaction.
+    """
+
+    def __init__(self, client, mirror):
+        """
+        Initialize the sync.
+
+        Args:
+            client (TestRailClient): API client
+            mirror (LocalMirror): Mirror holding the cases
+        """
+        super().__init__(client, store_dir=os.path.dirname(mirror.path))
+        self.mirror = mirror
+        self._loaded = {}  # (project ID, suite ID) -> {case ID: updated_on} as loaded
+
+    def _load_store(self, project_id, suite_id):
+        state = self.mirror.get_case_sync(project_id, suite_id)
+        if state is None:
+            self._loaded.pop((project_id, suite_id), None)
+            return None
+        cases = {case['id']: case for case in self.mirror.get_cases(project_id, suite_id)}
+        self._loaded[(project_id, suite_id)] = {case_id: case.get('updated_on') for case_id, case in cases.items()}
+        return {'high_water_mark': state[0], 'cases': cases}
+
+    def _save_store(self, project_id, suite_id, store):
+        loaded = self._loaded.pop((project_id, suite_id), {})
+        cases = store['cases']
+        changed = [case for case_id, case in cases.items()
+                   if case_id not in loaded or loaded[case_id] != case.get('updated_on')]
+        deleted = [case_id for case_id in loaded if case_id not in cases]
+        self.mirror.apply_case_changes(project_id, suite_id, changed, deleted, store['high_water_mark'])
+
+    def reset(self, project_id, suite_id=None):
+        with self._lock:
+            self.mirror.clear_cases(project_id, suite_id)
@@ -0,0 +1,748 @@
+"""
+Local mock TestRail server for load-testing exports.
+
+Serves the endpoints TestRailClient uses from synthetic data that is generated
+on demand, so a project with a million cases costs no memory. Latency, 429
+responses, 5xx errors and dropped connections can be injected.
+
+Usage:
+    python -m testrail_exporter.utils.mock_server --cases-per-suite 100000 --port 8080
+
+Then point the exporter at http://127.0.0.1:8080 with any username and API key.
+"""
+import argparse
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from . import json_codec
+
+logger = logging.getLogger('testrail_exporter')
+
+# TestRail's maximum (and default) page size
+MAX_PAGE_SIZE = 250
+
+# Synthetic timestamps start here and advance by a fixed step per case
+BASE_TIMESTAMP = 1600000000
+CASE_TIMESTAMP_STEP = 60
+
+PRIORITIES = [
+    {'id': 1, 'name': '4 - Low', 'short_name': '4 - Low', 'is_default': False, 'priority': 1},
+    {'id': 2, 'name': '3 - Medium', 'short_name': '3 - Medium', 'is_default': True, 'priority': 2},
+    {'id': 3, 'name': '2 - High', 'short_name': '2 - High', 'is_default': False, 'priority': 3},
+    {'id': 4, 'name': '1 - Critical', 'short_name': '1 - Critical', 'is_default': False, 'priority': 4},
+]
+
+CASE_TYPES = [
+    {'id': type_id, 'name': name, 'is_default': name == 'Other'}
+    for type_id, name in enumerate([
+        'Acceptance', 'Accessibility', 'Automated', 'Compatibility', 'Destructive', 'Functional',
+        'Other', 'Performance', 'Regression', 'Security', 'Smoke & Sanity', 'Usability'
+    ], start=1)
+]
+
+TEMPLATES = [
+    {'id': 1, 'name': 'Test Case (Text)', 'is_default': False},
+    {'id': 2, 'name': 'Test Case (Steps)', 'is_default': True},
+    {'id': 3, 'name': 'Exploratory Session', 'is_default': False},
+]
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+CASE_FIELDS = [
+    {'id': 1, 'system_name': 'custom_preconds', 'label': 'Preconditions', 'name': 'preconds', 'type_id': 3},
+    {'id': 2, 'system_name': 'custom_steps_separated', 'label': 'Steps', 'name': 'steps_separated', 'type_id': 10},
+    {'id': 3, 'system_name': 'custom_automation_type', 'label': 'Automation Type', 'name': 'automation_type',
+     'type_id': 6, 'configs': [{'options': {'items': '0, None\n1, Ranorex\n2, Selenium'}}]},
+]
+
+
+class MockApiError(Exception):
+    """Error answered with a TestRail-style JSON error body."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class SyntheticData:
+    """
+    Deterministic synthetic TestRail content.
+
+    IDs are derived arithmetically from positions, so any project, suite,
+    section or case can be generated on request without storing anything.
+    Within a suite, case ``i`` belongs to section ``i % sections_per_suite``
+    and its timestamps grow with ``i``, which keeps the section and
+    ``updated_after``/``created_after`` filters O(1) per page.
+    """
+
+    def __init__(self, projects=3, suites_per_project=2, sections_per_suite=20, cases_per_suite=1000,
+                 milestones_per_project=5, steps_per_case=3, attachment_every=10, attachment_size=32 * 1024,
+                 shared_steps_per_project=3):
+        """
+        Initialize the data set.
+
+        Args:
+            projects (int): Number of projects
+            suites_per_project (int): Suites per project; 1 gives single-suite projects
+            sections_per_suite (int): Sections per suite
+            cases_per_suite (int): Cases per suite
+            milestones_per_project (int): Milestones per project
+            steps_per_case (int): Entries in each case's custom_steps_separated
+            attachment_every (int): Every n-th case references an image in its
+                preconditions; 0 disables attachments
+            attachment_size (int): Size of each attachment in bytes
+            shared_steps_per_project (int): Shared steps per project; every
+                seventh case with separated steps starts with one
+        """
+        self.projects = projects
+        self.suites_per_project = suites_per_project
+        self.sections_per_suite = max(1, sections_per_suite)
+        self.cases_per_suite = cases_per_suite
+        self.milestones_per_project = milestones_per_project
+        self.steps_per_case = steps_per_case
+        self.attachment_every = attachment_every
+        self.attachment_size = attachment_size
+        self.shared_steps_per_project = shared_steps_per_project
+        # The first tenth of the sections are roots; the rest nest three per parent
+        self._root_sections = max(1, self.sections_per_suite // 10)
+
+    def total_cases(self):
+        """
+        Get the number of cases across all projects.
+
+        Returns:
+            int: Case count
+        """
+        return self.projects * self.suites_per_project * self.cases_per_suite
+
+    def _check_project(self, project_id):
+        if not 1 <= project_id <= self.projects:
+            raise MockApiError('Field :project_id is not a valid or accessible project.')
+
+    def _suite_position(self, suite_id):
+        """
+        Get the project of a suite.
+
+        Returns:
+            int: Project ID
+        """
+        if not 1 <= suite_id <= self.projects * self.suites_per_project:
+            raise MockApiError('Field :suite_id is not a valid test suite.')
+        return (suite_id - 1) // self.suites_per_project + 1
+
+    def project(self, project_id):
+        self._check_project(project_id)
+        return {
+            'id': project_id,
+            'name': f'Project {project_id}',
+            'announcement': None,
+            'show_announcement': False,
+            'is_completed': False,
+            'completed_on': None,
+            'suite_mode': 1 if self.suites_per_project == 1 else 3,
+            'url': f'/index.php?/projects/overview/{project_id}'
+        }
+
+    def project_list(self):
+        return [self.project(project_id) for project_id in range(1, self.projects + 1)]
+
+    def suite(self, suite_id):
+        project_id = self._suite_position(suite_id)
+        return {
+            'id': suite_id,
+            'name': f'Suite {suite_id}',
+            'description': f'Synthetic suite {suite_id} of project {project_id}',
+            'project_id': project_id,
+            'is_master': self.suites_per_project == 1,
+            'is_baseline': False,
+            'is_completed': False,
+            'completed_on': None,
+            'url': f'/index.php?/suites/view/{suite_id}'
+        }
+
+    def suite_list(self, project_id):
+        self._check_project(project_id)
+        first = (project_id - 1) * self.suites_per_project + 1
+        return [self.suite(suite_id) for suite_id in range(first, first + self.suites_per_project)]
+
+    def resolve_suite(self, project_id, suite_id):
+        """
+        Validate the suite filter of a project-scoped request.
+
+        Returns:
+            int: Suite ID to use
+
+        Raises:
+            MockApiError: If the suite is missing for a multi-suite project or
+                belongs to another project
+        """
+        self._check_project(project_id)
+        if suite_id is None:
+            if self.suites_per_project != 1:
+                raise MockApiError('Field :suite_id is a required field.')
+            return project_id
+        if self._suite_position(suite_id) != project_id:
+            raise MockApiError('Field :suite_id is not a valid test suite.')
+        return suite_id
+
+    def _section_id(self, suite_id, index):
+        return (suite_id - 1) * self.sections_per_suite + index + 1
+
+    def _section_parent(self, index):
+        if index < self._root_sections:
+            return None
+        return (index - self._root_sections) // 3
+
+    def section(self, suite_id, index):
+        parent = self._section_parent(index)
+        depth = 0
+        ancestor = parent
+        while ancestor is not None:
+            depth += 1
+            ancestor = self._section_parent(ancestor)
+        return {
+            'id': self._section_id(suite_id, index),
+            'suite_id': suite_id,
+            'name': f'Section {index + 1}',
+            'description': None,
+            'parent_id': None if parent is None else self._section_id(suite_id, parent),
+            'display_order': index + 1,
+            'depth': depth
+        }
+
+    def section_indices(self, suite_id):
+        return range(self.sections_per_suite)
+
+    def case(self, suite_id, index):
+        """
+        Generate one case.
+
+        Args:
+            suite_id (int): Suite ID
+            index (int): Position of the case within the suite
+
+        Returns:
+            dict: Case data as returned by get_cases
+        """
+        case_id = (suite_id - 1) * self.cases_per_suite + index + 1
+        template_id = 2 if index % 5 else 1
+        case = {
+            'id': case_id,
+            'title': f'Verify synthetic behaviour {case_id}',
+            'section_id': self._section_id(suite_id, index % self.sections_per_suite),
+            'template_id': template_id,
+            'type_id': index % len(CASE_TYPES) + 1,
+            'priority_id': index % len(PRIORITIES) + 1,
+            'milestone_id': None,
+            'refs': f'REQ-{case_id}' if index % 3 == 0 else None,
+            'created_by': 1,
+            'created_on': BASE_TIMESTAMP + index * CASE_TIMESTAMP_STEP,
+            'updated_by': 1,
+            'updated_on': BASE_TIMESTAMP + index * CASE_TIMESTAMP_STEP + 30,
+            'estimate': None,
+            'estimate_forecast': None,
+            'suite_id': suite_id,
+            'display_order': index + 1,
+            'is_deleted': 0,
+            'custom_automation_type': index % 3,
+            'custom_preconds': f'<p>Account <strong>user{index % 100}</strong> is signed in</p>',
+        }
+        if self.attachment_every and index % self.attachment_every == 0:
+            # Attachments share the ID of the case that references them
+            case['custom_preconds'] += f'\n![](index.php?/attachments/get/{case_id})'
+        if template_id == 2:
+            case['custom_steps_separated'] = [
+                {
+                    'content': f'<p>Perform step {step + 1} of case {case_id}</p>',
+                    'expected': f'<p>Step {step + 1} succeeds</p>',
+                    'additional_info': None,
+                    'refs': None
+                }
+                for step in range(self.steps_per_case)
+            ]
+            if self.shared_steps_per_project and index % 7 == 0:
+                project_id = self._suite_position(suite_id)
+                shared_step_id = ((project_id - 1) * self.shared_steps_per_project
+                                  + index // 7 % self.shared_steps_per_project + 1)
+                case['custom_steps_separated'].insert(0, {'shared_step_id': shared_step_id})
+        else:
+            case['custom_steps'] = f'<p>Perform the steps of case {case_id}</p>'
+            case['custom_expected'] = '<p>Every step succeeds</p>'
+        return case
+
+    def case_indices(self, suite_id, section_id=None, updated_after=None, created_after=None):
+        """
+        Get the positions of the cases matching the get_cases filters.
+
+        Returns:
+            range: Matching case positions in ascending order
+        """
+        indices = range(self.cases_per_suite)
+        if section_id is not None:
+            section_index = section_id - self._section_id(suite_id, 0)
+            if not 0 <= section_index < self.sections_per_suite:
+                raise MockApiError('Field :section_id is not a valid section.')
+            indices = indices[section_index::self.sections_per_suite]
+
+        # Timestamps grow with the position, so each time filter is a lower bound
+        lower = 0
+        if created_after is not None:
+            lower = max(lower, (created_after - BASE_TIMESTAMP) // CASE_TIMESTAMP_STEP + 1)
+        if updated_after is not None:
+            lower = max(lower, (updated_after - BASE_TIMESTAMP - 30) // CASE_TIMESTAMP_STEP + 1)
+        if lower > 0:
+            skip = -(-(lower - indices.start) // indices.step) if lower > indices.start else 0
+            indices = indices[skip:]
+        return indices
+
+    def find_case(self, case_id):
+        total = self.total_cases()
+        if not 1 <= case_id <= total:
+            raise MockApiError('Field :case_id is not a valid test case.')
+        suite_id = (case_id - 1) // self.cases_per_suite + 1
+        return self.case(suite_id, (case_id - 1) % self.cases_per_suite)
+
+    def attachment(self, attachment_id):
+        """
+        Generate the content of an attachment.
+
+        Returns:
+            bytes: PNG signature followed by filler up to attachment_size
+        """
+        case_id = attachment_id
+        if (not self.attachment_every or not 1 <= case_id <= self.total_cases()
+                or ((case_id - 1) % self.cases_per_suite) % self.attachment_every):
+            raise MockApiError('Field :attachment_id is not a valid attachment.')
+        filler = str(attachment_id).encode() * (self.attachment_size // max(1, len(str(attachment_id))) + 1)
+        return (PNG_SIGNATURE + filler)[:max(self.attachment_size, len(PNG_SIGNATURE))]
+
+    def shared_step(self, shared_step_id):
+        """
+        Generate one shared step.
+
+        Returns:
+            dict: Shared step data as returned by get_shared_step
+        """
+        if not 1 <= shared_step_id <= self.projects * self.shared_steps_per_project:
+            raise MockApiError('Field :shared_step_id is not a valid shared step.')
+        return {
+            'id': shared_step_id,
+            'project_id': (shared_step_id - 1) // self.shared_steps_per_project + 1,
+            'title': f'Shared setup {shared_step_id}',
+            'custom_steps_separated': [
+                {'content': f'<p>Shared step {shared_step_id}.{step + 1}</p>',
+                 'expected': f'<p>Shared step {shared_step_id}.{step + 1} succeeds</p>',
+                 'additional_info': None, 'refs': None}
+                for step in range(2)
+            ],
+            'created_by': 1,
+            'created_on': BASE_TIMESTAMP,
+            'updated_by': 1,
+            'updated_on': BASE_TIMESTAMP,
+        }
+
+    def shared_step_list(self, project_id):
+        self._check_project(project_id)
+        first = (project_id - 1) * self.shared_steps_per_project + 1
+        return [self.shared_step(shared_step_id)
+                for shared_step_id in range(first, first + self.shared_steps_per_project)]
+
+    def milestone_list(self, project_id):
+        self._check_project(project_id)
+        first = (project_id - 1) * self.milestones_per_project + 1
+        return [
+            {
+                'id': milestone_id,
+                'name': f'Release {milestone_id}',
+                'project_id': project_id,
+                'is_completed': False,
+                'due_on': BASE_TIMESTAMP + milestone_id * 86400,
+                'url': f'/index.php?/milestones/view/{milestone_id}'
+            }
+            for milestone_id in range(first, first + self.milestones_per_project)
+        ]
+
+
+class FaultInjector:
+    """Decides per request whether to add latency, throttle, fail or drop the connection."""
+
+    def __init__(self, latency=0.0, latency_jitter=0.0, rate_429=0.0, retry_after=1, rate_5xx=0.0,
+                 rate_drop=0.0, seed=None):
+        """
+        Initialize the fault injector.
+
+        Args:
+            latency (float): Seconds added to every response
+            latency_jitter (float): Maximum random seconds added on top of latency
+            rate_429 (float): Probability of answering 429 Too Many Requests
+            retry_after (int): Retry-After seconds sent with 429 responses
+            rate_5xx (float): Probability of answering 500, 502 or 503
+            rate_drop (float): Probability of closing the connection without a response
+            seed (int, optional): Random seed for reproducible fault sequences
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rate_5xx = rate_5xx
+        self.rate_drop = rate_drop
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """
+        Get the latency for the next response.
+
+        Returns:
+            float: Seconds to wait
+        """
+        if not self.latency_jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.latency_jitter)
+
+    def choose(self):
+        """
+        Pick the fault for the next request.
+
+        Returns:
+            str: 'drop', '429', '5xx' or None
+        """
+        with self._lock:
+            roll = self._random.random()
+        for fault, rate in (('drop', self.rate_drop), ('429', self.rate_429), ('5xx', self.rate_5xx)):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def server_error(self):
+        with self._lock:
+            return self._random.choice((500, 502, 503))
+
+
+def _paginate(key, items, route, query):
+    """
+    Wrap one page of a sequence in TestRail's pagination envelope.
+
+    Args:
+        key (str): Envelope key (e.g. 'cases')
+        items: Sequence supporting len() and slicing
+        route (str): Endpoint used to build the pagination links
+        query (dict): Request parameters
+
+    Returns:
+        dict: Paginated response
+
+    Raises:
+        MockApiError: If offset or limit is not an integer
+    """
+    try:
+        offset = max(0, int(query.get('offset', 0)))
+        limit = min(MAX_PAGE_SIZE, max(1, int(query.get('limit', MAX_PAGE_SIZE))))
+    except ValueError:
+        raise MockApiError('Field :offset or :limit is not a valid integer.')
+    size = len(items)
+    page = items[offset:offset + limit]
+
+    filters = ''.join(f'&{k}={v}' for k, v in query.items() if k not in ('offset', 'limit'))
+    next_link = None
+    if offset + limit < size:
+        next_link = f'/api/v2/{route}{filters}&limit={limit}&offset={offset + limit}'
+    prev_link = None
+    if offset > 0:
+        prev_link = f'/api/v2/{route}{filters}&limit={limit}&offset={max(0, offset - limit)}'
+
+    return {
+        'offset': offset,
+        'limit': limit,
+        'size': len(page),
+        '_links': {'next': next_link, 'prev': prev_link},
+        key: page
+    }
+
+
+class _LazyList:
+    """Sequence that builds items from positions only when sliced."""
+
+    def __init__(self, positions, build):
+        self._positions = positions
+        self._build = build
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, item):
+        return [self._build(position) for position in self._positions[item]]
+
+
+class MockTestRailApi:
+    """Routes TestRail API calls to the synthetic data set."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def handle(self, route, query):
+        """
+        Answer one API call.
+
+        Args:
+            route (str): Endpoint such as 'get_cases/1'
+            query (dict): Query parameters
+
+        Returns:
+            Response data, or bytes for attachment content
+
+        Raises:
+            MockApiError: For unknown endpoints or invalid arguments
+        """
+        name, _, arg = route.partition('/')
+        try:
+            arg = int(arg) if arg else None
+            suite_id = int(query['suite_id']) if 'suite_id' in query else None
+            section_id = int(query['section_id']) if 'section_id' in query else None
+            updated_after = int(query['updated_after']) if 'updated_after' in query else None
+            created_after = int(query['created_after']) if 'created_after' in query else None
+        except ValueError:
+            raise MockApiError('Invalid integer argument.')
+
+        data = self.data
+        if name == 'get_projects':
+            return _paginate('projects', data.project_list(), route, query)
+        if name == 'get_project':
+            return data.project(arg)
+        if name == 'get_suites':
+            return data.suite_list(arg)
+        if name == 'get_suite':
+            return data.suite(arg)
+        if name == 'get_sections':
+            suite_id = data.resolve_suite(arg, suite_id)
+            sections = _LazyList(data.section_indices(suite_id), lambda index: data.section(suite_id, index))
+            return _paginate('sections', sections, route, query)
+        if name == 'get_cases':
+            suite_id = data.resolve_suite(arg, suite_id)
+            positions = data.case_indices(suite_id, section_id, updated_after, created_after)
+            cases = _LazyList(positions, lambda index: data.case(suite_id, index))
+            return _paginate('cases', cases, route, query)
+        if name == 'get_case':
+            return data.find_case(arg)
+        if name == 'get_priorities':
+            return PRIORITIES
+        if name == 'get_case_types':
+            return CASE_TYPES
+        if name == 'get_case_fields':
+            return CASE_FIELDS
+        if name == 'get_templates':
+            data.project(arg)
+            return TEMPLATES
+        if name == 'get_milestones':
+            return _paginate('milestones', data.milestone_list(arg), route, query)
+        if name == 'get_shared_steps':
+            return _paginate('shared_steps', data.shared_step_list(arg), route, query)
+        if name == 'get_shared_step':
+            return data.shared_step(arg)
+        if name == 'get_attachment':
+            return data.attachment(arg)
+        raise MockApiError(f'Unknown method: {name}', status=404)
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler translating TestRail URLs into MockTestRailApi calls."""
+
+    # Keep-alive, so connection pooling behaves as it does against TestRail
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"mock TestRail: {format % args}")
+
+    def _send_json(self, status, body, headers=None):
+        payload = json_codec.dumps(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_bytes(self, body):
+        # Honor 'Range: bytes=<start>-' so interrupted downloads can resume
+        match = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', '').strip())
+        start = int(match.group(1)) if match else 0
+        if start >= len(body) and match:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(body)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(206 if match else 200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body) - start))
+        if match:
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+
+        delay = server.faults.delay()
+        if delay:
+            time.sleep(delay)
+
+        fault = server.faults.choose()
+        if fault == 'drop':
+            server.count('dropped')
+            self.close_connection = True
+            return
+        if fault == '429':
+            server.count('throttled')
+            self._send_json(429, {'error': 'API rate limit exceeded.'},
+                            {'Retry-After': str(server.faults.retry_after)})
+            return
+        if fault == '5xx':
+            server.count('server_errors')
+            self._send_json(server.faults.server_error(), {'error': 'Injected server error.'})
+            return
+
+        # TestRail URLs look like /index.php?/api/v2/get_cases/1&suite_id=2&offset=250
+        query_string = urlsplit(self.path).query
+        route, *pairs = query_string.split('&')
+        prefix = '/api/v2/'
+        if not route.startswith(prefix):
+            self._send_json(404, {'error': 'Unknown API path.'})
+            return
+        query = {}
+        for pair in pairs:
+            name, _, value = pair.partition('=')
+            if name:
+                query[unquote(name)] = unquote(value)
+
+        try:
+            body = server.api.handle(route[len(prefix):], query)
+        except MockApiError as e:
+            server.count('client_errors')
+            self._send_json(e.status, {'error': str(e)})
+            return
+        if isinstance(body, bytes):
+            self._send_bytes(body)
+            return
+        self._send_json(200, body)
+
+
+class MockTestRailServer(ThreadingHTTPServer):
+    """Threaded HTTP server serving a synthetic TestRail instance."""
+
+    daemon_threads = True
+
+    def __init__(self, data=None, faults=None, host='127.0.0.1', port=0):
+        """
+        Initialize the server.
+
+        Args:
+            data (SyntheticData, optional): Data set; defaults to a small one
+            faults (FaultInjector, optional): Fault injection; defaults to none
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free port
+        """
+        super().__init__((host, port), _MockRequestHandler)
+        self.api = MockTestRailApi(data or SyntheticData())
+        self.faults = faults or FaultInjector()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'dropped': 0, 'throttled': 0, 'server_errors': 0, 'client_errors': 0}
+
+    @property
+    def url(self):
+        """str: Base URL to configure the client with."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def start(self):
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main(argv=None):
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(description='Serve a synthetic TestRail instance for load tests.')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to bind (default: 8080)')
+    parser.add_argument('--projects', type=int, default=3, help='Number of projects')
+    parser.add_argument('--suites-per-project', type=int, default=2, help='Suites per project (1 = single-suite mode)')
+    parser.add_argument('--sections-per-suite', type=int, default=20, help='Sections per suite')
+    parser.add_argument('--cases-per-suite', type=int, default=1000, help='Cases per suite')
+    parser.add_argument('--steps-per-case', type=int, default=3, help='Separated steps per case')
+    parser.add_argument('--attachment-every', type=int, default=10,
+                        help='Every n-th case references an attachment (0 = none)')
+    parser.add_argument('--attachment-size', type=int, default=32 * 1024, help='Attachment size in bytes')
+    parser.add_argument('--milestones-per-project', type=int, default=5, help='Milestones per project')
+    parser.add_argument('--shared-steps-per-project', type=int, default=3,
+                        help='Shared steps per project (0 = no shared step references)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Maximum random extra latency')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Probability of a 429 response')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds for 429 responses')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Probability of a 5xx response')
+    parser.add_argument('--rate-drop', type=float, default=0.0, help='Probability of dropping the connection')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for fault injection')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
+
+    data = SyntheticData(
+        projects=args.projects,
+        suites_per_project=args.suites_per_project,
+        sections_per_suite=args.sections_per_suite,
+        cases_per_suite=args.cases_per_suite,
+        steps_per_case=args.steps_per_case,
+        attachment_every=args.attachment_every,
+        attachment_size=args.attachment_size,
+        milestones_per_project=args.milestones_per_project,
+        shared_steps_per_project=args.shared_steps_per_project
+    )
+    faults = FaultInjector(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rate_5xx=args.rate_5xx,
+        rate_drop=args.rate_drop,
+        seed=args.seed
+    )
+    server = MockTestRailServer(data, faults, args.host, args.port)
+    logger.info(f"Mock TestRail serving {data.total_cases()} cases at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Mock TestRail stopped; {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+from collections.abc import Mapping
+
+from ..models.case import FIELDS, LazyCase
+from ..models.case_store import CaseStore
+
+_FIELD_SET = frozenset(FIELDS)
+
+# Marks keys a NamedCase does not have
+_MISSING = object()
+
+# Names of cases whose suite is unknown
+_NO_NAMES = {}
+
+
+class NamedCase(Mapping):
+    """
+    Read-only export view of a case: the case's own fields plus resolved names.
+
+    Holds a reference to the case (a Case, LazyCase or CaseView, which in
+    turn reference the API payload or the CaseStore columns) and to two
+    names dicts: one shared by every case in the same section, one by every
+    case with the same priority, type, template and milestone. Building one
+    copies no case data. Keys and values are those of the dictionary
+    CaseNameResolver.resolve builds, in the same order, so writers read it
+    like that dictionary.
+    """
+
+    __slots__ = ('case', 'location', 'labels')
+
+    def __init__(self, case, location, labels):
+        self.case = case
+        self.location = location
+        self.labels = labels
+
+    def get(self, key, default=None):
+        if key in self.location:
+            return self.location[key]
+        if key in self.labels:
+            return self.labels[key]
+        if key in _FIELD_SET:
+            return getattr(self.case, key)
+        if key.startswith('custom_'):
+            for name, value in self.case.custom_items():
+                if name == key:
+                    return value
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        yield from FIELDS
+        for key, _ in self.case.custom_items():
+            yield key
+        yield from self.location
+        yield from self.labels
+
+    def __len__(self):
+        return len(FIELDS) + sum(1 for _ in self.case.custom_items()) + len(self.location) + len(self.labels)
+
+    def items(self):
+        """
+        Iterate over the fields and names.
+
+        Returns:
+            iterator: (key, value) pairs, read straight from the case
+        """
+        case = self.case
+        for name in FIELDS:
+            yield name, getattr(case, name)
+        yield from case.custom_items()
+        yield from self.location.items()
+        yield from self.labels.items()
+
+
+class CaseNameResolver:
+    """
+    Adds human-readable names to a batch of cases for export.
+
+    The lookup tables are built once per project: the suite and section names
+    of every section, read from each suite's SectionTree, and the priority,
+    type, template and milestone tables of a warmed-up CaseMetadata, which
+    are referenced rather than copied. ``resolve`` and ``overlay`` then make
+    a single pass over the cases doing only dictionary lookups, so a batch
+    costs O(cases) no matter how many suites, sections or milestones the
+    project has.
+    """
+
+    def __init__(self, project, metadata):
+        """
+        Bind the lookup tables of a project.
+
+        Args:
+            project (Project): Project the cases belong to, with suites and sections loaded
+            metadata (CaseMetadata): Lookup tables, warmed up for the project
+        """
+        self.project = project
+
+        # Names added for a suite, and for each (suite ID, section ID) in it
+        self.suite_names = {}
+        self.section_names = {}
+        for suite in project.suites:
+            if not suite.id:
+                continue
+            self.suite_names[suite.id] = {'suite_name': suite.name}
+            tree = suite.section_tree()
+            for section_id, section in tree.sections.items():
+                if section_id:
+                    self.section_names[(suite.id, section_id)] = {
+                        'suite_name': suite.name,
+                        'section_name': section.name,
+                        'section_parent_id': section.parent_id,
+                        'section_depth': tree.depth(section_id)
+                    }
+
+        self.priorities = metadata.priorities
+        self.case_types = metadata.case_types
+        self.templates = metadata.templates.get(project.id, {})
+        self.milestones = metadata.milestones.get(project.id, {})
+
+        # (priority, type, template, milestone ID) -> names, shared by all cases with those IDs
+        self._labels = {}
+
+    def location_for(self, suite_id, section_id):
+        """
+        Get the suite and section names to add to a case.
+
+        Returns:
+            dict: 'suite_name' and, if the section is known, 'section_name',
+                'section_parent_id' and 'section_depth'; shared, so it must
+                not be modified
+        """
+        return self.section_names.get((suite_id, section_id)) or self.suite_names.get(suite_id) or _NO_NAMES
+
+    def labels_for(self, priority_id, type_id, template_id, milestone_id):
+        """
+        Get the priority, type, template and milestone names to add to a case.
+
+        Returns:
+            dict: 'priority_name', 'type_name', 'template_name' and
+                'milestone_name' where the ID is known; the same dict for
+                every case with these IDs, so it must not be modified
+        """
+        key = (priority_id, type_id, template_id, milestone_id)
+        names = self._labels.get(key)
+        if names is not None:
+            return names
+
+        names = {}
+        if priority_id in self.priorities:
+            names['priority_name'] = self.priorities[priority_id]
+        if type_id in self.case_types:
+            names['type_name'] = self.case_types[type_id]
+        template_name = self.templates.get(template_id)
+        if template_name:
+            names['template_name'] = template_name
+        milestone_name = self.milestones.get(milestone_id)
+        if milestone_name:
+            names['milestone_name'] = milestone_name
+        return self._labels.setdefault(key, names)
+
+    def resolve(self, cases):
+        """
+        Convert cases to dictionaries with names added next to their IDs.
+
+        The IDs are kept for the XML export.
+
+        Args:
+            cases: CaseStore, or an iterable of Case objects or case dictionaries
+
+        Returns:
+            list: Case dictionaries
+        """
+        if isinstance(cases, CaseStore):
+            rows = cases.iter_dicts()
+        else:
+            rows = (dict(case) if isinstance(case, dict) else case.to_dict() for case in cases)
+
+        location_for = self.location_for
+        labels_for = self.labels_for
+        resolved = []
+        for case_dict in rows:
+            case_dict.update(location_for(case_dict.get('suite_id'), case_dict.get('section_id')))
+            case_dict.update(labels_for(case_dict.get('priority_id'), case_dict.get('type_id'),
+                                        case_dict.get('template_id'), case_dict.get('milestone_id')))
+            resolved.append(case_dict)
+        return resolved
+
+    def overlay(self, cases):
+        """
+        Wrap cases for export without copying them.
+
+        The exporters read the result exactly like the output of ``resolve``,
+        but each case is a NamedCase referencing the case and shared names
+        dicts, so no case data is duplicated while the export runs.
+
+        Args:
+            cases: CaseStore, or an iterable of Case, LazyCase or CaseView
+                objects or raw case dictionaries
+
+        Returns:
+            list: NamedCase objects
+        """
+        location_for = self.location_for
+        labels_for = self.labels_for
+        overlaid = []
+        for case in cases:
+            if isinstance(case, dict):
+                case = LazyCase(case)
+            overlaid.append(NamedCase(
+                case,
+                location_for(case.suite_id, case.section_id),
+                labels_for(case.priority_id, case.type_id, case.template_id, case.milestone_id)
+            ))
+        return overlaid
@@ -0,0 +1,164 @@
+import logging
+import threading
+
+logger = logging.getLogger('testrail_exporter')
+
+
+def _is_reference(step):
+    return isinstance(step, dict) and bool(step.get('shared_step_id'))
+
+
+def _shared_step_steps(shared_step):
+    """Get the steps of a shared step; the bulk endpoint may only report steps_count."""
+    steps = shared_step.get('custom_steps_separated')
+    if steps is None:
+        steps = shared_step.get('steps')
+    return steps
+
+
+class SharedStepResolver:
+    """
+    Expands shared step references in ``custom_steps_separated``.
+
+    Cases using shared steps only carry entries like ``{'shared_step_id': 5}``
+    in their steps. The first reference seen for a project loads all of the
+    project's shared steps page by page and indexes them by ID, so each
+    project costs a handful of requests instead of one per case. Shared
+    steps listed without their steps, or missing from the list, are fetched
+    individually once and memoized.
+    """
+
+    def __init__(self, client):
+        """
+        Initialize the resolver.
+
+        Args:
+            client (TestRailClient): API client
+        """
+        self.client = client
+        self._steps = {}  # Shared step ID -> steps
+        self._failed = set()  # Shared step IDs that could not be fetched
+        self._loaded_projects = set()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def load_project(self, project_id):
+        """
+        Index all shared steps of a project, unless already done.
+
+        Args:
+            project_id (int): Project ID
+        """
+        with self._lock:
+            if project_id in self._loaded_projects:
+                return
+            self._loaded_projects.add(project_id)
+            try:
+                for shared_step in self.client.iter_shared_steps(project_id):
+                    steps = _shared_step_steps(shared_step)
+                    if steps is not None:
+                        self._steps[shared_step['id']] = steps
+            except Exception as e:
+                # References are fetched one by one instead
+                logger.warning(f"Failed to load shared steps for project {project_id}: {e}")
+
+    def _resolve(self, shared_step_id):
+        """
+        Get the steps of a shared step, fetching it if it is not indexed.
+
+        Returns:
+            list: Steps, or None if the shared step could not be loaded
+        """
+        with self._lock:
+            if shared_step_id in self._steps:
+                self.hits += 1
+                return self._steps[shared_step_id]
+            self.misses += 1
+            if shared_step_id in self._failed:
+                return None
+
+        try:
+            steps = _shared_step_steps(self.client.get_shared_step(shared_step_id)) or []
+        except Exception as e:
+            logger.warning(f"Failed to load shared step {shared_step_id}: {e}")
+            with self._lock:
+                self._failed.add(shared_step_id)
+            return None
+        with self._lock:
+            self._steps[shared_step_id] = steps
+        return steps
+
+    def has_references(self, cases):
+        """
+        Check whether any case uses shared steps.
+
+        Args:
+            cases (list): Case dictionaries
+
+        Returns:
+            bool: True if a case's custom_steps_separated references a shared step
+        """
+        return any(
+            isinstance(case.get('custom_steps_separated'), list)
+            and any(_is_reference(step) for step in case['custom_steps_separated'])
+            for case in cases
+        )
+
+    def prefetch(self, cases, project_id):
+        """
+        Load a project's shared steps ahead of export if its cases use any.
+
+        Args:
+            cases (list): Case dictionaries
+            project_id (int): Project ID
+        """
+        if self.has_references(cases):
+            self.load_project(project_id)
+
+    def expand(self, steps, project_id=None):
+        """
+        Replace shared step references with the steps they stand for.
+
+        Args:
+            steps (list): A case's custom_steps_separated
+            project_id (int, optional): Project of the case, loaded on first use
+
+        Returns:
+            list: Steps with references expanded; unresolvable references are kept
+        """
+        if not any(_is_reference(step) for step in steps):
+            return steps
+        if project_id is not None:
+            self.load_project(project_id)
+
+        expanded = []
+        for step in steps:
+            if not _is_reference(step):
+                expanded.append(step)
+                continue
+            shared = self._resolve(step['shared_step_id'])
+            if shared is None:
+                expanded.append(step)
+            else:
+                expanded.extend(shared)
+        return expanded
+
+    def get_stats(self):
+        """
+        Get resolver statistics.
+
+        Returns:
+            dict: 'hits' (references resolved from the index), 'misses'
+                (references that needed a get_shared_step call or could not
+                be resolved), 'indexed' shared steps and 'projects' loaded
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'indexed': len(self._steps),
+                'projects': len(self._loaded_projects)
+            }
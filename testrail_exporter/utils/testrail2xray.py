@@ -2,6 +2,8 @@ import re
 import xml.etree.ElementTree as ET
 import pandas as pd
 from .logger import ExportLogger
+from ..models.section import Section
+from ..models.section_tree import SectionTree
 
 
 class XrayConversionError(Exception):
@@ -68,7 +70,35 @@ def appendRows(suiteName='', sectionName='', issueID='', issueKey='', testType=N
                 "Test Repo": testRepo if testRepo else '',
                 "Labels": testType if testType else ''})
 
-def handleTestSections(root, issueID, outputfile, repoName, outputtestrailEndpoint, logger=None, suiteName=None, sectionPath=None):
+def buildSectionTree(root, suiteName=None):
+    """
+    Index the sections of an exported suite.
+
+    The XML carries no section IDs, so sections are numbered in document
+    order and linked to their enclosing section.
+
+    Args:
+        root: <suite> element, or a <sections> element
+        suiteName: Suite name prefixed to the full paths
+
+    Returns:
+        tuple: (SectionTree, dict mapping each <section> element to its ID)
+    """
+    sections = []
+    sectionIds = {}
+    topLevel = root.findall('sections/section' if root.tag == 'suite' else 'section')
+    # Stack of (element, parent ID); pop() takes from the end, so push in reverse
+    pending = [(child, None) for child in reversed(topLevel)]
+    while pending:
+        element, parentId = pending.pop()
+        sectionId = len(sections) + 1
+        sectionIds[element] = sectionId
+        sections.append(Section({'id': sectionId, 'name': element.findtext('name'), 'parent_id': parentId}))
+        pending.extend((child, sectionId) for child in reversed(element.findall('sections/section')))
+    return SectionTree(sections, suiteName), sectionIds
+
+
+def handleTestSections(root, issueID, outputfile, repoName, outputtestrailEndpoint, logger=None, suiteName=None, sectionPath=None, tree=None, sectionIds=None):
     if root.tag == 'suite':
         testsections = root.findall('sections/section')
         # Get suite name if not already provided
@@ -79,30 +109,18 @@ def handleTestSections(root, issueID, outputfile, repoName, outputtestrailEndpoi
     else:
         testsections = root.findall('section')
 
-    baseRepoName = repoName
-    baseSectionPath = sectionPath
+    # Section paths are looked up in a tree built once per suite instead of
+    # being concatenated on the way down
+    if tree is None:
+        tree, sectionIds = buildSectionTree(root, suiteName)
+
     for testsection in testsections:
-        sectionName = testsection.find('name').text
+        sectionId = sectionIds[testsection]
         testRepoDescription = testsection.find('description')
 
-        # Build the section path (without suite name)
-        if baseSectionPath is not None and sectionName is not None:
-            currentSectionPath = baseSectionPath + '/' + sectionName
-        else:
-            currentSectionPath = sectionName
-
-        # Build the test repo path (with suite name)
-        if baseRepoName is not None and sectionName is not None:
-            # Check if baseRepoName already starts with suiteName to avoid duplication
-            if suiteName and not baseRepoName.startswith(suiteName + '/'):
-                testRepoName = baseRepoName + '/' + sectionName
-            else:
-                testRepoName = baseRepoName + '/' + sectionName
-        elif suiteName is not None and sectionName is not None:
-            # This is a top-level section, prepend suite name
-            testRepoName = suiteName + '/' + sectionName
-        else:
-            testRepoName = sectionName
+        # Section path without the suite name, and test repo path with it
+        currentSectionPath = tree.section_path(sectionId)
+        testRepoName = tree.path(sectionId)
 
         cases = testsection.findall('cases/case')
         if logger:
@@ -168,7 +186,7 @@ def handleTestSections(root, issueID, outputfile, repoName, outputtestrailEndpoi
         
         innerSection = testsection.find('sections')
         if innerSection is not None:
-            issueID = handleTestSections(root=innerSection, issueID=issueID, outputfile=outputfile, repoName=testRepoName, outputtestrailEndpoint=outputtestrailEndpoint, logger=logger, suiteName=suiteName, sectionPath=currentSectionPath)
+            issueID = handleTestSections(root=innerSection, issueID=issueID, outputfile=outputfile, repoName=testRepoName, outputtestrailEndpoint=outputtestrailEndpoint, logger=logger, suiteName=suiteName, sectionPath=currentSectionPath, tree=tree, sectionIds=sectionIds)
 
     return issueID
 